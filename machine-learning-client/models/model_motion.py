@@ -0,0 +1,78 @@
+"""
+Model for letters signed with motion (J and Z)
+"""
+
+from __future__ import annotations
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class MotionClassifier(nn.Module):  # pylint: disable=too-many-instance-attributes
+    """
+    Frame encoder, two unpadded temporal convolutions and a pooled head.
+
+    Without padding, each conv output depends only on the last
+    `kernel_size` inputs, so a stream can compute one new column per layer
+    as each frame arrives and keep them in ring buffers. Only the pooling
+    and the final linear layer run over the whole window, and the result
+    equals forward() on the same frames.
+    """
+
+    def __init__(
+        self,
+        frame_dim: int,
+        num_classes: int = 3,
+        hidden_dim: int = 64,
+        kernel_size: int = 5,
+        dropout: float = 0.2,
+    ):
+        super().__init__()
+        self.hidden_dim = hidden_dim
+        self.kernel_size = kernel_size
+
+        self.input_norm = nn.LayerNorm(frame_dim)
+        self.input_proj = nn.Linear(frame_dim, hidden_dim)
+
+        self.conv1 = nn.Conv1d(hidden_dim, hidden_dim, kernel_size)
+        self.conv2 = nn.Conv1d(hidden_dim, hidden_dim, kernel_size)
+        self.dropout = nn.Dropout(dropout)
+
+        # Final head over mean- and max-pooled time steps
+        self.head_norm = nn.LayerNorm(2 * hidden_dim)
+        self.head = nn.Linear(2 * hidden_dim, num_classes)
+
+    @property
+    def receptive_field(self) -> int:
+        """
+        Frames that feed one output time step.
+        """
+        return 2 * (self.kernel_size - 1) + 1
+
+    def encode(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        x: (..., frame_dim) per-frame features -> (..., hidden_dim)
+        """
+        return F.gelu(self.input_proj(self.input_norm(x)))
+
+    def temporal(self, emb: torch.Tensor) -> torch.Tensor:
+        """
+        emb: (B, T, hidden_dim) encoded frames, oldest first ->
+        (B, hidden_dim, T - receptive_field + 1)
+        """
+        h1 = self.dropout(F.gelu(self.conv1(emb.transpose(1, 2))))
+        return self.dropout(F.gelu(self.conv2(h1))) + h1[:, :, self.kernel_size - 1 :]
+
+    def pool(self, h2: torch.Tensor) -> torch.Tensor:
+        """
+        h2: (B, hidden_dim, P) temporal features -> (B, classes) logits
+        """
+        pooled = torch.cat([h2.mean(dim=2), h2.amax(dim=2)], dim=1)
+        return self.head(self.head_norm(pooled))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        x: (B, T, frame_dim) per-frame features, oldest first, with T at
+        least receptive_field
+        """
+        return self.pool(self.temporal(self.encode(x)))
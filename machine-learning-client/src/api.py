@@ -5,8 +5,11 @@ API for ML client; handles client interactions with model
 from __future__ import annotations
 
 from pathlib import Path
+import functools
 import json
-from typing import Any
+import os
+import threading
+from typing import Any, Callable
 import logging
 
 import numpy as np
@@ -16,7 +19,11 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 
 from models.model_MLP import LandmarkMLP
-from .mediapipe_utils import normalize_landmarks
+from .features import normalize_landmarks_batch
+from .prediction_cache import PredictionCache
+from .load_shedding import LoadShedder
+from .motion import MODEL_PATH as MOTION_MODEL_PATH, MotionStreams, load_motion_model
+from .registry import REGISTRY_DIR, ModelRegistry
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -25,6 +32,26 @@ MODELS_DIR = PROJECT_ROOT / "models"
 LABEL_MAP_PATH = DATA_DIR / "label_map.json"
 MODEL_PATH = MODELS_DIR / "mlp_webcam.pt"
 
+
+def resolve_model_path(model_id: str | None, registry_dir: Path = REGISTRY_DIR):
+    """
+    Map ML_MODEL_ID to a checkpoint. A registered run_id, a unique prefix of
+    one, or "latest" selects that run; unset serves models/mlp_webcam.pt.
+
+    Returns:
+        (run_id or None, checkpoint path)
+    """
+    if not model_id:
+        return None, MODEL_PATH
+    registry = ModelRegistry(registry_dir)
+    run_id = registry.resolve(model_id)
+    return run_id, registry.checkpoint_path(run_id)
+
+
+MODEL_ID, MODEL_FILE = resolve_model_path(
+    os.getenv("ML_MODEL_ID"), Path(os.getenv("ML_REGISTRY_DIR", str(REGISTRY_DIR)))
+)
+
 with LABEL_MAP_PATH.open("r") as f:
     label_map = json.load(f)
 
@@ -34,27 +61,168 @@ NUM_CLASSES = len(INDEX_TO_LETTER)
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 model = LandmarkMLP(input_dim=63, num_classes=NUM_CLASSES).to(device)
-model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
+model.load_state_dict(torch.load(MODEL_FILE, map_location=device))
 model.eval()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-logger.info("Loaded model from %s", MODEL_PATH)
+logger.info("Loaded model %s from %s", MODEL_ID or "default", MODEL_FILE)
+
+# J/Z recognition for /predict/stream; optional until a model is trained
+MOTION_MODEL_FILE = Path(os.getenv("ML_MOTION_MODEL", str(MOTION_MODEL_PATH)))
+motion_streams = None
+if MOTION_MODEL_FILE.exists():
+    motion_streams = MotionStreams(load_motion_model(MOTION_MODEL_FILE, "cpu"))
+    logger.info("Loaded motion model from %s", MOTION_MODEL_FILE)
 
 app = Flask(__name__)
 CORS(app)
 
 
+# Bounded in-flight requests; beyond the latency SLO, shed with a fast 503
+load_shedder = LoadShedder(
+    max_in_flight=int(os.getenv("API_MAX_IN_FLIGHT", "32")),
+    latency_slo_ms=float(os.getenv("API_LATENCY_SLO_MS", "250")),
+)
+
+# One forward pass at a time; concurrent requests queue here
+model_lock = threading.Lock()
+
+
+def shed_load(view: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Reject requests with 503 + Retry-After when the model queue is full
+    or the expected wait would exceed the latency SLO.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not load_shedder.try_enter():
+            retry_after = load_shedder.retry_after()
+            logger.warning("Shedding request: %s", load_shedder.stats())
+            response = jsonify({"error": "Server overloaded, retry later"})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+
+        try:
+            return view(*args, **kwargs)
+        finally:
+            load_shedder.leave()
+
+    return wrapper
+
+
 @app.route("/health", methods=["GET"])
+@app.route("/health/live", methods=["GET"])
 def health() -> Any:
     """
-    Returns status code 200 indicating healthy if reachable
+    Liveness: returns status code 200 indicating healthy if reachable
     """
     return jsonify({"status": "ok"}), 200
 
 
+@app.route("/health/ready", methods=["GET"])
+def ready() -> Any:
+    """
+    Readiness: 200 while accepting predictions, 503 while shedding load,
+    so a balancer can route around a saturated replica.
+    """
+    stats = {
+        **load_shedder.stats(),
+        "model_id": MODEL_ID,
+        "motion_model": motion_streams is not None,
+    }
+    if load_shedder.is_overloaded():
+        return jsonify({"status": "overloaded", **stats}), 503
+    return jsonify({"status": "ready", **stats}), 200
+
+
+MAX_BATCH_SIZE = 256
+MAX_HANDS = 4
+
+# Last answer per client, reused when the client says its hand has not moved
+prediction_cache = PredictionCache()
+
+
+def validate_points(points: Any) -> tuple[np.ndarray | None, str | None]:
+    """
+    Validate one set of raw MediaPipe landmarks.
+
+    Returns:
+        (pts_array, None) with a (21, 3) float32 array when valid,
+        otherwise (None, error_message).
+    """
+    if not isinstance(points, list) or len(points) != 21:
+        return None, "Expected 'points' to be a list of length 21 (21 landmarks)"
+
+    try:
+        pts_array = np.asarray(points, dtype=np.float32)
+    except ValueError as e:
+        return None, f"Could not convert 'points' to a float32 array {e}"
+
+    if pts_array.shape != (21, 3):
+        return None, (
+            "Expected 'points' shape (21, 3). " f"Got {list(pts_array.shape)} instead."
+        )
+
+    return pts_array, None
+
+
+def validate_hands(hands: Any) -> tuple[np.ndarray | None, list[str], str | None]:
+    """
+    Validate a multi-hand request body.
+
+    Returns:
+        (pts, handedness, None) with an (N, 21, 3) float32 array and one
+        handedness label per hand when valid, otherwise (None, [], error).
+    """
+    if not isinstance(hands, list) or not 1 <= len(hands) <= MAX_HANDS:
+        return None, [], f"Expected 'hands' to be a list of 1 to {MAX_HANDS} hands"
+
+    pts = np.empty((len(hands), 21, 3), dtype=np.float32)
+    handedness = []
+    for i, hand in enumerate(hands):
+        if not isinstance(hand, dict):
+            return None, [], f"hands[{i}]: expected an object with 'points'"
+        pts_array, error = validate_points(hand.get("points"))
+        if error is not None:
+            return None, [], f"hands[{i}]: {error}"
+        pts[i] = pts_array
+        label = hand.get("handedness")
+        handedness.append(label if isinstance(label, str) else "")
+    return pts, handedness, None
+
+
+def classify_features(feats: np.ndarray) -> list[tuple[str, float]]:
+    """
+    Run one batched forward pass over normalized landmark vectors.
+
+    Args:
+        feats: np.ndarray of shape (N, 63) float32.
+
+    Returns:
+        List of N (letter, confidence) tuples.
+    """
+    x = torch.from_numpy(feats).to(device)
+
+    with model_lock, torch.no_grad():
+        # Timed only once the lock is held; the shedder adds queueing itself
+        started = load_shedder.clock()
+        logits = model(x)
+        probs = F.softmax(logits, dim=1)
+        conf, idx = probs.max(dim=1)
+        load_shedder.record_service(load_shedder.clock() - started)
+
+    return [
+        (INDEX_TO_LETTER.get(int(i), "?"), float(c))
+        for c, i in zip(conf.tolist(), idx.tolist())
+    ]
+
+
 @app.route("/predict", methods=["POST"])
+@shed_load
 def predict() -> Any:
     """
     Predict an ASL letter from raw MediaPipe hand landmarks.
@@ -66,18 +234,33 @@ def predict() -> Any:
         [x1, y1, z1],
         ...
         [x20, y20, z20]
+      ],
+      "client_id": "abc123",   # optional
+      "unchanged": true        # optional
+    }
+    or, for every hand in one frame, "hands" in place of "points":
+    {
+      "hands": [
+        {"points": [[x0, y0, z0], ...], "handedness": "Left"},
+        {"points": [[x0, y0, z0], ...], "handedness": "Right"}
       ]
     }
     where:
       - length of points must be 21
       - each inner list must have length 3
       - this is the raw MediaPipe format
+      - client_id identifies the caller so its last answer can be cached
+      - unchanged is a client hint that the hand has not moved since the
+        previous request; the cached answer is returned if one exists
 
     Returns:
     {
       "letter": [str]
       "confidence": [int]
+      "cached": [bool]
     }
+    or, for a "hands" request, one {"handedness", "letter", "confidence"}
+    entry per hand under "hands", in request order, plus "cached".
     """
 
     # Data validation
@@ -86,64 +269,196 @@ def predict() -> Any:
         logger.error("ERROR: Empty request")
         return jsonify({"error": "Invalid or missing JSON body"}), 400
 
+    client_id = data.get("client_id")
+    if not isinstance(client_id, str):
+        client_id = None
+
+    # Keyed by response shape too, so a client switching between "points"
+    # and "hands" never gets a cached answer in the other form.
+    form = "hands" if "hands" in data else "points"
+    cache_key = (client_id, form) if client_id is not None else None
+
+    if cache_key is not None and data.get("unchanged") is True:
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            return jsonify({**cached, "cached": True}), 200
+
+    if form == "hands":
+        return predict_hands(data["hands"], cache_key)
+
     points = data.get("points")
     if points is None:
         logger.error("ERROR: No 'points' filed in request: %s", data)
         return jsonify({"error": "Missing 'points' field in request body"}), 400
 
-    if not isinstance(points, list) or len(points) != 21:
+    pts_array, error = validate_points(points)
+    if error is not None:
         logger.error("ERROR: Points is not expected shape: %s", data)
-        return (
-            jsonify(
-                {"error": "Expected 'points' to be a list of length 21 (21 landmarks)"}
-            ),
-            400,
-        )
-
-    try:
-        pts_array = np.asarray(points, dtype=np.float32)
-    except ValueError as e:
-        return (
-            jsonify({"error": f"Could not convert 'points' to a float32 array {e}"}),
-            400,
-        )
-
-    if pts_array.shape != (21, 3):
-        return (
-            jsonify(
-                {
-                    "error": (
-                        "Expected 'points' shape (21, 3). "
-                        f"Got {list(pts_array.shape)} instead."
-                    )
-                }
-            ),
-            400,
-        )
+        return jsonify({"error": error}), 400
 
     # Data is ok -> normalize and predict
-    feats = normalize_landmarks(pts_array)
-    x = torch.from_numpy(feats).unsqueeze(0).to(device)
+    feats = normalize_landmarks_batch(pts_array[np.newaxis])
+    letter, confidence = classify_features(feats)[0]
 
-    with torch.no_grad():
-        logits = model(x)
-        probs = F.softmax(logits, dim=1)
-        conf, idx = probs.max(dim=1)
-        confidence = float(conf.item())
-        pred_idx = int(idx.item())
-
-    letter = INDEX_TO_LETTER.get(pred_idx, "?")
+    if cache_key is not None:
+        prediction_cache.put(cache_key, {"letter": letter, "confidence": confidence})
 
     return (
         jsonify(
             {
                 "letter": letter,
                 "confidence": confidence,
+                "cached": False,
             }
         ),
         200,
     )
 
 
+def predict_hands(hands: Any, cache_key: tuple[str, str] | None) -> Any:
+    """
+    Classify every hand of one frame in a single forward pass.
+    """
+    pts, handedness, error = validate_hands(hands)
+    if error is not None:
+        logger.error("ERROR: Invalid 'hands': %s", error)
+        return jsonify({"error": error}), 400
+
+    feats = normalize_landmarks_batch(pts)
+    result = {
+        "hands": [
+            {"handedness": label, "letter": letter, "confidence": confidence}
+            for label, (letter, confidence) in zip(handedness, classify_features(feats))
+        ]
+    }
+
+    if cache_key is not None:
+        prediction_cache.put(cache_key, result)
+
+    return jsonify({**result, "cached": False}), 200
+
+
+@app.route("/predict/batch", methods=["POST"])
+@shed_load
+def predict_batch() -> Any:
+    """
+    Predict ASL letters for several sets of raw MediaPipe landmarks
+    in a single forward pass.
+
+    Expected JSON body:
+    {
+      "batch": [
+        [[x0, y0, z0], ..., [x20, y20, z20]],
+        ...
+      ]
+    }
+
+    Returns:
+    {
+      "predictions": [
+        {"letter": [str], "confidence": [float]},
+        {"error": [str]},   # for entries that failed validation
+        ...
+      ]
+    }
+    Predictions are returned in the same order as the request batch.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        logger.error("ERROR: Empty request")
+        return jsonify({"error": "Invalid or missing JSON body"}), 400
+
+    batch = data.get("batch")
+    if not isinstance(batch, list):
+        logger.error("ERROR: No 'batch' list in request: %s", data)
+        return jsonify({"error": "Missing 'batch' list in request body"}), 400
+
+    if len(batch) > MAX_BATCH_SIZE:
+        return (
+            jsonify({"error": f"Batch size {len(batch)} exceeds {MAX_BATCH_SIZE}"}),
+            400,
+        )
+
+    predictions: list[dict[str, Any]] = [{} for _ in batch]
+    valid_rows = []
+    valid_pts = []
+    for row, points in enumerate(batch):
+        pts_array, error = validate_points(points)
+        if error is not None:
+            predictions[row] = {"error": error}
+        else:
+            valid_rows.append(row)
+            valid_pts.append(pts_array)
+
+    if valid_pts:
+        feats = normalize_landmarks_batch(np.stack(valid_pts))
+        for row, (letter, confidence) in zip(valid_rows, classify_features(feats)):
+            predictions[row] = {"letter": letter, "confidence": confidence}
+
+    return jsonify({"predictions": predictions}), 200
+
+
+@app.route("/predict/stream", methods=["POST"])
+@shed_load
+def predict_stream() -> Any:
+    """
+    Per-frame prediction for a live client, including the motion letters
+    J and Z, which need the client's recent frames.
+
+    Expected JSON body, sent once per camera frame:
+    {
+      "client_id": "abc123",
+      "points": [[x0, y0, z0], ..., [x20, y20, z20]]   # null when no hand
+    }
+
+    Returns:
+    {
+      "letter": [str], "confidence": [float],      # static model, this frame
+      "motion": {"letter": "J", "confidence": 0.93} or null,
+      "frames": [int]                                 # frames buffered
+    }
+    "motion" is null until the client has sent a full window of frames
+    with a hand in them, or when no motion model is loaded. Its letter is
+    "-" when no motion letter is being signed.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        logger.error("ERROR: Empty request")
+        return jsonify({"error": "Invalid or missing JSON body"}), 400
+
+    client_id = data.get("client_id")
+    if not isinstance(client_id, str):
+        return jsonify({"error": "Missing 'client_id' string in request body"}), 400
+
+    points = data.get("points")
+    pts_array = None
+    if points is not None:
+        pts_array, error = validate_points(points)
+        if error is not None:
+            logger.error("ERROR: Points is not expected shape: %s", data)
+            return jsonify({"error": error}), 400
+
+    result: dict[str, Any] = {"letter": None, "confidence": 0.0}
+    if pts_array is not None:
+        feats = normalize_landmarks_batch(pts_array[np.newaxis])
+        result["letter"], result["confidence"] = classify_features(feats)[0]
+
+    motion = None
+    frames = 0
+    if motion_streams is not None:
+        with motion_streams.lock:
+            stream = motion_streams.get(client_id)
+            if pts_array is None:
+                stream.reset()
+            else:
+                stream.push(pts_array)
+                prediction = stream.predict()
+                if prediction is not None:
+                    motion = {"letter": prediction[0], "confidence": prediction[1]}
+            frames = min(stream.count, stream.window)
+
+    return jsonify({**result, "motion": motion, "frames": frames}), 200
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8080, debug=True)
@@ -0,0 +1,123 @@
+"""
+Batched landmark augmentation for training
+
+Works on whole (B, 63) batches of normalized landmarks (wrist at the origin,
+max joint distance 1) on whatever device they live on:
+
+- random 3D rotation about the wrist
+- per-axis scale jitter (hand proportions, camera aspect)
+- Gaussian noise on every joint except the wrist
+- left/right mirroring
+
+Augmented samples are re-normalized, so they stay on the same scale as the
+features the model sees at inference time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import math
+import time
+from typing import Any, Dict, Optional
+
+import torch
+
+
+@dataclass
+class AugmentConfig:
+    """
+    Per-run augmentation settings. A zero disables that transform.
+    """
+
+    rotation_deg: float = 15.0
+    scale_jitter: float = 0.1
+    joint_noise: float = 0.01
+    mirror_prob: float = 0.0
+
+    def enabled(self) -> bool:
+        return any(
+            (self.rotation_deg, self.scale_jitter, self.joint_noise, self.mirror_prob)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def rotation_matrices(angles: torch.Tensor) -> torch.Tensor:
+    """
+    (B, 3) Euler angles in radians -> (B, 3, 3) matrices Rz @ Ry @ Rx.
+    """
+    cos, sin = angles.cos(), angles.sin()
+    cx, cy, cz = cos.unbind(1)
+    sx, sy, sz = sin.unbind(1)
+    rows = [
+        cy * cz,
+        sx * sy * cz - cx * sz,
+        cx * sy * cz + sx * sz,
+        cy * sz,
+        sx * sy * sz + cx * cz,
+        cx * sy * sz - sx * cz,
+        -sy,
+        sx * cy,
+        cx * cy,
+    ]
+    return torch.stack(rows, dim=1).view(-1, 3, 3)
+
+
+def augment_batch(
+    X: torch.Tensor, config: AugmentConfig, generator: Optional[torch.Generator] = None
+) -> torch.Tensor:
+    """
+    Return an augmented copy of a (B, 63) batch of normalized landmarks.
+    """
+    batch = X.shape[0]
+    opts = {"device": X.device, "dtype": X.dtype, "generator": generator}
+    pts = X.reshape(batch, 21, 3)
+
+    if config.mirror_prob:
+        flip = torch.rand(batch, 1, **opts) < config.mirror_prob
+        sign = torch.ones(batch, 3, device=X.device, dtype=X.dtype)
+        sign[:, 0] = torch.where(flip[:, 0], -1.0, 1.0)
+        pts = pts * sign.unsqueeze(1)
+
+    if config.scale_jitter:
+        scale = 1.0 + (torch.rand(batch, 1, 3, **opts) * 2 - 1) * config.scale_jitter
+        pts = pts * scale
+
+    if config.rotation_deg:
+        limit = math.radians(config.rotation_deg)
+        angles = (torch.rand(batch, 3, **opts) * 2 - 1) * limit
+        pts = torch.bmm(pts, rotation_matrices(angles).transpose(1, 2))
+
+    if config.joint_noise:
+        noise = torch.randn(batch, 21, 3, **opts) * config.joint_noise
+        noise[:, 0] = 0.0  # the wrist stays at the origin
+        pts = pts + noise
+
+    max_dist = pts.norm(dim=2).amax(dim=1, keepdim=True).clamp_min(1e-8)
+    return (pts / max_dist.unsqueeze(2)).reshape(batch, 63)
+
+
+class Augmenter:
+    """
+    Seeded augment_batch callable that also times itself per batch.
+    """
+
+    def __init__(self, config: AugmentConfig, device: torch.device, seed: int = 0):
+        self.config = config
+        self.device = torch.device(device)
+        self.generator = torch.Generator(device=self.device).manual_seed(seed)
+        self.seconds = 0.0
+        self.batches = 0
+
+    def __call__(self, X: torch.Tensor) -> torch.Tensor:
+        t0 = time.perf_counter()
+        out = augment_batch(X, self.config, self.generator)
+        if self.device.type == "cuda":
+            torch.cuda.synchronize(self.device)
+        self.seconds += time.perf_counter() - t0
+        self.batches += 1
+        return out
+
+    def ms_per_batch(self) -> float:
+        return 1000.0 * self.seconds / self.batches if self.batches else 0.0
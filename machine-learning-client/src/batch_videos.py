@@ -0,0 +1,365 @@
+"""
+Process folders of recordings across a pool of worker processes
+
+Every worker loads the classifier once and keeps its own MediaPipe Hands
+instances (they are not thread- or process-safe), resetting tracking
+between files. Files are handed out largest first, so the longest videos
+start early and the pool finishes together. Failed files are retried. If
+a worker dies, the pool is rebuilt and the files that were in flight are
+re-run one at a time, so only the file that crashed it uses up retries.
+
+Each file is written to <out-dir>/parts/ as it finishes, and all parts are
+merged into <out-dir>/merged.npz in input order with a `source` column
+indexing meta["sources"].
+
+Usage:
+    python -m src.batch_videos recordings/ --workers 8 --out-dir data/offline/batch
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import json
+import multiprocessing as mp
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from . import offline
+from .sweep import pin_torch_threads
+
+VIDEO_EXTENSIONS = {".avi", ".m4v", ".mkv", ".mov", ".mp4", ".webm"}
+PARTS_DIR_NAME = "parts"
+MERGED_NAME = "merged.npz"
+
+# Per-process state set up by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def find_videos(inputs: Sequence[Path]) -> List[Path]:
+    """
+    Video files given directly or found (recursively) under directories,
+    sorted and de-duplicated.
+    """
+    found = set()
+    for path in map(Path, inputs):
+        if path.is_dir():
+            found.update(
+                p
+                for p in path.rglob("*")
+                if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS
+            )
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+def largest_first(paths: Sequence[Path]) -> List[Path]:
+    """
+    Order files by size, biggest first (longest-processing-time scheduling).
+    """
+
+    def size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    return sorted(paths, key=lambda p: (-size(p), str(p)))
+
+
+def part_path(out_dir: Path, index: int, source: Path) -> Path:
+    return out_dir / PARTS_DIR_NAME / f"{index:05d}_{source.stem}.npz"
+
+
+def _init_worker(model_path: str) -> None:
+    """
+    Pool initializer: one thread per library, one classifier per process.
+    """
+    pin_torch_threads()
+    cv2.setNumThreads(1)
+    _worker["classifier"] = offline.LetterClassifier(model_path)
+    _worker["detector"] = None
+
+
+def process_file(index: int, source: str, out_dir: str) -> Dict[str, Any]:
+    """
+    Run one video through this worker's detector and classifier and write
+    its part file.
+    """
+    if _worker["detector"] is None:
+        _worker["detector"] = offline.make_detector(source)
+    detector = _worker["detector"]
+    detector.reset()
+
+    columns, stats = offline.process_source(source, detector, _worker["classifier"])
+    out = part_path(Path(out_dir), index, Path(source))
+    offline.write_columns(out, columns, {"source": source, **stats})
+    return {
+        "index": index,
+        "source": source,
+        "part": str(out),
+        "pid": os.getpid(),
+        **stats,
+    }
+
+
+class Progress:
+    """
+    Completed / failed files and per-worker totals, printed as files finish.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed: Dict[str, str] = {}
+        self.workers: Dict[int, Dict[str, float]] = defaultdict(
+            lambda: {"files": 0, "frames": 0, "seconds": 0.0}
+        )
+
+    def finished(self, result: Dict[str, Any]) -> None:
+        self.done += 1
+        worker = self.workers[result["pid"]]
+        worker["files"] += 1
+        worker["frames"] += result["frames"]
+        worker["seconds"] += result["seconds"]
+        print(
+            f"[{self.done + len(self.failed)}/{self.total}] "
+            f"{Path(result['source']).name}: {result['frames']} frames, "
+            f"{result['fps']:.1f} fps (worker {result['pid']}: "
+            f"{worker['files']} files, {worker['frames']} frames)"
+        )
+
+    def retrying(self, source: str, attempt: int, error: BaseException) -> None:
+        print(f"Retrying {source} (attempt {attempt + 1}) after {error!r}")
+
+    def suspect(self, source: str) -> None:
+        print(f"A worker died while {source} was running; re-running it alone")
+
+    def failed_file(self, source: str, error: BaseException) -> None:
+        self.failed[source] = repr(error)
+        print(
+            f"[{self.done + len(self.failed)}/{self.total}] {source} failed: {error!r}"
+        )
+
+
+def _run_inline(
+    jobs: List[tuple], out_dir: Path, model_path: Path, retries: int, progress
+) -> List[Dict[str, Any]]:
+    _init_worker(str(model_path))
+    results = []
+    try:
+        for index, source in jobs:
+            for attempt in range(retries + 1):
+                try:
+                    result = process_file(index, str(source), str(out_dir))
+                except Exception as exc:
+                    if attempt == retries:
+                        progress.failed_file(str(source), exc)
+                    else:
+                        progress.retrying(str(source), attempt + 1, exc)
+                    continue
+                progress.finished(result)
+                results.append(result)
+                break
+    finally:
+        if _worker.get("detector") is not None:
+            _worker["detector"].close()
+    return results
+
+
+def _run_pool(
+    jobs: List[tuple],
+    out_dir: Path,
+    model_path: Path,
+    workers: int,
+    retries: int,
+    progress: Progress,
+    task: Callable[[int, str, str], Dict[str, Any]] = process_file,
+) -> List[Dict[str, Any]]:
+    """
+    Keep at most `workers` files in flight. When a worker dies, every file
+    in flight fails with BrokenProcessPool, and only one of them caused it.
+    Those files are not charged an attempt. Once the pool is rebuilt they
+    run one at a time, so a crash there is the file's own, and then the
+    remaining files go back to running in parallel.
+    """
+    attempts: Dict[int, int] = defaultdict(int)
+    results = []
+    todo = deque(jobs)
+    suspects: Deque[tuple] = deque()
+
+    def charge(job: tuple, exc: BaseException, requeue: Deque[tuple]) -> None:
+        index, source = job
+        attempts[index] += 1
+        if attempts[index] > retries:
+            progress.failed_file(str(source), exc)
+        else:
+            progress.retrying(str(source), attempts[index], exc)
+            requeue.appendleft(job)
+
+    while todo or suspects:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(todo) + len(suspects)),
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(model_path),),
+        )
+        # future -> (job, ran alone)
+        in_flight: Dict[Future, tuple] = {}
+        broken = False
+        while in_flight or (not broken and (todo or suspects)):
+            if not broken:
+                if suspects:
+                    if not in_flight:
+                        job = suspects.popleft()
+                        future = pool.submit(task, job[0], str(job[1]), str(out_dir))
+                        in_flight[future] = (job, True)
+                else:
+                    while todo and len(in_flight) < workers:
+                        job = todo.popleft()
+                        future = pool.submit(task, job[0], str(job[1]), str(out_dir))
+                        in_flight[future] = (job, False)
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, alone = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as exc:
+                    broken = True
+                    if alone:
+                        charge(job, exc, suspects)
+                    else:
+                        progress.suspect(str(job[1]))
+                        suspects.append(job)
+                    continue
+                except Exception as exc:
+                    charge(job, exc, todo)
+                    continue
+                progress.finished(result)
+                results.append(result)
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def merge_parts(results: List[Dict[str, Any]], out_path: Path) -> Optional[Path]:
+    """
+    Concatenate part files in input order into one columnar file with a
+    `source` column.
+    """
+    if not results:
+        return None
+    ordered = sorted(results, key=lambda r: r["index"])
+    merged: Dict[str, List[np.ndarray]] = defaultdict(list)
+    for source_id, result in enumerate(ordered):
+        columns, _ = offline.read_columns(result["part"])
+        for name, values in columns.items():
+            merged[name].append(values)
+        merged["source"].append(
+            np.full(len(columns["frame"]), source_id, dtype=np.int32)
+        )
+    meta = {
+        "sources": [r["source"] for r in ordered],
+        "files": [
+            {k: r[k] for k in ("source", "frames", "hands", "seconds", "fps")}
+            for r in ordered
+        ],
+    }
+    return offline.write_columns(
+        out_path, {name: np.concatenate(parts) for name, parts in merged.items()}, meta
+    )
+
+
+def run_batch(
+    inputs: Sequence[Path],
+    out_dir: Path,
+    workers: int = os.cpu_count() or 1,
+    retries: int = 1,
+    model_path: Path = offline.MODEL_PATH,
+) -> Dict[str, Any]:
+    """
+    Process every video under `inputs` and merge the results.
+
+    Args:
+        inputs: Video files and/or directories to search.
+        out_dir: Receives parts/ and merged.npz.
+        workers: Worker processes; 1 processes the files in this process.
+        retries: Extra attempts for a file that fails.
+        model_path: Classifier checkpoint loaded by every worker.
+
+    Returns:
+        Summary with per-file results, failures, per-worker totals, the
+        merged path and overall frames/sec.
+    """
+    videos = find_videos(inputs)
+    index_of = {path: i for i, path in enumerate(videos)}
+    jobs = [(index_of[path], path) for path in largest_first(videos)]
+    progress = Progress(len(jobs))
+
+    t0 = time.perf_counter()
+    if workers <= 1:
+        results = _run_inline(jobs, out_dir, model_path, retries, progress)
+    else:
+        results = _run_pool(jobs, out_dir, model_path, workers, retries, progress)
+    seconds = time.perf_counter() - t0
+
+    merged = merge_parts(results, out_dir / MERGED_NAME)
+    frames = sum(r["frames"] for r in results)
+    return {
+        "files": len(results),
+        "failed": progress.failed,
+        "frames": frames,
+        "seconds": seconds,
+        "fps": frames / seconds if seconds > 0 else 0.0,
+        "workers": dict(progress.workers),
+        "merged": str(merged) if merged else None,
+        "results": sorted(results, key=lambda r: r["index"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Process many recordings in parallel worker processes"
+    )
+    parser.add_argument("inputs", nargs="+", type=Path)
+    parser.add_argument("--out-dir", type=Path, default=offline.OUT_DIR / "batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--model", type=Path, default=offline.MODEL_PATH)
+    parser.add_argument(
+        "--model-id", default=None, help="Registered run_id prefix or 'latest'"
+    )
+    args = parser.parse_args()
+
+    summary = run_batch(
+        args.inputs,
+        args.out_dir,
+        workers=args.workers,
+        retries=args.retries,
+        model_path=offline.resolve_model(args.model, args.model_id),
+    )
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    with open(args.out_dir / "summary.json", "w", encoding="utf8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(
+        f"{summary['files']} files, {summary['frames']} frames in "
+        f"{summary['seconds']:.1f}s ({summary['fps']:.1f} fps overall) "
+        f"on {args.workers} worker(s)"
+    )
+    for source, error in summary["failed"].items():
+        print(f"FAILED {source}: {error}")
+    if summary["merged"]:
+        print(f"Merged output: {summary['merged']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,651 @@
+"""
+Micro-benchmarks for the ML client
+
+Each benchmark runs on synthetic data so results are comparable across
+machines and do not depend on what has been recorded.
+
+Usage:
+    python -m src.benchmarks training --samples 8000 --epochs 3
+    python -m src.benchmarks augment --batch-size 64
+    python -m src.benchmarks features --hands 4096
+    python -m src.benchmarks detector --width 1280 --height 720
+    python -m src.benchmarks offline --frames 300
+    python -m src.benchmarks roi --width 1920 --height 1080
+    python -m src.benchmarks drawing
+    python -m src.benchmarks hands --hands 2
+    python -m src.benchmarks temporal --frames 600
+    python -m src.benchmarks motion --window 30
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict, Tuple
+
+import cv2
+from mediapipe.framework.formats import (  # pylint: disable=no-name-in-module
+    classification_pb2,
+    landmark_pb2,
+)
+import numpy as np
+import torch
+
+from models.model_MLP import LandmarkMLP
+from models.model_motion import MotionClassifier
+from . import train_mlp
+from .augment import AugmentConfig, augment_batch
+from .features import build_features, normalize_landmarks_batch
+from .motion import (
+    FRAME_DIM,
+    MOTION_CLASSES,
+    MotionStream,
+    sequence_features,
+    synthetic_sequences,
+)
+from .temporal import TemporalFilter
+from .mediapipe_utils import (
+    HAND_CONNECTIONS,
+    HandLandmarks,
+    MediaPipeHandDetector,
+    draw_hand_landmarks_on_frame,
+    normalize_landmarks,
+)
+from . import offline
+from . import webcam_demo
+
+
+def synthetic_landmarks(
+    n_samples: int, num_classes: int = 24, seed: int = 0
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Random (N, 63) features with one cluster per class.
+    """
+    generator = torch.Generator().manual_seed(seed)
+    centers = torch.randn(num_classes, 63, generator=generator)
+    y = torch.randint(0, num_classes, (n_samples,), generator=generator)
+    X = centers[y] + 0.3 * torch.randn(n_samples, 63, generator=generator)
+    return X, y
+
+
+def bench_training_loops(
+    n_samples: int = 8000,
+    num_classes: int = 24,
+    epochs: int = 3,
+    batch_size: int = 64,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Train the same model with each loop in train_mlp.LOOPS.
+
+    Returns:
+        {loop: {"samples_per_sec", "train_seconds", "best_val_acc"}}
+    """
+    X, y = synthetic_landmarks(n_samples, num_classes)
+    results = {}
+    for loop in train_mlp.LOOPS:
+        metrics = train_mlp.fit(
+            X, y, batch_size=batch_size, num_epochs=epochs, loop=loop, verbose=False
+        )["metrics"]
+        results[loop] = {
+            "samples_per_sec": metrics["train_samples_per_sec"],
+            "train_seconds": metrics["train_seconds"],
+            "best_val_acc": metrics["best_val_acc"],
+        }
+    return results
+
+
+def bench_augmentation(
+    batch_size: int = 64, iters: int = 200, config: AugmentConfig | None = None
+) -> Dict[str, float]:
+    """
+    Time augment_batch against one optimizer step on the same batch.
+
+    Returns:
+        {"augment_ms", "train_step_ms", "overhead_pct"} per batch.
+    """
+    config = config or AugmentConfig(mirror_prob=0.5)
+    X, y = synthetic_landmarks(batch_size)
+    X = X / X.reshape(batch_size, 21, 3).norm(dim=2).amax(dim=1, keepdim=True)
+    generator = torch.Generator().manual_seed(0)
+
+    augment_batch(X, config, generator)
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        augment_batch(X, config, generator)
+    augment_ms = 1000.0 * (time.perf_counter() - t0) / iters
+
+    model = LandmarkMLP(input_dim=63, num_classes=24)
+    optimizer = torch.optim.Adam(model.parameters())
+    criterion = torch.nn.CrossEntropyLoss()
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        optimizer.zero_grad(set_to_none=True)
+        criterion(model(X), y).backward()
+        optimizer.step()
+    step_ms = 1000.0 * (time.perf_counter() - t0) / iters
+
+    return {
+        "augment_ms": augment_ms,
+        "train_step_ms": step_ms,
+        "overhead_pct": 100.0 * augment_ms / step_ms,
+    }
+
+
+def bench_features(n_hands: int = 4096, iters: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Per-hand normalize_landmarks against the batched feature path.
+
+    Returns:
+        {variant: {"hands_per_sec", "ms_per_call"}}
+    """
+    pts = np.random.default_rng(0).random((n_hands, 21, 3), dtype=np.float32)
+    out = np.empty((n_hands, 63), dtype=np.float32)
+    variants = {
+        "per_hand": lambda: np.stack([normalize_landmarks(p) for p in pts]),
+        "batch": lambda: normalize_landmarks_batch(pts),
+        "batch_out": lambda: normalize_landmarks_batch(pts, out=out),
+        "engineered": lambda: build_features(pts, engineered=True),
+    }
+    results = {}
+    for name, fn in variants.items():
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        seconds = (time.perf_counter() - t0) / iters
+        results[name] = {
+            "hands_per_sec": n_hands / seconds,
+            "ms_per_call": 1000.0 * seconds,
+        }
+    return results
+
+
+class _ReplayHands:
+    """
+    Stands in for mp.solutions.hands.Hands and returns fixed results, so
+    only the code around the MediaPipe graph is timed.
+    """
+
+    def __init__(self, n_hands: int):
+        rng = np.random.default_rng(0)
+        self.results = SimpleNamespace(multi_hand_landmarks=[], multi_handedness=[])
+        for _ in range(n_hands):
+            hand = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z in rng.random((21, 3)):
+                hand.landmark.add(x=x, y=y, z=z)
+            handedness = classification_pb2.ClassificationList()
+            handedness.classification.add(label="Right", score=1.0)
+            self.results.multi_hand_landmarks.append(hand)
+            self.results.multi_handedness.append(handedness)
+
+    def process(self, _frame_rgb):
+        return self.results
+
+    def close(self):
+        pass
+
+
+def _allocating_process(hands, frame_bgr: np.ndarray):
+    """
+    The per-frame glue before the detector reused its buffers, as a baseline.
+    """
+    results = hands.process(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
+    out = []
+    for hand_landmarks in results.multi_hand_landmarks:
+        pts = []
+        for lm in hand_landmarks.landmark:
+            pts.append([lm.x, lm.y, lm.z])
+        out.append(np.array(pts, dtype=np.float32))
+    return out
+
+
+def bench_detector_overhead(
+    width: int = 640, height: int = 480, n_hands: int = 2, iters: int = 500
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per-frame cost of MediaPipeHandDetector.process outside MediaPipe itself
+    (colour conversion and landmark extraction), against the allocating
+    version.
+
+    Returns:
+        {variant: {"frames_per_sec", "us_per_frame"}}
+    """
+    frame = np.random.default_rng(0).integers(
+        0, 256, (height, width, 3), dtype=np.uint8
+    )
+    replay = _ReplayHands(n_hands)
+    detector = MediaPipeHandDetector(max_num_hands=n_hands)
+    detector.close()
+    detector.hands = replay
+
+    variants = {
+        "allocating": lambda: _allocating_process(replay, frame),
+        "buffered": lambda: detector.process(frame),
+    }
+    results = {}
+    for name, fn in variants.items():
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        seconds = (time.perf_counter() - t0) / iters
+        results[name] = {"frames_per_sec": 1.0 / seconds, "us_per_frame": 1e6 * seconds}
+    return results
+
+
+def draw_hand_per_call(frame_bgr: np.ndarray, hand: HandLandmarks) -> None:
+    """
+    The overlay drawn with one OpenCV call per bone and joint, as a baseline.
+    """
+    h, w, _ = frame_bgr.shape
+    pixel_pts = [(int(x * w), int(y * h)) for x, y, _ in hand.points]
+    for i, j in HAND_CONNECTIONS:
+        cv2.line(frame_bgr, pixel_pts[i], pixel_pts[j], (0, 255, 0), 2)
+    for point in pixel_pts:
+        cv2.circle(frame_bgr, point, 4, (0, 0, 255), -1)
+    cv2.putText(
+        frame_bgr,
+        hand.handedness,
+        (pixel_pts[0][0] + 5, pixel_pts[0][1] - 5),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (255, 255, 255),
+        2,
+    )
+
+
+def bench_drawing(
+    width: int = 640, height: int = 480, iters: int = 2000
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per-call against vectorized landmark overlay drawing for one hand.
+
+    Returns:
+        {variant: {"hands_per_sec", "us_per_hand"}}
+    """
+    points = np.random.default_rng(0).random((21, 3), dtype=np.float32)
+    hand = HandLandmarks(points=points, handedness="Right")
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    variants = {
+        "per_call": lambda: draw_hand_per_call(frame, hand),
+        "vectorized": lambda: draw_hand_landmarks_on_frame(frame, hand),
+    }
+    results = {}
+    for name, fn in variants.items():
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        seconds = (time.perf_counter() - t0) / iters
+        results[name] = {"hands_per_sec": 1.0 / seconds, "us_per_hand": 1e6 * seconds}
+    return results
+
+
+def bench_detector_input_size(
+    width: int = 1920,
+    height: int = 1080,
+    detect_width: int = 640,
+    roi_side: int = 360,
+    iters: int = 30,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Real MediaPipe cost per frame for what the detector hands it in each
+    mode: the full frame, a downscaled full frame (detect_width), and the
+    crop ROI mode uses while a hand is tracked.
+
+    Returns:
+        {variant: {"frames_per_sec", "ms_per_frame"}}
+    """
+    frame = np.random.default_rng(0).integers(
+        0, 256, (height, width, 3), dtype=np.uint8
+    )
+    crop = frame[:roi_side, :roi_side]
+    full = MediaPipeHandDetector()
+    small = MediaPipeHandDetector(detect_width=detect_width)
+    variants = {
+        "full": lambda: full.process(frame),
+        "downscaled": lambda: small.process(frame),
+        "roi_crop": lambda: full.process(crop),
+    }
+    results = {}
+    try:
+        for name, fn in variants.items():
+            for _ in range(3):
+                fn()
+            t0 = time.perf_counter()
+            for _ in range(iters):
+                fn()
+            seconds = (time.perf_counter() - t0) / iters
+            results[name] = {
+                "frames_per_sec": 1.0 / seconds,
+                "ms_per_frame": 1000.0 * seconds,
+            }
+    finally:
+        full.close()
+        small.close()
+    return results
+
+
+def bench_offline(
+    n_frames: int = 300, width: int = 640, height: int = 480
+) -> Dict[str, float]:
+    """
+    Headless throughput of src.offline on a synthetic video, with the real
+    MediaPipe detector and classifier.
+
+    Returns:
+        {"frames", "seconds", "fps", "classify_seconds"}
+    """
+    classifier = offline.LetterClassifier()
+    with tempfile.TemporaryDirectory() as tmp:
+        video = offline.write_synthetic_video(
+            Path(tmp) / "synthetic.avi", n_frames, width, height
+        )
+        detector = offline.make_detector(video)
+        try:
+            _, stats = offline.process_source(video, detector, classifier)
+        finally:
+            detector.close()
+    return {key: stats[key] for key in ("frames", "seconds", "fps", "classify_seconds")}
+
+
+def bench_multi_hand(
+    n_hands: int = 2, num_classes: int = 24, iters: int = 1000
+) -> Dict[str, Dict[str, float]]:
+    """
+    One forward pass per hand against one batched forward for all hands
+    of a frame, as in the webcam demo.
+
+    Returns:
+        {variant: {"frames_per_sec", "us_per_frame"}}
+    """
+    torch.manual_seed(0)
+    model = LandmarkMLP(input_dim=63, num_classes=num_classes).eval()
+    letters = {i: chr(ord("A") + i) for i in range(num_classes)}
+    pts = np.random.default_rng(0).random((n_hands, 21, 3), dtype=np.float32)
+    hands = [HandLandmarks(points=p, handedness="Right") for p in pts]
+    variants = {
+        "per_hand": lambda: [
+            webcam_demo.classify_hand(model, "cpu", hand, letters) for hand in hands
+        ],
+        "batched": lambda: webcam_demo.classify_hands(model, "cpu", hands, letters),
+    }
+    results = {}
+    for name, fn in variants.items():
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        seconds = (time.perf_counter() - t0) / iters
+        results[name] = {
+            "frames_per_sec": 1.0 / seconds,
+            "us_per_frame": 1e6 * seconds,
+        }
+    return results
+
+
+def synthetic_hand_stream(
+    n_frames: int = 600, hold_frames: int = 30, jitter: float = 0.002, seed: int = 0
+) -> np.ndarray:
+    """
+    (n_frames, 21, 3) landmarks of a hand holding a new random pose every
+    `hold_frames` frames, with per-frame jitter like a real held pose.
+    """
+    rng = np.random.default_rng(seed)
+    poses = rng.random((-(-n_frames // hold_frames), 21, 3), dtype=np.float32)
+    stream = np.repeat(poses, hold_frames, axis=0)[:n_frames]
+    return stream + rng.normal(0, jitter, stream.shape).astype(np.float32)
+
+
+def bench_temporal(
+    n_frames: int = 600, num_classes: int = 24
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per-frame classification against the motion-gated, smoothed filter used
+    by the webcam demo, on one synthetic hand stream.
+
+    Returns:
+        {variant: {"frames_per_sec", "forwards"}}
+    """
+    torch.manual_seed(0)
+    model = LandmarkMLP(input_dim=63, num_classes=num_classes).eval()
+    letters = {i: chr(ord("A") + i) for i in range(num_classes)}
+    stream = synthetic_hand_stream(n_frames)
+
+    results = {}
+    for name in ("per_frame", "temporal"):
+        temporal = TemporalFilter() if name == "temporal" else None
+        t0 = time.perf_counter()
+        for pts in stream:
+            hand = HandLandmarks(points=pts, handedness="Right")
+            webcam_demo.predict_hands(model, "cpu", [hand], letters, temporal)
+        seconds = time.perf_counter() - t0
+        results[name] = {
+            "frames_per_sec": n_frames / seconds,
+            "forwards": temporal.forwards if temporal else n_frames,
+        }
+    return results
+
+
+def bench_motion(
+    window: int = 30, iters: int = 300, camera_fps: float = 30.0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per-frame cost of the J/Z classifier: recomputing features and the
+    whole model over the window every frame, against MotionStream's
+    incremental update. The static LandmarkMLP forward is included for
+    scale.
+
+    Returns:
+        {variant: {"frames_per_sec", "us_per_frame", "budget_pct"}} where
+        budget_pct is the share of one camera frame interval.
+    """
+    torch.manual_seed(0)
+    model = MotionClassifier(frame_dim=FRAME_DIM, num_classes=len(MOTION_CLASSES))
+    model.eval()
+    mlp = LandmarkMLP(input_dim=63, num_classes=24).eval()
+    X, _ = synthetic_sequences(-(-(iters + window) // window), length=window)
+    frames = X.reshape((-1, 21, 3))
+    stream = MotionStream(model, window=window)
+    for pts in frames[:window]:
+        stream.push(pts)
+
+    def recompute(i):
+        feats = sequence_features(frames[i : i + window][np.newaxis])
+        with torch.no_grad():
+            return torch.softmax(model(torch.from_numpy(feats)), dim=1)
+
+    def incremental(i):
+        stream.push(frames[i + window - 1])
+        return stream.probs()
+
+    def static_mlp(i):
+        feats = normalize_landmarks_batch(frames[i : i + 1])
+        with torch.no_grad():
+            return torch.softmax(mlp(torch.from_numpy(feats)), dim=1)
+
+    results = {}
+    for name, fn in (
+        ("recompute", recompute),
+        ("incremental", incremental),
+        ("static_mlp", static_mlp),
+    ):
+        fn(0)
+        t0 = time.perf_counter()
+        for i in range(iters):
+            fn(i)
+        seconds = (time.perf_counter() - t0) / iters
+        results[name] = {
+            "frames_per_sec": 1.0 / seconds,
+            "us_per_frame": 1e6 * seconds,
+            "budget_pct": 100.0 * seconds * camera_fps,
+        }
+    return results
+
+
+def print_results(
+    title: str,
+    results: Dict[str, Dict[str, float]],
+    baseline: str,
+    rate_key: str = "samples_per_sec",
+) -> None:
+    """
+    Print one row per variant with its speedup over `baseline`.
+    """
+    print(title)
+    base_rate = results[baseline][rate_key]
+    for name, row in results.items():
+        cells = "  ".join(f"{key}={value:.4g}" for key, value in row.items())
+        speedup = row[rate_key] / base_rate if base_rate else float("nan")
+        print(f"  {name:>12}: {cells}  ({speedup:.2f}x vs {baseline})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run ML client micro-benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    training = sub.add_parser("training", help="Tensor vs DataLoader training loop")
+    training.add_argument("--samples", type=int, default=8000)
+    training.add_argument("--classes", type=int, default=24)
+    training.add_argument("--epochs", type=int, default=3)
+    training.add_argument("--batch-size", type=int, default=64)
+
+    augment = sub.add_parser("augment", help="Augmentation cost per batch")
+    augment.add_argument("--batch-size", type=int, default=64)
+    augment.add_argument("--iters", type=int, default=200)
+
+    features = sub.add_parser("features", help="Per-hand vs batched features")
+    features.add_argument("--hands", type=int, default=4096)
+    features.add_argument("--iters", type=int, default=20)
+
+    detector = sub.add_parser("detector", help="Detector overhead outside MediaPipe")
+    detector.add_argument("--width", type=int, default=640)
+    detector.add_argument("--height", type=int, default=480)
+    detector.add_argument("--hands", type=int, default=2)
+    detector.add_argument("--iters", type=int, default=500)
+
+    offline_parser = sub.add_parser("offline", help="Headless video throughput")
+    offline_parser.add_argument("--frames", type=int, default=300)
+    offline_parser.add_argument("--width", type=int, default=640)
+    offline_parser.add_argument("--height", type=int, default=480)
+
+    roi = sub.add_parser("roi", help="MediaPipe cost by detector input size")
+    roi.add_argument("--width", type=int, default=1920)
+    roi.add_argument("--height", type=int, default=1080)
+    roi.add_argument("--detect-width", type=int, default=640)
+    roi.add_argument("--roi-side", type=int, default=360)
+    roi.add_argument("--iters", type=int, default=30)
+
+    drawing = sub.add_parser("drawing", help="Landmark overlay drawing cost")
+    drawing.add_argument("--width", type=int, default=640)
+    drawing.add_argument("--height", type=int, default=480)
+    drawing.add_argument("--iters", type=int, default=2000)
+
+    hands = sub.add_parser("hands", help="Per-hand vs batched classification")
+    hands.add_argument("--hands", type=int, default=2)
+    hands.add_argument("--iters", type=int, default=1000)
+
+    temporal = sub.add_parser("temporal", help="Per-frame vs motion-gated demo")
+    temporal.add_argument("--frames", type=int, default=600)
+
+    motion = sub.add_parser("motion", help="J/Z classifier cost per frame")
+    motion.add_argument("--window", type=int, default=30)
+    motion.add_argument("--iters", type=int, default=300)
+
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    if args.benchmark == "motion":
+        print_results(
+            f"Motion letters, {args.window}-frame window",
+            bench_motion(window=args.window, iters=args.iters),
+            baseline="recompute",
+            rate_key="frames_per_sec",
+        )
+    elif args.benchmark == "temporal":
+        print_results(
+            f"Live classification, {args.frames} frames of held poses",
+            bench_temporal(n_frames=args.frames),
+            baseline="per_frame",
+            rate_key="frames_per_sec",
+        )
+    elif args.benchmark == "hands":
+        print_results(
+            f"Classification, {args.hands} hands per frame",
+            bench_multi_hand(n_hands=args.hands, iters=args.iters),
+            baseline="per_hand",
+            rate_key="frames_per_sec",
+        )
+    elif args.benchmark == "drawing":
+        print_results(
+            f"Overlay drawing, {args.width}x{args.height}",
+            bench_drawing(args.width, args.height, args.iters),
+            baseline="per_call",
+            rate_key="hands_per_sec",
+        )
+    elif args.benchmark == "roi":
+        print_results(
+            f"Detector input, {args.width}x{args.height} frame",
+            bench_detector_input_size(
+                args.width, args.height, args.detect_width, args.roi_side, args.iters
+            ),
+            baseline="full",
+            rate_key="frames_per_sec",
+        )
+    elif args.benchmark == "offline":
+        result = bench_offline(args.frames, args.width, args.height)
+        print(
+            f"Offline, {args.width}x{args.height} synthetic video: "
+            f"{result['frames']} frames in {result['seconds']:.2f}s "
+            f"({result['fps']:.1f} fps)"
+        )
+    elif args.benchmark == "detector":
+        print_results(
+            f"Detector glue, {args.width}x{args.height}, {args.hands} hand(s)",
+            bench_detector_overhead(
+                width=args.width,
+                height=args.height,
+                n_hands=args.hands,
+                iters=args.iters,
+            ),
+            baseline="allocating",
+            rate_key="frames_per_sec",
+        )
+    elif args.benchmark == "features":
+        print_results(
+            f"Landmark features, {args.hands} hands",
+            bench_features(n_hands=args.hands, iters=args.iters),
+            baseline="per_hand",
+            rate_key="hands_per_sec",
+        )
+    elif args.benchmark == "augment":
+        result = bench_augmentation(batch_size=args.batch_size, iters=args.iters)
+        print(
+            f"Augmentation, batch {args.batch_size}: "
+            f"{result['augment_ms']:.3f} ms/batch vs "
+            f"{result['train_step_ms']:.3f} ms per training step "
+            f"({result['overhead_pct']:.1f}% overhead)"
+        )
+    elif args.benchmark == "training":
+        results = bench_training_loops(
+            n_samples=args.samples,
+            num_classes=args.classes,
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+        )
+        print_results(
+            f"Training loop, {args.samples} samples x {args.epochs} epochs, "
+            f"batch {args.batch_size}",
+            results,
+            baseline="dataloader",
+        )
+
+
+if __name__ == "__main__":
+    main()
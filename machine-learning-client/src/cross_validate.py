@@ -0,0 +1,318 @@
+"""
+Stratified k-fold cross-validation for the landmark MLP
+
+Folds are stratified by class and seeded, so two runs on the same data and
+config see exactly the same splits. Folds are trained in parallel worker
+processes (one torch thread each) and their out-of-fold predictions are
+combined into overall and per-class accuracy and a confusion matrix.
+The held-out fold is only ever predicted once: the epoch to keep is chosen
+on an inner split of the training folds, as train_mlp does for the model
+it ships, so the reported accuracy is not tuned to the test fold.
+Results are cached by dataset digest + config, so re-running an unchanged
+evaluation is free.
+
+Usage:
+    python -m src.cross_validate --folds 5 --workers 5
+    python -m src.cross_validate --folds 5 --lr 3e-3 --epochs 20 --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.multiprocessing as torch_mp
+
+from . import train_mlp
+from .registry import config_digest, dataset_digest, make_run_id
+from .sweep import pin_torch_threads
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CV_CACHE_DIR = PROJECT_ROOT / "models" / "cv_cache"
+LABEL_MAP_PATH = PROJECT_ROOT / "data" / "label_map.json"
+# Share of each fold's training samples used to pick the best epoch
+INNER_VAL_SPLIT = 0.2
+
+# Per-process state set up by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def stratified_folds(y: np.ndarray, k: int, seed: int = 0) -> List[np.ndarray]:
+    """
+    Split sample indices into k folds with each class spread evenly.
+
+    Each class is shuffled and dealt round-robin across the folds; the
+    starting fold rotates between classes so fold sizes stay balanced.
+
+    Returns:
+        k sorted index arrays (the validation indices of each fold).
+    """
+    if k < 2:
+        raise ValueError("k must be at least 2")
+    y = np.asarray(y)
+    rng = np.random.default_rng(seed)
+    folds: List[List[np.ndarray]] = [[] for _ in range(k)]
+    offset = 0
+    for label in np.unique(y):
+        idx = rng.permutation(np.flatnonzero(y == label))
+        for i in range(k):
+            folds[(offset + i) % k].append(idx[i::k])
+        offset += len(idx)
+    return [np.sort(np.concatenate(parts)) for parts in folds]
+
+
+def _init_worker(X, y, params: Dict[str, Any], num_classes: int) -> None:
+    """
+    Pool initializer: one torch thread per fold, shared dataset.
+    """
+    pin_torch_threads()
+    _worker.update(X=X, y=y, params=params, num_classes=num_classes)
+
+
+def run_fold(fold: int, val_idx: np.ndarray, seed: int) -> Dict[str, Any]:
+    """
+    Train on every fold but `fold`, keeping the epoch that scores best on
+    an inner validation split of those folds, then predict the held-out
+    samples once.
+    """
+    X, y = _worker["X"], _worker["y"]
+    val_mask = torch.zeros(len(y), dtype=torch.bool)
+    val_mask[torch.from_numpy(val_idx)] = True
+
+    result = train_mlp.fit(
+        X[~val_mask],
+        y[~val_mask],
+        num_classes=_worker["num_classes"],
+        seed=seed + fold,
+        verbose=False,
+        **_worker["params"],
+    )
+
+    model = result["model"]
+    if result["best_state"] is not None:
+        model.load_state_dict(result["best_state"])
+    model.eval()
+    device = next(model.parameters()).device
+    with torch.no_grad():
+        preds = model(X[val_mask].to(device)).argmax(dim=1).cpu().numpy()
+
+    return {
+        "fold": fold,
+        "val_idx": val_idx,
+        "preds": preds,
+        "val_acc": float((preds == y[val_mask].numpy()).mean()),
+        "train_seconds": result["metrics"]["train_seconds"],
+    }
+
+
+def summarize(
+    y: np.ndarray, fold_results: List[Dict[str, Any]], num_classes: int
+) -> Dict[str, Any]:
+    """
+    Combine out-of-fold predictions into aggregate metrics.
+    """
+    y = np.asarray(y)
+    oof = np.full(len(y), -1, dtype=np.int64)
+    for res in fold_results:
+        oof[res["val_idx"]] = res["preds"]
+
+    confusion = np.bincount(
+        y * num_classes + oof, minlength=num_classes * num_classes
+    ).reshape(num_classes, num_classes)
+    support = confusion.sum(axis=1)
+    per_class = np.divide(
+        np.diag(confusion),
+        support,
+        out=np.full(num_classes, np.nan),
+        where=support > 0,
+    )
+    fold_accs = [
+        res["val_acc"] for res in sorted(fold_results, key=lambda r: r["fold"])
+    ]
+
+    return {
+        "accuracy": float((oof == y).mean()),
+        "fold_accuracy": fold_accs,
+        "fold_accuracy_mean": float(np.mean(fold_accs)),
+        "fold_accuracy_std": float(np.std(fold_accs)),
+        "per_class_accuracy": [None if np.isnan(a) else float(a) for a in per_class],
+        "support": support.tolist(),
+        "confusion_matrix": confusion.tolist(),
+    }
+
+
+def cross_validate(
+    X: torch.Tensor,
+    y: torch.Tensor,
+    k: int = 5,
+    seed: int = 0,
+    workers: int = os.cpu_count() or 1,
+    cache_dir: Optional[Path] = CV_CACHE_DIR,
+    force: bool = False,
+    inner_val_split: float = INNER_VAL_SPLIT,
+    **params: Any,
+) -> Dict[str, Any]:
+    """
+    Run stratified k-fold cross-validation, using the cache when possible.
+
+    Args:
+        X, y: Full dataset.
+        k: Number of folds.
+        seed: Fold assignment and training seed.
+        workers: Worker processes; 1 trains the folds in this process.
+        cache_dir: Where results are cached; None disables caching.
+        force: Recompute even if a cached result exists.
+        inner_val_split: Share of each fold's training samples held out to
+            pick the best epoch; 0 scores the final-epoch model.
+        **params: fit() hyperparameters (batch_size, lr, weight_decay,
+            num_epochs, loop).
+
+    Returns:
+        The result record: config, dataset digest, timing and the metrics
+        from summarize().
+    """
+    if workers > 1:
+        # Share copies, not the caller's tensors, and do it before taking
+        # numpy views of the storage
+        X, y = (
+            t.clone(memory_format=torch.contiguous_format).share_memory_()
+            for t in (X, y)
+        )
+    else:
+        X, y = X.contiguous(), y.contiguous()
+    y_np = y.numpy()
+    num_classes = int(y_np.max()) + 1
+    config = {
+        "k": k,
+        "seed": seed,
+        "num_classes": num_classes,
+        "inner_val_split": inner_val_split,
+        **params,
+    }
+    params = {**params, "val_split": inner_val_split}
+    data_digest = dataset_digest(X.numpy(), y_np)
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = (
+            Path(cache_dir) / f"{make_run_id(data_digest, config_digest(config))}.json"
+        )
+        if cache_path.exists() and not force:
+            with open(cache_path, "r", encoding="utf8") as f:
+                return {**json.load(f), "cached": True}
+
+    folds = stratified_folds(y_np, k, seed)
+
+    t0 = time.perf_counter()
+    results = []
+    if workers <= 1:
+        previous_threads = torch.get_num_threads()
+        _init_worker(X, y, params, num_classes)
+        try:
+            results = [run_fold(i, idx, seed) for i, idx in enumerate(folds)]
+        finally:
+            torch.set_num_threads(previous_threads)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, k),
+            mp_context=torch_mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(X, y, params, num_classes),
+        ) as pool:
+            futures = [
+                pool.submit(run_fold, i, idx, seed) for i, idx in enumerate(folds)
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+    record = {
+        "config": config,
+        "dataset_digest": data_digest,
+        "num_samples": len(y_np),
+        "seconds": round(time.perf_counter() - t0, 3),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **summarize(y_np, results, num_classes),
+    }
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf8") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp, cache_path)
+    return {**record, "cached": False}
+
+
+def format_report(record: Dict[str, Any], index_to_letter: Dict[str, str]) -> str:
+    """
+    Fold accuracies, per-class accuracy and the confusion matrix as text.
+    """
+    names = [
+        index_to_letter.get(str(i), str(i))
+        for i in range(len(record["per_class_accuracy"]))
+    ]
+    folds = " ".join(f"{a:.4f}" for a in record["fold_accuracy"])
+    lines = [
+        f"Fold accuracy: {folds}",
+        f"Mean {record['fold_accuracy_mean']:.4f} +/- "
+        f"{record['fold_accuracy_std']:.4f}, "
+        f"out-of-fold accuracy {record['accuracy']:.4f}",
+        "",
+        "Per-class accuracy:",
+    ]
+    for name, acc, n in zip(names, record["per_class_accuracy"], record["support"]):
+        acc_text = "   n/a" if acc is None else f"{acc:.4f}"
+        lines.append(f"  {name:>3} {acc_text} (n={n})")
+
+    lines += ["", "Confusion matrix (rows = true, cols = predicted):"]
+    lines.append("    " + "".join(f"{n:>5}" for n in names))
+    for name, row in zip(names, record["confusion_matrix"]):
+        lines.append(f"{name:>3} " + "".join(f"{c:>5}" for c in row))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stratified k-fold cross-validation for the landmark MLP"
+    )
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--weight-decay", type=float, default=1e-4)
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--force", action="store_true", help="Ignore cached results")
+    args = parser.parse_args()
+
+    dataset = train_mlp.load_dataset()
+    record = cross_validate(
+        dataset.tensors[0],
+        dataset.tensors[1],
+        k=args.folds,
+        seed=args.seed,
+        workers=args.workers,
+        force=args.force,
+        batch_size=args.batch_size,
+        lr=args.lr,
+        weight_decay=args.weight_decay,
+        num_epochs=args.epochs,
+    )
+
+    index_to_letter = {}
+    if LABEL_MAP_PATH.exists():
+        with open(LABEL_MAP_PATH, "r", encoding="utf8") as f:
+            index_to_letter = json.load(f).get("index_to_letter", {})
+
+    source = "cached result" if record["cached"] else f"{record['seconds']:.1f}s"
+    print(f"{args.folds}-fold CV on {record['num_samples']} samples ({source})")
+    print(format_report(record, index_to_letter))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ Module that handles ASL Mnist Dataset. NOT CURRENTLY USED IN MODEL
 from pathlib import Path
 
 import json
+import os
+import shutil
 from typing import Optional, Callable, Tuple
 import time
 
@@ -14,6 +16,8 @@ from PIL import Image
 import numpy as np
 import mediapipe as mp
 
+from .features import normalize_landmarks_batch
+
 
 def load_label_maps(label_map_path: Optional[Path] = None):
     """
@@ -44,26 +48,52 @@ def normalize_landmarks(pts: np.ndarray) -> np.ndarray:
     - Translate so wrist is at origin
     - Scale so max distance = 1
     """
-    assert pts.shape == (21, 3)
+    return normalize_landmarks_batch(pts[np.newaxis])[0]
+
 
-    wrist = pts[0].copy()
-    centered = pts - wrist
+mp_hands = mp.solutions.hands
 
-    dists = np.linalg.norm(centered, axis=1)
-    max_dist = np.max(dists)
+# Created on first use so that each worker process builds its own instance;
+# MediaPipe graphs must not be shared across processes.
+_mp_model = None
 
-    if max_dist > 0:
-        centered /= max_dist
 
-    return centered.flatten().astype(np.float32)
+def create_hands_model():
+    """
+    Build a MediaPipe Hands instance configured for still images.
+    """
+    return mp_hands.Hands(
+        static_image_mode=True,
+        max_num_hands=1,
+        min_detection_confidence=0.5,
+    )
 
 
-mp_hands = mp.solutions.hands
-_mp_model = mp_hands.Hands(
-    static_image_mode=True,
-    max_num_hands=1,
-    min_detection_confidence=0.5,
-)
+def get_hands_model():
+    """
+    Return this process's shared MediaPipe Hands instance, creating it lazily.
+    """
+    global _mp_model  # pylint: disable=global-statement
+    if _mp_model is None:
+        _mp_model = create_hands_model()
+    return _mp_model
+
+
+def extract_landmarks(hands, pil_img: Image.Image) -> Optional[np.ndarray]:
+    """
+    Run a MediaPipe Hands instance on a PIL image.
+
+    Returns:
+        (21, 3) float32 landmarks of the first hand, or None if no hand found.
+    """
+    np_img = np.array(pil_img.convert("RGB"))
+    results = hands.process(np_img)
+
+    if not results.multi_hand_landmarks:
+        return None
+
+    hand = results.multi_hand_landmarks[0]
+    return np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark], dtype=np.float32)
 
 
 def load_asl_mnist_with_retries(split="train", max_retries=1000, base_delay=60):
@@ -94,6 +124,114 @@ def load_asl_mnist_with_retries(split="train", max_retries=1000, base_delay=60):
     raise RuntimeError("Exceeded max retries while loading ASL MNIST")
 
 
+CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "landmark_cache"
+
+# Bump when extraction or normalization changes so old caches are discarded
+CACHE_FORMAT_VERSION = 1
+
+STATUS_UNKNOWN = 0
+STATUS_HAND = 1
+STATUS_NO_HAND = 2
+
+
+def dataset_fingerprint(dataset, split: str) -> str:
+    """
+    Identify a dataset's contents for cache invalidation.
+
+    Uses the Hugging Face fingerprint when available, plus the MediaPipe
+    version and cache format, since either changes the extracted features.
+    """
+    hf_fingerprint = getattr(dataset, "_fingerprint", None) or f"len={len(dataset)}"
+    return (
+        f"{split}:{hf_fingerprint}:mediapipe={mp.__version__}:v{CACHE_FORMAT_VERSION}"
+    )
+
+
+class LandmarkCache:
+    """
+    Disk-backed, memory-mapped cache of extracted landmark features.
+
+    Stores, per dataset index, the normalized (63,) feature vector, the
+    contiguous label and a status byte (unknown / hand / no hand detected).
+    The cache lives in <cache_dir>/<split>/ and is discarded whenever the
+    dataset fingerprint changes.
+    """
+
+    def __init__(self, cache_dir: Path, split: str, num_samples: int, fingerprint: str):
+        self.dir = Path(cache_dir) / split
+        meta = {
+            "split": split,
+            "num_samples": num_samples,
+            "fingerprint": fingerprint,
+        }
+
+        meta_path = self.dir / "meta.json"
+        valid = False
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf8") as f:
+                valid = json.load(f) == meta
+
+        if not valid:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            self.dir.mkdir(parents=True, exist_ok=True)
+
+        mode = "r+" if valid else "w+"
+        open_memmap = np.lib.format.open_memmap
+        self.features = open_memmap(
+            self.dir / "features.npy",
+            mode=mode,
+            dtype=np.float32,
+            shape=(num_samples, 63),
+        )
+        self.labels = open_memmap(
+            self.dir / "labels.npy", mode=mode, dtype=np.int64, shape=(num_samples,)
+        )
+        self.status = open_memmap(
+            self.dir / "status.npy", mode=mode, dtype=np.uint8, shape=(num_samples,)
+        )
+
+        if not valid:
+            # Written last, so an interrupted setup is rebuilt next time
+            tmp = meta_path.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf8") as f:
+                json.dump(meta, f)
+            os.replace(tmp, meta_path)
+
+    def get(self, idx: int) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Return (features, label) for a cached index, or None if not cached.
+        Features are zeros when no hand was detected.
+        """
+        if self.status[idx] == STATUS_UNKNOWN:
+            return None
+        return np.array(self.features[idx]), int(self.labels[idx])
+
+    def put(self, idx: int, features: Optional[np.ndarray], label: int) -> None:
+        """
+        Record the extraction result for idx; None means no hand detected.
+        """
+        if features is None:
+            self.features[idx] = 0.0
+        else:
+            self.features[idx] = features
+        self.labels[idx] = label
+        # Status goes last so a crash mid-write leaves the entry unknown
+        self.status[idx] = STATUS_NO_HAND if features is None else STATUS_HAND
+
+    def no_hand_mask(self) -> np.ndarray:
+        """
+        Boolean mask of indices where MediaPipe found no hand.
+        """
+        return np.asarray(self.status) == STATUS_NO_HAND
+
+    def num_cached(self) -> int:
+        return int(np.count_nonzero(self.status))
+
+    def flush(self) -> None:
+        for array in (self.features, self.labels, self.status):
+            array.flush()
+
+
 class ASLMNISTDataset(Dataset):
     """
     Wrapper around Hugging Face Voxel51/American-Sign-Language-MNIST.
@@ -102,6 +240,8 @@ class ASLMNISTDataset(Dataset):
     - Converts HF's non-contiguous labels to contiguous indices
       using raw_label_to_index from label_map.json
     - Returns (image_tensor, label_index)
+    - With cache_dir set, extracted landmarks are kept in a LandmarkCache
+      so only the first epoch runs MediaPipe
     """
 
     def __init__(
@@ -109,6 +249,7 @@ class ASLMNISTDataset(Dataset):
         split: str = "train",
         transform: Optional[Callable] = None,
         as_pil: bool = False,
+        cache_dir: Optional[Path] = None,
     ):
         """
         Args:
@@ -117,6 +258,8 @@ class ASLMNISTDataset(Dataset):
                        If None, images will be converted to float32
                        tensors in [0, 1] with shape (1, 28, 28).
             as_pil: If True, __getitem__ returns PIL.Image instead of tensor
+            cache_dir: Directory for the persistent landmark cache
+                       (e.g. CACHE_DIR). None disables caching.
         """
         self.dataset = load_asl_mnist_with_retries(split=split)
 
@@ -129,22 +272,28 @@ class ASLMNISTDataset(Dataset):
         self.transform = transform
         self.as_pil = as_pil
 
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = LandmarkCache(
+                cache_dir,
+                split,
+                len(self.dataset),
+                dataset_fingerprint(self.dataset, split),
+            )
+
     def __len__(self):
         return len(self.dataset)
 
     def _extract_landmarks(self, pil_img: Image.Image) -> Optional[np.ndarray]:
         """Runs MediaPipe on a PIL image, returns (21,3) or None."""
-        np_img = np.array(pil_img)
-        results = _mp_model.process(np_img)
-
-        if not results.multi_hand_landmarks:
-            return None
-
-        hand = results.multi_hand_landmarks[0]
-        pts = np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark], dtype=np.float32)
-        return pts
+        return extract_landmarks(get_hands_model(), pil_img)
 
     def __getitem__(self, idx: int) -> Tuple[np.ndarray, int]:
+        if self.cache is not None:
+            cached = self.cache.get(idx)
+            if cached is not None:
+                return cached
+
         sample = self.dataset[idx]
 
         img = sample["image"]
@@ -155,9 +304,11 @@ class ASLMNISTDataset(Dataset):
         label = self.raw_label_to_index[raw_label]
 
         pts = self._extract_landmarks(img)
+        X = None if pts is None else normalize_landmarks(pts)  # shape (63,)
 
-        if pts is None:
-            return np.zeros((63,), dtype=np.float32), label
+        if self.cache is not None:
+            self.cache.put(idx, X, label)
 
-        X = normalize_landmarks(pts)  # shape (63,)
+        if X is None:
+            return np.zeros((63,), dtype=np.float32), label
         return X, label
@@ -0,0 +1,188 @@
+"""
+Near-duplicate filtering for landmark samples
+
+Two samples are near-duplicates when the RMS distance between their 21
+normalized joints is below `eps`. Holding a pose in front of the camera
+produces dozens of these per second; they cost training time without adding
+information.
+
+- RecentSampleFilter skips such frames at record time.
+- deduplicate() removes them from an existing dataset.
+
+Usage:
+    python -m src.dedup --eps 0.01            # report only
+    python -m src.dedup --eps 0.01 --apply    # rewrite the dataset
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .landmark_store import FEATURE_DIM, LandmarkStore, load_landmarks
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data"
+DATA_PATH = DATA_DIR / "webcam_landmarks"
+LEGACY_DATA_PATH = DATA_DIR / "webcam_landmarks.npz"
+LABEL_MAP_PATH = DATA_DIR / "label_map.json"
+
+# Median frame-to-frame RMS joint movement while holding a pose is ~0.01
+DEFAULT_EPS = 0.01
+
+
+def pose_distances(sample: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    RMS joint distance between one (63,) sample and each row of (K, 63).
+    """
+    diff = (others - sample).reshape(len(others), -1, 3)
+    return np.sqrt((diff**2).sum(axis=2).mean(axis=1))
+
+
+class RecentSampleFilter:
+    """
+    Rejects a sample that is within `eps` of any of the last `window`
+    accepted samples with the same label.
+    """
+
+    def __init__(self, eps: float = DEFAULT_EPS, window: int = 32):
+        self.eps = eps
+        self.window = window
+        # label -> (ring buffer of accepted samples, number written)
+        self._recent: Dict[int, Tuple[np.ndarray, int]] = {}
+        self.accepted = 0
+        self.skipped = 0
+
+    def accept(self, features: np.ndarray, label: int) -> bool:
+        """
+        Return True and remember the sample if it is not a near-duplicate.
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(FEATURE_DIM)
+        ring, count = self._recent.get(label, (None, 0))
+        if ring is None:
+            ring = np.empty((self.window, FEATURE_DIM), dtype=np.float32)
+
+        filled = min(count, self.window)
+        if filled and pose_distances(features, ring[:filled]).min() < self.eps:
+            self.skipped += 1
+            return False
+
+        ring[count % self.window] = features
+        self._recent[label] = (ring, count + 1)
+        self.accepted += 1
+        return True
+
+
+def deduplicate(X: np.ndarray, y: np.ndarray, eps: float = DEFAULT_EPS):
+    """
+    Greedily keep samples that are at least `eps` from every sample already
+    kept with the same label, in dataset order.
+
+    Args:
+        X: (N, 63) features.
+        y: (N,) labels.
+        eps: RMS joint distance below which two samples are duplicates.
+
+    Returns:
+        keep: (N,) bool mask of samples to keep.
+        report: {label: {"before": n, "after": m}} per class.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    keep = np.zeros(len(y), dtype=bool)
+    report: Dict[int, Dict[str, int]] = {}
+
+    for label in np.unique(y):
+        rows = np.flatnonzero(y == label)
+        kept = np.empty((len(rows), FEATURE_DIM), dtype=np.float32)
+        n_kept = 0
+        for row in rows:
+            if n_kept and pose_distances(X[row], kept[:n_kept]).min() < eps:
+                continue
+            kept[n_kept] = X[row]
+            n_kept += 1
+            keep[row] = True
+        report[int(label)] = {"before": int(len(rows)), "after": n_kept}
+
+    return keep, report
+
+
+def format_report(
+    report: Dict[int, Dict[str, int]], index_to_letter: Optional[Dict] = None
+) -> str:
+    """
+    Render the per-class reduction as a table.
+    """
+    lines = [f"{'class':>6} {'before':>7} {'after':>7} {'removed':>8}"]
+    total_before = total_after = 0
+    for label, counts in sorted(report.items()):
+        name = (index_to_letter or {}).get(str(label), str(label))
+        before, after = counts["before"], counts["after"]
+        total_before += before
+        total_after += after
+        removed = 1.0 - after / before if before else 0.0
+        lines.append(f"{name:>6} {before:>7} {after:>7} {removed:>7.1%}")
+    removed = 1.0 - total_after / total_before if total_before else 0.0
+    lines.append(f"{'total':>6} {total_before:>7} {total_after:>7} {removed:>7.1%}")
+    return "\n".join(lines)
+
+
+def apply_dedup(path: Path, X: np.ndarray, y: np.ndarray, keep: np.ndarray) -> None:
+    """
+    Rewrite the dataset at `path` (store directory or .npz) with kept rows.
+    """
+    path = Path(path)
+    if path.is_dir():
+        LandmarkStore(path).replace(X[keep], y[keep], source="dedup")
+        return
+
+    tmp = path.with_suffix(".tmp.npz")
+    np.savez(tmp, X=X[keep], y=y[keep])
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find and remove near-duplicate landmark samples"
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=None,
+        help="Landmark store directory or .npz (default: the webcam dataset)",
+    )
+    parser.add_argument("--eps", type=float, default=DEFAULT_EPS)
+    parser.add_argument(
+        "--apply", action="store_true", help="Rewrite the dataset without duplicates"
+    )
+    args = parser.parse_args()
+
+    path = args.data
+    if path is None:
+        path = DATA_PATH if DATA_PATH.exists() else LEGACY_DATA_PATH
+
+    X, y = load_landmarks(path)
+    keep, report = deduplicate(X, y, eps=args.eps)
+
+    index_to_letter = None
+    if LABEL_MAP_PATH.exists():
+        with open(LABEL_MAP_PATH, "r", encoding="utf8") as f:
+            index_to_letter = json.load(f).get("index_to_letter")
+
+    print(f"{path}: eps={args.eps}")
+    print(format_report(report, index_to_letter))
+
+    if args.apply:
+        apply_dedup(path, X, y, keep)
+        print(f"Wrote {int(keep.sum())} samples to {path}")
+    else:
+        print("Dry run; pass --apply to rewrite the dataset.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Export the trained LandmarkMLP for in-browser inference.
+
+Binary layout (little-endian), format version 1:
+
+    magic        4 bytes   b"LMLP"
+    version      uint32    format version
+    header_len   uint32    length of the JSON header in bytes
+    header       JSON      architecture, labels, dtype and tensor table
+    padding      0-3 zero bytes so the tensor data is 4-byte aligned
+    data         tensors   concatenated in header["tensors"] order
+
+Each tensor table entry is {"name", "shape", "offset"} where offset is
+counted in elements from the start of the data section.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import torch
+
+from .registry import ModelRegistry
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data"
+MODELS_DIR = PROJECT_ROOT / "models"
+LABEL_MAP_PATH = DATA_DIR / "label_map.json"
+MODEL_PATH = MODELS_DIR / "mlp_webcam.pt"
+OUT_PATH = PROJECT_ROOT.parent / "web-app" / "static" / "models" / "landmark_mlp.bin"
+
+MAGIC = b"LMLP"
+FORMAT_VERSION = 1
+DTYPES = {"float16": np.float16, "float32": np.float32}
+
+
+def describe_architecture(state_dict: Dict[str, torch.Tensor]) -> Dict[str, int]:
+    """
+    Infer LandmarkMLP hyperparameters from a state dict.
+    """
+    num_blocks = len(
+        {key.split(".")[1] for key in state_dict if key.startswith("blocks.")}
+    )
+    hidden_dim, input_dim = state_dict["input_proj.weight"].shape
+    return {
+        "input_dim": int(input_dim),
+        "hidden_dim": int(hidden_dim),
+        "num_blocks": num_blocks,
+        "num_classes": int(state_dict["head.weight"].shape[0]),
+    }
+
+
+def export_browser_model(
+    model_path: Path = MODEL_PATH,
+    label_map_path: Path = LABEL_MAP_PATH,
+    out_path: Path = OUT_PATH,
+    dtype: str = "float16",
+) -> Path:
+    """
+    Write LandmarkMLP weights and the label map into one binary file.
+
+    Args:
+        model_path: Path to a LandmarkMLP state dict (.pt).
+        label_map_path: Path to label_map.json.
+        out_path: Where to write the exported model.
+        dtype: "float16" (half the size) or "float32".
+
+    Returns:
+        The path written.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(DTYPES)}, got {dtype!r}")
+
+    state_dict = torch.load(model_path, map_location="cpu")
+
+    with open(label_map_path, "r", encoding="utf8") as f:
+        mapping = json.load(f)
+    index_to_letter = {int(k): v for k, v in mapping["index_to_letter"].items()}
+    labels = [index_to_letter[i] for i in range(len(index_to_letter))]
+
+    arch = describe_architecture(state_dict)
+    if arch["num_classes"] != len(labels):
+        raise ValueError(
+            f"Model has {arch['num_classes']} classes but label map has {len(labels)}"
+        )
+
+    tensors = []
+    arrays = []
+    offset = 0
+    for name, tensor in state_dict.items():
+        array = tensor.detach().cpu().numpy().astype(DTYPES[dtype])
+        tensors.append({"name": name, "shape": list(array.shape), "offset": offset})
+        arrays.append(array.ravel())
+        offset += array.size
+
+    header = {
+        **arch,
+        "dtype": dtype,
+        "layer_norm_eps": 1e-5,
+        "labels": labels,
+        "tensors": tensors,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf8")
+    prefix_len = len(MAGIC) + 8 + len(header_bytes)
+    padding = b"\0" * (-prefix_len % 4)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(padding)
+        little_endian = np.dtype(DTYPES[dtype]).newbyteorder("<")
+        f.write(np.concatenate(arrays).astype(little_endian).tobytes())
+
+    print(f"Exported {offset} parameters ({dtype}) to {out_path}")
+    return out_path
+
+
+def read_browser_model(path: Path) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Read an exported model back into (header, {name: array}).
+    """
+    raw = Path(path).read_bytes()
+    if raw[:4] != MAGIC:
+        raise ValueError(f"{path} is not an exported LandmarkMLP file")
+
+    version, header_len = struct.unpack_from("<II", raw, 4)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {version}")
+
+    header_end = 12 + header_len
+    header = json.loads(raw[12:header_end].decode("utf8"))
+    data_start = header_end + (-header_end % 4)
+    little_endian = np.dtype(DTYPES[header["dtype"]]).newbyteorder("<")
+    data = np.frombuffer(raw, dtype=little_endian, offset=data_start)
+
+    tensors = {}
+    for entry in header["tensors"]:
+        size = int(np.prod(entry["shape"]))
+        start = entry["offset"]
+        tensors[entry["name"]] = data[start : start + size].reshape(entry["shape"])
+    return header, tensors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export LandmarkMLP weights for in-browser inference"
+    )
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument(
+        "--model-id",
+        default=None,
+        help="Export a registered run (run_id prefix or 'latest') instead of --model",
+    )
+    parser.add_argument("--label-map", type=Path, default=LABEL_MAP_PATH)
+    parser.add_argument("--out", type=Path, default=OUT_PATH)
+    parser.add_argument("--dtype", choices=sorted(DTYPES), default="float16")
+    args = parser.parse_args()
+
+    if args.model_id:
+        registry = ModelRegistry()
+        args.model = registry.checkpoint_path(registry.resolve(args.model_id))
+
+    export_browser_model(args.model, args.label_map, args.out, args.dtype)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Batched hand landmark features
+
+Turns MediaPipe landmarks into model inputs for any number of hands at once:
+
+- normalize_landmarks_batch: (N, 21, 3) -> (N, 63), wrist at the origin and
+  the farthest joint at distance 1. This is the feature vector every model
+  in this repo is trained and served on.
+- engineered_features: pairwise fingertip distances and the bend angle at
+  each finger joint, computed from normalized landmarks.
+
+Both accept an `out` array so callers that process frames or dataset shards
+in a loop can reuse one buffer instead of allocating per hand.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Optional
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+LANDMARK_DIM = NUM_LANDMARKS * 3
+
+# MediaPipe joint chains from the wrist (0) to each fingertip
+FINGER_CHAINS = (
+    (0, 1, 2, 3, 4),  # thumb
+    (0, 5, 6, 7, 8),  # index
+    (0, 9, 10, 11, 12),  # middle
+    (0, 13, 14, 15, 16),  # ring
+    (0, 17, 18, 19, 20),  # pinky
+)
+FINGERTIPS = tuple(chain[-1] for chain in FINGER_CHAINS)
+
+# Index tables for engineered_features, built once at import
+TIP_PAIRS = np.array(list(itertools.combinations(FINGERTIPS, 2)), dtype=np.intp)
+JOINT_TRIPLES = np.array(
+    [chain[i - 1 : i + 2] for chain in FINGER_CHAINS for i in range(1, 4)],
+    dtype=np.intp,
+)
+ENGINEERED_DIM = len(TIP_PAIRS) + len(JOINT_TRIPLES)
+
+
+def _check_points(pts: np.ndarray) -> None:
+    if pts.ndim != 3 or pts.shape[1:] != (NUM_LANDMARKS, 3):
+        raise ValueError(
+            f"Expected landmarks of shape (N, {NUM_LANDMARKS}, 3), got {pts.shape}"
+        )
+
+
+def _check_out(out: np.ndarray, rows: int, dim: int) -> None:
+    if out.shape != (rows, dim) or out.dtype != np.float32:
+        raise ValueError(
+            f"out must be a float32 array of shape ({rows}, {dim}), "
+            f"got {out.dtype} {out.shape}"
+        )
+    if dim and out.strides[1] != out.itemsize:
+        raise ValueError("out rows must be contiguous")
+
+
+def normalize_landmarks_batch(
+    pts: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Normalize a batch of hands in one pass.
+
+    Args:
+        pts: (N, 21, 3) landmarks in normalized image coords.
+        out: Optional float32 (N, 63) array to write into. It may be a view
+            of `pts` itself.
+
+    Returns:
+        (N, 63) float32 features (`out` when given). Hands whose joints all
+        coincide come back as zeros.
+    """
+    pts = np.asarray(pts)
+    _check_points(pts)
+    n = pts.shape[0]
+    if out is None:
+        out = np.empty((n, LANDMARK_DIM), dtype=np.float32)
+    else:
+        _check_out(out, n, LANDMARK_DIM)
+
+    centered = out.reshape(n, NUM_LANDMARKS, 3)
+    np.subtract(pts, pts[:, :1], out=centered, casting="same_kind")
+
+    max_dist = np.sqrt(np.einsum("nij,nij->ni", centered, centered).max(axis=1))
+    max_dist[max_dist == 0] = 1.0
+    centered /= max_dist[:, None, None]
+    return out
+
+
+def engineered_features(
+    norm: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fingertip distances and joint angles from normalized landmarks.
+
+    Args:
+        norm: (N, 63) output of normalize_landmarks_batch.
+        out: Optional float32 (N, ENGINEERED_DIM) array to write into.
+
+    Returns:
+        (N, ENGINEERED_DIM) float32: the 10 pairwise fingertip distances
+        followed by the 15 joint angles in radians (pi = straight joint,
+        smaller = more bent).
+    """
+    n = norm.shape[0]
+    pts = norm.reshape(n, NUM_LANDMARKS, 3)
+    if out is None:
+        out = np.empty((n, ENGINEERED_DIM), dtype=np.float32)
+    else:
+        _check_out(out, n, ENGINEERED_DIM)
+
+    n_pairs = len(TIP_PAIRS)
+    diff = pts[:, TIP_PAIRS[:, 0]] - pts[:, TIP_PAIRS[:, 1]]
+    np.sqrt(np.einsum("npk,npk->np", diff, diff), out=out[:, :n_pairs])
+
+    joint = pts[:, JOINT_TRIPLES[:, 1]]
+    a = pts[:, JOINT_TRIPLES[:, 0]] - joint
+    b = pts[:, JOINT_TRIPLES[:, 2]] - joint
+    dot = np.einsum("njk,njk->nj", a, b)
+    norms = np.linalg.norm(a, axis=2) * np.linalg.norm(b, axis=2)
+    cos = np.divide(dot, norms, out=np.ones_like(dot), where=norms > 0)
+    np.arccos(np.clip(cos, -1.0, 1.0), out=out[:, n_pairs:])
+    return out
+
+
+def feature_dim(engineered: bool = False) -> int:
+    """
+    Width of the vectors build_features returns.
+    """
+    return LANDMARK_DIM + (ENGINEERED_DIM if engineered else 0)
+
+
+def build_features(
+    pts: np.ndarray, engineered: bool = False, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Normalized landmarks, optionally followed by the engineered features.
+
+    Args:
+        pts: (N, 21, 3) landmarks.
+        engineered: Append engineered_features to each row.
+        out: Optional float32 (N, feature_dim(engineered)) array.
+
+    Returns:
+        (N, feature_dim(engineered)) float32.
+    """
+    pts = np.asarray(pts)
+    _check_points(pts)
+    n = pts.shape[0]
+    width = feature_dim(engineered)
+    if out is None:
+        out = np.empty((n, width), dtype=np.float32)
+    else:
+        _check_out(out, n, width)
+
+    norm = normalize_landmarks_batch(pts, out=out[:, :LANDMARK_DIM])
+    if engineered:
+        engineered_features(norm, out=out[:, LANDMARK_DIM:])
+    return out
@@ -0,0 +1,378 @@
+"""
+Append-only storage for recorded landmark samples
+
+A store is a directory of shards plus a manifest:
+
+    data/webcam_landmarks/
+        manifest.json
+        shard_00000_X.npy   (n, 63) float32
+        shard_00000_y.npy   (n,)    int64
+        ...
+
+Each recording session writes one new shard and then atomically replaces
+manifest.json, so an interrupted write never touches existing data and a
+shard only becomes visible once it is complete. Every manifest update holds
+an exclusive lock on manifest.lock, so concurrent writers (a background
+recorder and `compact`, say) never drop each other's shards. Readers memory-map every
+shard and present them as a single (N, 63) / (N,) view.
+
+Usage:
+    python -m src.landmark_store info
+    python -m src.landmark_store compact
+    python -m src.landmark_store import data/webcam_landmarks.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+import fcntl
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data"
+STORE_DIR = DATA_DIR / "webcam_landmarks"
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+STORE_FORMAT_VERSION = 1
+FEATURE_DIM = 63
+
+
+class ShardedArray:
+    """
+    Read-only view that concatenates memory-mapped shards along axis 0.
+
+    Supports len(), integer/slice/index-array lookups and np.asarray(), which
+    is enough for training code that wants either random access or one
+    contiguous copy.
+    """
+
+    def __init__(self, parts: List[np.ndarray], tail_shape: Tuple[int, ...], dtype):
+        self.parts = parts
+        self.dtype = np.dtype(dtype)
+        self._offsets = np.cumsum([0] + [len(p) for p in parts])
+        self.shape = (int(self._offsets[-1]),) + tuple(tail_shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"index {idx} out of range for {len(self)} samples")
+        part = int(np.searchsorted(self._offsets, idx, side="right")) - 1
+        return part, idx - int(self._offsets[part])
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            part, row = self._locate(int(key))
+            return self.parts[part][row]
+        if isinstance(key, slice):
+            key = np.arange(*key.indices(len(self)))
+        idx = np.asarray(key, dtype=np.int64)
+        idx = np.where(idx < 0, idx + len(self), idx)
+        out = np.empty((len(idx),) + self.shape[1:], dtype=self.dtype)
+        part_of = np.searchsorted(self._offsets, idx, side="right") - 1
+        for part in np.unique(part_of):
+            mask = part_of == part
+            out[mask] = self.parts[part][idx[mask] - self._offsets[part]]
+        return out
+
+    def __array__(self, dtype=None, copy=None):  # pylint: disable=unused-argument
+        if not self.parts:
+            out = np.zeros(self.shape, dtype=self.dtype)
+        else:
+            out = np.concatenate(self.parts, axis=0)
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+
+class LandmarkStore:
+    """
+    Directory of append-only (X, y) shards described by manifest.json.
+    """
+
+    def __init__(self, root: Union[str, Path] = STORE_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _read_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"version": STORE_FORMAT_VERSION, "next_id": 0, "shards": []}
+        with open(self.manifest_path, "r", encoding="utf8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported landmark store version {manifest.get('version')} "
+                f"in {self.manifest_path}"
+            )
+        return manifest
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        """
+        Atomically replace the manifest so readers see the old or new list.
+        """
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf8") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.manifest_path)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the store's manifest lock; re-entrant within this instance.
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / LOCK_NAME, "a", encoding="utf8") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def shards(self) -> List[Dict]:
+        return self._read_manifest()["shards"]
+
+    def __len__(self) -> int:
+        return sum(shard["num_samples"] for shard in self.shards)
+
+    def _save_array(self, name: str, arr: np.ndarray) -> None:
+        path = self.root / name
+        tmp = self.root / (name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def append(self, X, y, source: str = "webcam") -> Optional[str]:
+        """
+        Write one batch as a new shard and publish it in the manifest.
+
+        Args:
+            X: (n, 63) features.
+            y: (n,) label indices.
+            source: Free-form tag recorded in the manifest.
+
+        Returns:
+            The shard id, or None if the batch was empty.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32).reshape(-1, FEATURE_DIM)
+        y = np.ascontiguousarray(y, dtype=np.int64).reshape(-1)
+        if len(X) != len(y):
+            raise ValueError(f"X has {len(X)} rows but y has {len(y)}")
+        if len(y) == 0:
+            return None
+
+        with self._locked():
+            manifest = self._read_manifest()
+            shard_id = f"shard_{manifest['next_id']:05d}"
+
+            self._save_array(f"{shard_id}_X.npy", X)
+            self._save_array(f"{shard_id}_y.npy", y)
+
+            manifest["next_id"] += 1
+            manifest["shards"].append(
+                {
+                    "id": shard_id,
+                    "num_samples": int(len(y)),
+                    "source": source,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+            )
+            self._write_manifest(manifest)
+        return shard_id
+
+    def load(self, mmap: bool = True) -> Tuple[ShardedArray, ShardedArray]:
+        """
+        Return (X, y) views over every shard listed in the manifest.
+        """
+        mode = "r" if mmap else None
+        xs, ys = [], []
+        for shard in self.shards:
+            xs.append(np.load(self.root / f"{shard['id']}_X.npy", mmap_mode=mode))
+            ys.append(np.load(self.root / f"{shard['id']}_y.npy", mmap_mode=mode))
+        return (
+            ShardedArray(xs, (FEATURE_DIM,), np.float32),
+            ShardedArray(ys, (), np.int64),
+        )
+
+    def replace(self, X, y, source: str) -> str:
+        """
+        Replace the whole store with a single shard holding (X, y).
+
+        Old shard files are deleted only after the manifest pointing at the
+        new shard has been written.
+
+        Returns:
+            The id of the new shard.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32).reshape(-1, FEATURE_DIM)
+        y = np.ascontiguousarray(y, dtype=np.int64).reshape(-1)
+        if len(X) != len(y):
+            raise ValueError(f"X has {len(X)} rows but y has {len(y)}")
+
+        with self._locked():
+            manifest = self._read_manifest()
+            old = manifest["shards"]
+            shard_id = f"shard_{manifest['next_id']:05d}"
+            self._save_array(f"{shard_id}_X.npy", X)
+            self._save_array(f"{shard_id}_y.npy", y)
+            manifest["next_id"] += 1
+            manifest["shards"] = [
+                {
+                    "id": shard_id,
+                    "num_samples": int(len(y)),
+                    "source": source,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+            ]
+            self._write_manifest(manifest)
+
+        for shard in old:
+            for suffix in ("_X.npy", "_y.npy"):
+                (self.root / f"{shard['id']}{suffix}").unlink(missing_ok=True)
+        return shard_id
+
+    def merge(self, shard_ids: List[str], source: str) -> Optional[str]:
+        """
+        Replace the given shards with one shard holding their samples in the
+        given order, listed where the first of them was.
+
+        Old shard files are deleted only after the manifest pointing at the
+        merged shard has been written.
+
+        Returns:
+            The id of the merged shard, or None if there was nothing to merge.
+        """
+        merged = set(shard_ids)
+        if len(merged) <= 1:
+            return None
+
+        with self._locked():
+            manifest = self._read_manifest()
+            listed = [shard["id"] for shard in manifest["shards"]]
+            missing = merged.difference(listed)
+            if missing:
+                raise ValueError(
+                    f"Shards not in {self.manifest_path}: {sorted(missing)}"
+                )
+
+            X = np.concatenate([np.load(self.root / f"{i}_X.npy") for i in shard_ids])
+            y = np.concatenate([np.load(self.root / f"{i}_y.npy") for i in shard_ids])
+            shard_id = f"shard_{manifest['next_id']:05d}"
+            self._save_array(f"{shard_id}_X.npy", X)
+            self._save_array(f"{shard_id}_y.npy", y)
+            manifest["next_id"] += 1
+
+            position = listed.index(shard_ids[0])
+            kept = [s for s in manifest["shards"] if s["id"] not in merged]
+            position -= sum(1 for i in listed[:position] if i in merged)
+            kept.insert(
+                position,
+                {
+                    "id": shard_id,
+                    "num_samples": int(len(y)),
+                    "source": source,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+            )
+            manifest["shards"] = kept
+            self._write_manifest(manifest)
+
+        for old_id in merged:
+            for suffix in ("_X.npy", "_y.npy"):
+                (self.root / f"{old_id}{suffix}").unlink(missing_ok=True)
+        return shard_id
+
+    def compact(self) -> Optional[str]:
+        """
+        Merge all shards into one.
+
+        Returns:
+            The id of the merged shard, or None if there was nothing to merge.
+        """
+        # An empty or missing store and a single shard are already compact.
+        if len(self.shards) <= 1:
+            return None
+
+        # Hold the lock from load to replace so no shard appended meanwhile
+        # is dropped from the manifest.
+        with self._locked():
+            X, y = self.load(mmap=True)
+            return self.replace(np.asarray(X), np.asarray(y), source="compacted")
+
+    def import_npz(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        Append the contents of a legacy X/y .npz file as one shard.
+        """
+        data = np.load(path)
+        return self.append(data["X"], data["y"], source=f"import:{Path(path).name}")
+
+
+def load_landmarks(path: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load (X, y) from either a landmark store directory or a legacy .npz file.
+    """
+    path = Path(path)
+    if path.is_dir():
+        X, y = LandmarkStore(path).load(mmap=True)
+        return np.asarray(X), np.asarray(y)
+
+    data = np.load(path)
+    return data["X"], data["y"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the landmark sample store")
+    parser.add_argument("--store", type=Path, default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("info", help="Show shard and sample counts")
+    sub.add_parser("compact", help="Merge all shards into one")
+    import_parser = sub.add_parser("import", help="Append a legacy .npz file")
+    import_parser.add_argument("npz", type=Path)
+    args = parser.parse_args()
+
+    store = LandmarkStore(args.store)
+    if args.command == "compact":
+        before = len(store.shards)
+        shard_id = store.compact()
+        if shard_id is None:
+            print("Nothing to compact.")
+        else:
+            print(f"Compacted {before} shards into {shard_id}")
+    elif args.command == "import":
+        shard_id = store.import_npz(args.npz)
+        print(f"Imported {args.npz} as {shard_id}")
+
+    print(f"{store.root}: {len(store.shards)} shards, {len(store)} samples")
+
+
+if __name__ == "__main__":
+    main()
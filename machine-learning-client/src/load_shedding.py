@@ -0,0 +1,113 @@
+"""
+Bounded admission and load shedding for the prediction API
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+class LoadShedder:  # pylint: disable=too-many-instance-attributes
+    """
+    Admits at most `max_in_flight` requests and sheds new ones whose
+    expected queueing delay would exceed the latency SLO.
+
+    Requests are served one forward pass at a time, so a newcomer waits
+    roughly `in_flight * service_time`. Service time is an exponentially
+    weighted moving average of recent forward passes, timed by the caller
+    with the model lock held: timing whole requests would include their own
+    queueing and count it twice.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 32,
+        latency_slo_ms: float = 250.0,
+        ewma_alpha: float = 0.2,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args:
+            max_in_flight: Hard cap on requests admitted at once.
+            latency_slo_ms: Queueing delay budget for an admitted request.
+            ewma_alpha: Weight of the newest sample in the service time EWMA.
+            clock: Time source in seconds, overridable in tests.
+        """
+        self.max_in_flight = max_in_flight
+        self.latency_slo = latency_slo_ms / 1000.0
+        self.ewma_alpha = ewma_alpha
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._service_time = 0.0
+        self.admitted = 0
+        self.shed = 0
+
+    def _expected_delay(self) -> float:
+        return self._in_flight * self._service_time
+
+    def _over_budget(self) -> bool:
+        return (
+            self._in_flight >= self.max_in_flight
+            or self._expected_delay() > self.latency_slo
+        )
+
+    def try_enter(self) -> bool:
+        """
+        Admit a request if there is capacity; returns False to shed it.
+        """
+        with self._lock:
+            if self._over_budget():
+                self.shed += 1
+                return False
+            self._in_flight += 1
+            self.admitted += 1
+            return True
+
+    def leave(self) -> None:
+        """
+        Mark an admitted request finished.
+        """
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def record_service(self, elapsed: float) -> None:
+        """
+        Fold one forward pass's duration in seconds, excluding any wait for
+        the model, into the service time EWMA.
+        """
+        with self._lock:
+            if self._service_time == 0.0:
+                self._service_time = elapsed
+            else:
+                self._service_time += self.ewma_alpha * (elapsed - self._service_time)
+
+    def is_overloaded(self) -> bool:
+        """
+        True while new requests would be shed.
+        """
+        with self._lock:
+            return self._over_budget()
+
+    def retry_after(self) -> int:
+        """
+        Whole seconds a shed client should wait: the time to drain the queue.
+        """
+        with self._lock:
+            return max(1, math.ceil(self._expected_delay()))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "service_time_ms": round(self._service_time * 1000.0, 3),
+                "expected_delay_ms": round(self._expected_delay() * 1000.0, 3),
+                "latency_slo_ms": self.latency_slo * 1000.0,
+                "admitted": self.admitted,
+                "shed": self.shed,
+            }
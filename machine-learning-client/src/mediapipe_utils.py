@@ -4,15 +4,25 @@ Utility file for MediaPipe
 
 from __future__ import annotations
 from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter
+import time
 from typing import List
 
 import numpy as np
 import cv2
 import mediapipe as mp
 
+from .features import normalize_landmarks_batch
+
 
 mp_hands = mp.solutions.hands
 HAND_CONNECTIONS = mp_hands.HAND_CONNECTIONS
+# Landmark index pairs for every bone, and each joint as a zero-length
+# segment, so a hand can be drawn with two cv2.polylines calls
+CONNECTION_INDEX = np.array(sorted(HAND_CONNECTIONS), dtype=np.intp)
+JOINT_INDEX = np.repeat(np.arange(21, dtype=np.intp)[:, np.newaxis], 2, axis=1)
+_landmark_xyz = attrgetter("x", "y", "z")
 
 
 @dataclass
@@ -26,9 +36,28 @@ class HandLandmarks:
     handedness: str
 
 
-class MediaPipeHandDetector:
+class MediaPipeHandDetector:  # pylint: disable=too-many-instance-attributes
     """
     MediaPipe helper class to abstract MediaPipe usage
+
+    The RGB conversion and the landmark coordinates go into buffers owned by
+    the detector and reused on every frame; only a 63-float temporary per
+    hand remains besides MediaPipe's own results. The points of the returned
+    HandLandmarks are views into the landmark buffer, so they are only
+    valid until the next call to process(); copy them to keep them longer.
+
+    With roi=True, once a hand has been found only a crop around the
+    previous frame's hands (grown by roi_margin on each side) is passed to
+    MediaPipe. If no hand is found in the crop, the full frame is processed
+    again. With detect_width set, full-frame passes use a copy downscaled to
+    that width. Either way, landmarks are returned in normalized full-frame
+    coordinates.
+
+    MediaPipe tracks a hand by reusing its box from the previous input in
+    that input's normalized coordinates, so the tracker is reset whenever
+    the input switches between a crop and the full frame. Successive crops
+    need no reset: each is centred on the hand and sized from it, so the
+    hand keeps nearly the same normalized box from one crop to the next.
     """
 
     def __init__(
@@ -36,37 +65,144 @@ class MediaPipeHandDetector:
         max_num_hands: int = 1,
         detection_confidence: float = 0.5,
         tracking_confidence: float = 0.5,
+        static_image_mode: bool = False,
+        roi: bool = False,
+        roi_margin: float = 0.25,
+        detect_width: int | None = None,
     ):
+        """
+        static_image_mode runs full detection on every frame instead of
+        tracking hands from the previous one; use it for unrelated images.
+        """
         self.hands = mp_hands.Hands(
-            static_image_mode=False,
+            static_image_mode=static_image_mode,
             max_num_hands=max_num_hands,
             min_detection_confidence=detection_confidence,
             min_tracking_confidence=tracking_confidence,
         )
+        self.max_num_hands = max_num_hands
+        self.landmarks = np.zeros((max_num_hands, 21, 3), dtype=np.float32)
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.detect_width = detect_width
+        # Pixel box (x0, y0, x1, y1) of the last hands found, in ROI mode
+        self.roi_box: tuple[int, int, int, int] | None = None
+        self.counts = {"full": 0, "roi": 0, "fallback": 0}
+        # "roi" or "full": what MediaPipe was last given, in ROI mode
+        self._framing: str | None = None
+        self._rgb = np.empty(0, dtype=np.uint8)
+        self._small: np.ndarray | None = None
 
-    def process(self, frame_bgr: np.ndarray) -> List[HandLandmarks]:
+    def _to_rgb(self, image_bgr: np.ndarray) -> np.ndarray:
         """
-        Run MediaPipe Hands on a BGR frame.
-        Returns a list of HandLandmarks objects.
+        Convert into the reusable RGB buffer, growing it if needed. The
+        result is contiguous even when image_bgr is a crop.
         """
+        size = image_bgr.size
+        if self._rgb.size < size:
+            self._rgb = np.empty(size, dtype=np.uint8)
+        rgb = self._rgb[:size].reshape(image_bgr.shape)
         # ignore errors, cv2 modules aren't annotated properly
-        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
+        return cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
 
-        landmarks_list: List[HandLandmarks] = []
+    def _downscale(self, frame_bgr: np.ndarray) -> np.ndarray:
+        height, width = frame_bgr.shape[:2]
+        if not self.detect_width or width <= self.detect_width:
+            return frame_bgr
+        shape = (round(height * self.detect_width / width), self.detect_width, 3)
+        if self._small is None or self._small.shape != shape:
+            self._small = np.empty(shape, dtype=np.uint8)
+        return cv2.resize(
+            frame_bgr,
+            (shape[1], shape[0]),
+            dst=self._small,
+            interpolation=cv2.INTER_AREA,
+        )
 
+    def _detect(self, image_bgr: np.ndarray, framing: str = "full") -> List[str]:
+        """
+        Run MediaPipe on one image, filling self.landmarks with coordinates
+        normalized to that image. Returns the handedness of each hand.
+        """
+        if self.roi:
+            if self._framing not in (None, framing):
+                # The tracked box is in the other framing's coordinates
+                self.hands.reset()
+            self._framing = framing
+        results = self.hands.process(self._to_rgb(image_bgr))
+
+        labels: List[str] = []
         if results.multi_hand_landmarks and results.multi_handedness:
             for hand_landmarks, handedness in zip(
                 results.multi_hand_landmarks, results.multi_handedness
             ):
-                pts = []
-                for lm in hand_landmarks.landmark:
-                    pts.append([lm.x, lm.y, lm.z])
-                pts = np.array(pts, dtype=np.float32)
-                label = handedness.classification[0].label
-                landmarks_list.append(HandLandmarks(points=pts, handedness=label))
+                if len(labels) == self.max_num_hands:
+                    break
+                self.landmarks[len(labels)] = np.fromiter(
+                    chain.from_iterable(map(_landmark_xyz, hand_landmarks.landmark)),
+                    dtype=np.float32,
+                    count=63,
+                ).reshape(21, 3)
+                labels.append(handedness.classification[0].label)
+        return labels
 
-        return landmarks_list
+    def _update_roi(self, n_hands: int, width: int, height: int) -> None:
+        """
+        Square box around all found hands plus the margin, clamped to the
+        frame; cleared when nothing was found.
+        """
+        if n_hands == 0:
+            self.roi_box = None
+            return
+        xy = self.landmarks[:n_hands, :, :2].reshape(-1, 2) * (width, height)
+        (x_min, y_min), (x_max, y_max) = xy.min(axis=0), xy.max(axis=0)
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * self.roi_margin)
+        side = min(max(side, 32.0), width, height)
+        cx = min(max((x_min + x_max) / 2, side / 2), width - side / 2)
+        cy = min(max((y_min + y_max) / 2, side / 2), height - side / 2)
+        x0, y0 = int(cx - side / 2), int(cy - side / 2)
+        self.roi_box = (x0, y0, x0 + int(side), y0 + int(side))
+
+    def process(self, frame_bgr: np.ndarray) -> List[HandLandmarks]:
+        """
+        Run MediaPipe Hands on a BGR frame.
+        Returns a list of HandLandmarks objects.
+        """
+        height, width = frame_bgr.shape[:2]
+        labels: List[str] = []
+
+        if self.roi and self.roi_box is not None:
+            x0, y0, x1, y1 = self.roi_box
+            labels = self._detect(frame_bgr[y0:y1, x0:x1], "roi")
+            if labels:
+                self.counts["roi"] += 1
+                # Crop-normalized -> frame-normalized; z scales like x
+                pts = self.landmarks[: len(labels)]
+                crop_w, crop_h = x1 - x0, y1 - y0
+                pts *= np.array([crop_w / width, crop_h / height, crop_w / width])
+                pts += np.array([x0 / width, y0 / height, 0.0], dtype=np.float32)
+            else:
+                self.counts["fallback"] += 1
+
+        if not labels:
+            self.counts["full"] += 1
+            labels = self._detect(self._downscale(frame_bgr))
+
+        if self.roi:
+            self._update_roi(len(labels), width, height)
+
+        return [
+            HandLandmarks(points=self.landmarks[i], handedness=label)
+            for i, label in enumerate(labels)
+        ]
+
+    def reset(self):
+        """
+        Forget tracked hands, e.g. before starting an unrelated video
+        """
+        self.hands.reset()
+        self.roi_box = None
+        self._framing = None
 
     def close(self):
         """
@@ -87,17 +223,7 @@ def normalize_landmarks(pts: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray of shape (63,) float32.
     """
-    assert pts.shape == (21, 3)
-    wrist = pts[0].copy()
-    centered = pts - wrist
-
-    # Use max L2 distance to any point
-    dists = np.linalg.norm(centered, axis=1)
-    max_dist = np.max(dists)
-    if max_dist > 0:
-        centered /= max_dist
-
-    return centered.flatten().astype(np.float32)
+    return normalize_landmarks_batch(pts[np.newaxis])[0]
 
 
 def draw_hand_landmarks_on_frame(frame_bgr: np.ndarray, hand: HandLandmarks) -> None:
@@ -105,38 +231,58 @@ def draw_hand_landmarks_on_frame(frame_bgr: np.ndarray, hand: HandLandmarks) ->
     Draw simple circles and connection lines for a single hand's landmarks
     onto the given BGR frame.
 
+    All points are converted to pixels in one step and the bones and joints
+    are each drawn with a single cv2.polylines call.
+
     Args:
         frame_bgr: np.ndarray of shape (H, W, 3), OpenCV BGR image.
         hand: HandLandmarks with points in normalized [0,1] coordinates.
     """
     h, w, _ = frame_bgr.shape
-    pts = hand.points
 
     # Convert normalized (x,y) to pixel coords
-    pixel_pts = []
-    for x, y, z in pts:
-        px = int(x * w)
-        py = int(y * h)
-        pixel_pts.append((px, py))
+    pixel_pts = (hand.points[:, :2] * (w, h)).astype(np.int32)
 
     # Draw connections
-    for connection in HAND_CONNECTIONS:
-        i = connection[0]
-        j = connection[1]
-        x1, y1 = pixel_pts[i]
-        x2, y2 = pixel_pts[j]
-        cv2.line(frame_bgr, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    cv2.polylines(frame_bgr, pixel_pts[CONNECTION_INDEX], False, (0, 255, 0), 2)
 
-    # Draw landmark points
-    for px, py in pixel_pts:
-        cv2.circle(frame_bgr, (px, py), 4, (0, 0, 255), -1)
+    # Draw landmark points; a zero-length line 8 px thick is a radius-4 disk
+    cv2.polylines(frame_bgr, pixel_pts[JOINT_INDEX], False, (0, 0, 255), 8)
 
     cv2.putText(
         frame_bgr,
         hand.handedness,
-        (pixel_pts[0][0] + 5, pixel_pts[0][1] - 5),
+        (int(pixel_pts[0, 0]) + 5, int(pixel_pts[0, 1]) - 5),
         cv2.FONT_HERSHEY_SIMPLEX,
         0.6,
         (255, 255, 255),
         2,
     )
+
+
+class RenderThrottle:
+    """
+    Caps how often frames are drawn and shown. Capture and classification
+    still run on every frame; due() says whether this one should be drawn.
+    """
+
+    def __init__(self, max_fps: float | None = None, clock=time.monotonic):
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+        self.clock = clock
+        self.rendered = 0
+        self.skipped = 0
+        self._next = float("-inf")
+
+    def due(self) -> bool:
+        now = self.clock()
+        # 10% slack so camera jitter does not skip a frame that is on time
+        if now < self._next - 0.1 * self.interval:
+            self.skipped += 1
+            return False
+        if self.rendered == 0:
+            self._next = now + self.interval
+        else:
+            # Keep a steady cadence, without bursting after a slow frame
+            self._next = max(self._next + self.interval, now + self.interval / 2)
+        self.rendered += 1
+        return True
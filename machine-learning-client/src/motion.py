@@ -0,0 +1,323 @@
+"""
+Streaming recognition of the motion letters J and Z
+
+label_map.json only covers the 24 static letters. J and Z are traced in the
+air, so a single frame cannot tell them apart from I and D. This module
+classifies a sliding window of the last WINDOW frames into MOTION_CLASSES
+("-" meaning no motion letter), alongside the static LandmarkMLP.
+
+Each frame becomes FRAME_DIM features: the 63 normalized landmarks plus the
+image-space velocity of the wrist, index tip and pinky tip since the
+previous frame, divided by the hand's size. They depend only on the current
+and previous frame, so MotionStream computes and encodes each frame once as
+it arrives. The temporal convolutions are unpadded, so their outputs are
+cached in ring buffers too; per frame only one new column per layer and the
+pooled head are computed, never the whole window.
+
+A running stream's oldest frame has a real velocity, taken from a frame that
+has since left the window, so the model is trained on the same thing:
+windows cut from takes of TAKE_FRAMES frames, never starting at a take's
+first frame (whose velocity is unknown and left at zero).
+
+Recorded takes live in data/motion_sequences.npz as raw landmarks,
+X (N, TAKE_FRAMES, 21, 3) and y indexing MOTION_CLASSES.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Optional, Tuple, Union
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from models.model_motion import MotionClassifier
+from .features import LANDMARK_DIM, NUM_LANDMARKS, normalize_landmarks_batch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = PROJECT_ROOT / "data" / "motion_sequences.npz"
+MODEL_PATH = PROJECT_ROOT / "models" / "motion_classifier.pt"
+
+MOTION_CLASSES = ("-", "J", "Z")
+# About one second at camera rate, long enough for either letter
+WINDOW = 30
+# Frames recorded ahead of each take's window, so that its first frame has
+# a velocity too
+LEAD_IN = 1
+TAKE_FRAMES = WINDOW + LEAD_IN
+# Wrist, index tip (traces Z) and pinky tip (traces J)
+TRACKED = (0, 8, 20)
+FRAME_DIM = LANDMARK_DIM + 2 * len(TRACKED)
+
+PathLike = Union[str, Path]
+
+
+def hand_scale(pts: np.ndarray) -> np.ndarray:
+    """
+    (..., 21, 3) landmarks -> (...) farthest joint distance from the wrist,
+    the same scale normalize_landmarks_batch divides by (1 when degenerate).
+    """
+    centered = pts - pts[..., :1, :]
+    scale = np.sqrt((centered**2).sum(axis=-1).max(axis=-1))
+    return np.where(scale > 0, scale, 1.0).astype(np.float32)
+
+
+def sequence_features(pts: np.ndarray) -> np.ndarray:
+    """
+    Features for whole sequences at once (training and offline use).
+
+    Args:
+        pts: (N, T, 21, 3) raw landmarks in normalized image coords.
+
+    Returns:
+        (N, T, FRAME_DIM) float32. The first frame of each sequence has
+        zero velocity.
+    """
+    pts = np.asarray(pts, dtype=np.float32)
+    n, t = pts.shape[:2]
+    out = np.zeros((n, t, FRAME_DIM), dtype=np.float32)
+    normalize_landmarks_batch(
+        pts.reshape((n * t, NUM_LANDMARKS, 3)),
+        out=out.reshape((n * t, FRAME_DIM))[:, :LANDMARK_DIM],
+    )
+    xy = pts[:, :, TRACKED, :2]
+    velocity = (xy[:, 1:] - xy[:, :-1]) / hand_scale(pts[:, 1:])[..., None, None]
+    out[:, 1:, LANDMARK_DIM:] = velocity.reshape((n, t - 1, -1))
+    return out
+
+
+def training_windows(
+    pts: np.ndarray, y: np.ndarray, window: int = WINDOW
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Every window of `window` frames in each take, with the velocities a
+    running MotionStream would see. Windows start from the take's second
+    frame, since the first has no velocity; takes exactly `window` long
+    (recorded without a lead-in) give their one window as is.
+
+    Args:
+        pts: (N, T, 21, 3) raw takes, T >= window.
+        y: (N,) class per take.
+
+    Returns:
+        (N * W, window, FRAME_DIM) float32 features and (N * W,) labels,
+        take by take, where W is the number of windows per take.
+    """
+    feats = sequence_features(pts)
+    t = feats.shape[1]
+    if t < window:
+        raise ValueError(f"takes have {t} frames, fewer than the window ({window})")
+    offsets = range(1 if t > window else 0, t - window + 1)
+    windows = np.stack([feats[:, o : o + window] for o in offsets], axis=1)
+    labels = np.repeat(np.asarray(y, dtype=np.int64), len(offsets))
+    return windows.reshape((-1, window, FRAME_DIM)), labels
+
+
+def load_motion_model(
+    path: PathLike = MODEL_PATH, device: Union[str, torch.device] = "cpu"
+) -> MotionClassifier:
+    model = MotionClassifier(frame_dim=FRAME_DIM, num_classes=len(MOTION_CLASSES))
+    model.load_state_dict(torch.load(path, map_location=device))
+    return model.to(device).eval()
+
+
+class _Ring:
+    """
+    The last `size` rows pushed, each written twice (at slot i and
+    i + size) so they are always one contiguous slice, oldest first.
+    """
+
+    def __init__(self, size: int, dim: int):
+        self.size = size
+        self.data = np.zeros((2 * size, dim), dtype=np.float32)
+        self.count = 0
+
+    def push(self, row: np.ndarray) -> None:
+        slot = self.count % self.size
+        self.data[slot] = row
+        self.data[slot + self.size] = row
+        self.count += 1
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.size
+
+    def last(self) -> np.ndarray:
+        start = self.count % self.size
+        return self.data[start : start + self.size]
+
+
+class MotionStream:
+    """
+    Incremental MotionClassifier over the last `window` frames of one hand.
+
+    Each push computes the new frame's features, its encoding and one new
+    column of each temporal conv, keeping just enough of each in ring
+    buffers; predict() then only pools the last columns. The model must be
+    on the CPU and in eval mode.
+    """
+
+    def __init__(self, model: MotionClassifier, window: int = WINDOW):
+        if window < model.receptive_field:
+            raise ValueError(
+                f"window ({window}) must be at least the model's receptive "
+                f"field ({model.receptive_field})"
+            )
+        self.model = model
+        k, hidden = model.kernel_size, model.hidden_dim
+        self._emb = _Ring(k, hidden)
+        self._h1 = _Ring(k, hidden)
+        self._h2 = _Ring(window - model.receptive_field + 1, hidden)
+        self._frame = np.zeros((1, FRAME_DIM), dtype=np.float32)
+        self._prev_xy: Optional[np.ndarray] = None
+        self.count = 0
+
+    def reset(self) -> None:
+        """
+        Forget buffered frames, e.g. when the hand is lost.
+        """
+        for ring in (self._emb, self._h1, self._h2):
+            ring.count = 0
+        self._prev_xy = None
+        self.count = 0
+
+    @property
+    def window(self) -> int:
+        return self._h2.size + self.model.receptive_field - 1
+
+    @property
+    def ready(self) -> bool:
+        return self._h2.full
+
+    def push(self, pts: np.ndarray) -> None:
+        """
+        Add one frame of (21, 3) raw landmarks.
+        """
+        frame = self._frame
+        normalize_landmarks_batch(pts[np.newaxis], out=frame[:, :LANDMARK_DIM])
+        xy = pts[TRACKED, :2]
+        if self._prev_xy is None:
+            frame[0, LANDMARK_DIM:] = 0.0
+        else:
+            frame[0, LANDMARK_DIM:] = ((xy - self._prev_xy) / hand_scale(pts)).ravel()
+        self._prev_xy = xy.copy()
+        self.count += 1
+
+        model = self.model
+        with torch.no_grad():
+            self._emb.push(model.encode(torch.from_numpy(frame))[0].numpy())
+            if not self._emb.full:
+                return
+            # (k, hidden) time-major ring -> (1, hidden, k) conv input
+            h1 = F.gelu(model.conv1(torch.from_numpy(self._emb.last().T)[None]))
+            self._h1.push(h1[0, :, 0].numpy())
+            if not self._h1.full:
+                return
+            h1_last = torch.from_numpy(self._h1.last().T)[None]
+            h2 = F.gelu(model.conv2(h1_last)) + h1_last[:, :, -1:]
+            self._h2.push(h2[0, :, 0].numpy())
+
+    def probs(self) -> Optional[np.ndarray]:
+        """
+        Class probabilities for the current window, or None until `window`
+        frames have been pushed.
+        """
+        if not self.ready:
+            return None
+        with torch.no_grad():
+            logits = self.model.pool(torch.from_numpy(self._h2.last().T)[None])
+            return F.softmax(logits, dim=1)[0].numpy()
+
+    def predict(self) -> Optional[Tuple[str, float]]:
+        """
+        (letter, confidence) for the current window; "-" is no motion
+        letter. None until the window is full.
+        """
+        probs = self.probs()
+        if probs is None:
+            return None
+        idx = int(probs.argmax())
+        return MOTION_CLASSES[idx], float(probs[idx])
+
+
+class MotionStreams:
+    """
+    Bounded LRU map of client_id -> MotionStream for the streaming API.
+    Streams idle for longer than `ttl_seconds` start over.
+    """
+
+    def __init__(
+        self,
+        model: MotionClassifier,
+        max_entries: int = 256,
+        ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._streams: OrderedDict[str, Tuple[float, MotionStream]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, client_id: str) -> MotionStream:
+        """
+        The client's stream, created (or restarted if stale) as needed.
+        Callers hold `lock` while using it.
+        """
+        now = self._clock()
+        entry = self._streams.get(client_id)
+        if entry is None or now - entry[0] > self.ttl_seconds:
+            stream = MotionStream(self.model)
+        else:
+            stream = entry[1]
+        self._streams[client_id] = (now, stream)
+        self._streams.move_to_end(client_id)
+        while len(self._streams) > self.max_entries:
+            self._streams.popitem(last=False)
+        return stream
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+
+def load_sequences(path: PathLike = DATA_PATH) -> Tuple[np.ndarray, np.ndarray]:
+    with np.load(path) as data:
+        return data["X"].astype(np.float32), data["y"].astype(np.int64)
+
+
+def synthetic_sequences(
+    n: int, length: int = TAKE_FRAMES, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Labelled toy takes for tests and benchmarks: a random hand held still
+    (with jitter), or moved along a J hook or a Z zigzag.
+
+    Returns:
+        X (n, length, 21, 3) float32 raw landmarks and y (n,) class indices.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0.0, 1.0, length)
+    # Path of the hand in image coords for each class, (length, 2)
+    zigzag = np.interp(t, [0, 1 / 3, 2 / 3, 1], [0, 1, 0, 1])
+    paths = {
+        0: np.zeros((length, 2)),
+        1: np.stack(
+            [-0.5 * np.clip(t - 0.6, 0, None) / 0.4, np.minimum(t / 0.6, 1.0)],
+            axis=1,
+        ),
+        2: np.stack([zigzag, np.interp(t, [0, 1 / 3, 2 / 3, 1], [0, 0, 1, 1])], axis=1),
+    }
+
+    y = rng.integers(0, len(MOTION_CLASSES), n)
+    X = np.empty((n, length, NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, label in enumerate(y):
+        hand = 0.3 + 0.1 * rng.random((NUM_LANDMARKS, 3))
+        path = paths[int(label)] * rng.uniform(0.15, 0.3)
+        X[i] = hand + np.pad(path, ((0, 0), (0, 1)))[:, np.newaxis, :]
+        X[i] += rng.normal(0.0, 0.002, X[i].shape)
+    return X, y
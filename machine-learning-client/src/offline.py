@@ -0,0 +1,375 @@
+"""
+Headless processing of recorded videos and image folders
+
+Runs MediaPipeHandDetector and the letter classifier over every frame of a
+video file (or every image in a directory) as fast as they go, with no
+window, and writes one row per frame to a columnar .npz:
+
+    frame         int32    frame index (position in sorted order for images)
+    timestamp_ms  float64  decoder timestamp (NaN for images)
+    handedness    str      "Left" / "Right", "" when no hand was found
+    landmarks     float32  (21, 3) raw landmarks, zeros when no hand
+    pred          int16    class index, -1 when no hand
+    letter        str      predicted letter, "" when no hand
+    confidence    float32  softmax confidence of pred
+
+Classification is batched across frames. Throughput is reported as frames
+per second.
+
+Usage:
+    python -m src.offline run practice.mp4 frames_dir/ --out-dir data/offline
+    python -m src.offline synth /tmp/synthetic.avi --frames 300
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from models.model_MLP import LandmarkMLP
+from .features import LANDMARK_DIM, normalize_landmarks_batch
+from .mediapipe_utils import MediaPipeHandDetector
+from .registry import ModelRegistry
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data"
+MODELS_DIR = PROJECT_ROOT / "models"
+LABEL_MAP_PATH = DATA_DIR / "label_map.json"
+MODEL_PATH = MODELS_DIR / "mlp_webcam.pt"
+OUT_DIR = DATA_DIR / "offline"
+
+IMAGE_EXTENSIONS = {".bmp", ".jpeg", ".jpg", ".png"}
+DEFAULT_BATCH_SIZE = 256
+
+PathLike = Union[str, Path]
+
+
+class LetterClassifier:
+    """
+    LandmarkMLP plus label map, classifying batches of normalized landmarks.
+    """
+
+    def __init__(
+        self,
+        model_path: PathLike = MODEL_PATH,
+        label_map_path: PathLike = LABEL_MAP_PATH,
+        device: Optional[str] = None,
+    ):
+        with open(label_map_path, "r", encoding="utf8") as f:
+            mapping = json.load(f)
+        self.index_to_letter = {
+            int(k): v for k, v in mapping["index_to_letter"].items()
+        }
+        self.device = torch.device(
+            device or ("cuda" if torch.cuda.is_available() else "cpu")
+        )
+        self.model = LandmarkMLP(
+            input_dim=LANDMARK_DIM, num_classes=len(self.index_to_letter)
+        ).to(self.device)
+        self.model.load_state_dict(torch.load(model_path, map_location=self.device))
+        self.model.eval()
+
+    def __call__(self, feats: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (N, 63) features -> (class indices, confidences), both length N.
+        """
+        with torch.no_grad():
+            logits = self.model(torch.from_numpy(feats).to(self.device))
+            conf, idx = F.softmax(logits, dim=1).max(dim=1)
+        return idx.cpu().numpy(), conf.cpu().numpy()
+
+    def letters(self, pred: np.ndarray) -> np.ndarray:
+        return np.array(
+            [self.index_to_letter.get(int(p), "?") if p >= 0 else "" for p in pred],
+            dtype=str,
+        )
+
+
+def image_files(directory: Path) -> List[Path]:
+    return sorted(
+        p for p in directory.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def iter_frames(path: PathLike) -> Iterator[Tuple[int, np.ndarray, float]]:
+    """
+    Yield (frame_index, BGR frame, timestamp_ms) from a video file or an
+    image directory.
+
+    Raises:
+        OSError: If the video cannot be opened.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for i, image_path in enumerate(image_files(path)):
+            frame = cv2.imread(str(image_path))
+            if frame is None:
+                logging.warning("Skipping unreadable image %s", image_path)
+                continue
+            yield i, frame, float("nan")
+        return
+
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise OSError(f"Could not open video {path}")
+    try:
+        i = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield i, frame, cap.get(cv2.CAP_PROP_POS_MSEC)
+            i += 1
+    finally:
+        cap.release()
+
+
+def make_detector(path: PathLike) -> MediaPipeHandDetector:
+    """
+    A fresh detector for one source. Image folders use static image mode,
+    since consecutive images are unrelated.
+    """
+    return MediaPipeHandDetector(max_num_hands=1, static_image_mode=Path(path).is_dir())
+
+
+def process_source(
+    path: PathLike,
+    detector: MediaPipeHandDetector,
+    classifier: LetterClassifier,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Detect and classify every frame of one source.
+
+    Returns:
+        (columns, stats) where columns is described in the module docstring
+        and stats has frames, hands, seconds, fps and classify_seconds.
+    """
+    frames: List[int] = []
+    stamps: List[float] = []
+    handedness: List[str] = []
+    landmarks: List[np.ndarray] = []
+    pred: List[int] = []
+    conf: List[float] = []
+
+    batch = np.empty((batch_size, LANDMARK_DIM), dtype=np.float32)
+    batch_rows: List[int] = []
+    classify_seconds = 0.0
+
+    def flush() -> None:
+        nonlocal classify_seconds
+        t0 = time.perf_counter()
+        idx, c = classifier(batch[: len(batch_rows)])
+        for row, i, p in zip(batch_rows, idx.tolist(), c.tolist()):
+            pred[row], conf[row] = i, p
+        batch_rows.clear()
+        classify_seconds += time.perf_counter() - t0
+
+    no_hand = np.zeros((21, 3), dtype=np.float32)
+    t_start = time.perf_counter()
+    for frame_index, frame, timestamp in iter_frames(path):
+        hands = detector.process(frame)
+        frames.append(frame_index)
+        stamps.append(timestamp)
+        pred.append(-1)
+        conf.append(0.0)
+        if hands:
+            pts = hands[0].points
+            n = len(batch_rows)
+            normalize_landmarks_batch(pts[np.newaxis], out=batch[n : n + 1])
+            batch_rows.append(len(frames) - 1)
+            landmarks.append(pts.copy())
+            handedness.append(hands[0].handedness)
+            if len(batch_rows) == batch_size:
+                flush()
+        else:
+            landmarks.append(no_hand)
+            handedness.append("")
+    if batch_rows:
+        flush()
+    seconds = time.perf_counter() - t_start
+
+    pred_arr = np.array(pred, dtype=np.int16)
+    columns = {
+        "frame": np.array(frames, dtype=np.int32),
+        "timestamp_ms": np.array(stamps, dtype=np.float64),
+        "handedness": np.array(handedness, dtype="<U5"),
+        "landmarks": (
+            np.stack(landmarks) if landmarks else np.zeros((0, 21, 3), dtype=np.float32)
+        ),
+        "pred": pred_arr,
+        "letter": classifier.letters(pred_arr),
+        "confidence": np.array(conf, dtype=np.float32),
+    }
+    stats = {
+        "frames": len(frames),
+        "hands": int((pred_arr >= 0).sum()),
+        "seconds": seconds,
+        "fps": len(frames) / seconds if seconds > 0 else 0.0,
+        "classify_seconds": classify_seconds,
+    }
+    return columns, stats
+
+
+def write_columns(
+    path: PathLike, columns: Dict[str, np.ndarray], meta: Dict[str, Any]
+) -> Path:
+    """
+    Save columns and a JSON metadata record to one .npz file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, meta=np.array(json.dumps(meta)), **columns)
+    return path
+
+
+def read_columns(path: PathLike) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    with np.load(path) as data:
+        columns = {k: data[k] for k in data.files if k != "meta"}
+        meta = json.loads(str(data["meta"])) if "meta" in data.files else {}
+    return columns, meta
+
+
+def write_synthetic_video(
+    path: PathLike,
+    n_frames: int = 300,
+    width: int = 640,
+    height: int = 480,
+    fps: float = 30.0,
+    seed: int = 0,
+) -> Path:
+    """
+    Write a reproducible MJPG video of moving shapes over noise. It contains
+    no hands, so it measures the detection-only worst case where MediaPipe
+    searches every frame.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height)
+    )
+    if not writer.isOpened():
+        raise OSError(f"Could not open video writer for {path}")
+
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    frame = np.empty_like(background)
+    try:
+        for i in range(n_frames):
+            np.copyto(frame, background)
+            cx = int((0.5 + 0.4 * np.sin(i / 15.0)) * width)
+            cy = int((0.5 + 0.4 * np.cos(i / 20.0)) * height)
+            cv2.circle(frame, (cx, cy), height // 6, (60, 140, 220), -1)
+            cv2.rectangle(
+                frame,
+                (width - cx - 40, height - cy - 30),
+                (width - cx + 40, height - cy + 30),
+                (200, 80, 40),
+                -1,
+            )
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
+
+
+def resolve_model(model: Path, model_id: Optional[str]) -> Path:
+    if not model_id:
+        return model
+    registry = ModelRegistry()
+    return registry.checkpoint_path(registry.resolve(model_id))
+
+
+def output_paths(out_dir: Path, inputs: List[Path]) -> List[Path]:
+    """
+    out_dir/<stem>.npz per input; inputs sharing a stem get an index prefix
+    instead, like batch_videos.part_path, so none overwrites another.
+    """
+    stems = [source.stem or source.name for source in inputs]
+    repeated = {stem for stem, count in Counter(stems).items() if count > 1}
+    return [
+        out_dir / (f"{index:05d}_{stem}.npz" if stem in repeated else f"{stem}.npz")
+        for index, stem in enumerate(stems)
+    ]
+
+
+def run(
+    inputs: List[Path],
+    out_dir: Path,
+    classifier: LetterClassifier,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Process each input into its output_paths() file and return per-input stats.
+    """
+    summaries = []
+    for source, path in zip(inputs, output_paths(out_dir, inputs)):
+        detector = make_detector(source)
+        try:
+            columns, stats = process_source(source, detector, classifier, batch_size)
+        finally:
+            detector.close()
+        out = write_columns(
+            path,
+            columns,
+            {"source": str(source), **stats},
+        )
+        print(
+            f"{source}: {stats['frames']} frames, {stats['hands']} with a hand, "
+            f"{stats['fps']:.1f} fps -> {out}"
+        )
+        summaries.append({"source": str(source), "out": str(out), **stats})
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Headless hand sign recognition on videos and image folders"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Process videos / image directories")
+    run_parser.add_argument("inputs", nargs="+", type=Path)
+    run_parser.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    run_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    run_parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    run_parser.add_argument(
+        "--model-id", default=None, help="Registered run_id prefix or 'latest'"
+    )
+
+    synth = sub.add_parser("synth", help="Write a synthetic benchmark video")
+    synth.add_argument("path", type=Path)
+    synth.add_argument("--frames", type=int, default=300)
+    synth.add_argument("--width", type=int, default=640)
+    synth.add_argument("--height", type=int, default=480)
+    synth.add_argument("--fps", type=float, default=30.0)
+
+    args = parser.parse_args()
+
+    if args.command == "synth":
+        path = write_synthetic_video(
+            args.path, args.frames, args.width, args.height, args.fps
+        )
+        print(f"Wrote {args.frames} frames to {path}")
+        return
+
+    classifier = LetterClassifier(resolve_model(args.model, args.model_id))
+    summaries = run(args.inputs, args.out_dir, classifier, args.batch_size)
+    frames = sum(s["frames"] for s in summaries)
+    seconds = sum(s["seconds"] for s in summaries)
+    if seconds > 0:
+        print(f"Total: {frames} frames in {seconds:.1f}s ({frames / seconds:.1f} fps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Threaded frame pipeline
+
+Runs a source and a chain of processing stages on their own threads,
+connected by single-slot queues. A slot only ever holds the newest item: if
+the next stage is still busy, the older item is dropped (and counted), so a
+slow stage never builds up a backlog of stale frames and throughput rises to
+the rate of the slowest stage.
+
+Each stage keeps smoothed latency and FPS figures for an on-screen overlay.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class LatestSlot:
+    """
+    Single-item handoff between two threads where put() replaces any item
+    that has not been taken yet.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item: Any = None
+        self._full = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        with self._cond:
+            if self._full:
+                self.dropped += 1
+            self._item, self._full = item, True
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Take the item, waiting up to `timeout` seconds for one.
+
+        Returns:
+            The item, or None on timeout or once the slot is closed and empty.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._full or self._closed, timeout)
+            if not self._full:
+                return None
+            item, self._item, self._full = self._item, None, False
+            return item
+
+    def close(self) -> None:
+        """
+        Wake any waiting reader; an item already in the slot can still be
+        taken.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class StageStats:
+    """
+    Exponentially smoothed per-item latency and completion rate.
+    """
+
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = smoothing
+        self.count = 0
+        self.latency_ms = 0.0
+        self.fps = 0.0
+        self._last_done: Optional[float] = None
+
+    def record(self, seconds: float, now: Optional[float] = None) -> None:
+        now = time.perf_counter() if now is None else now
+        a = self.smoothing
+        self.latency_ms = (
+            seconds * 1000.0
+            if self.count == 0
+            else (1 - a) * self.latency_ms + a * seconds * 1000.0
+        )
+        if self._last_done is not None and now > self._last_done:
+            rate = 1.0 / (now - self._last_done)
+            self.fps = rate if self.fps == 0.0 else (1 - a) * self.fps + a * rate
+        self._last_done = now
+        self.count += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "latency_ms": self.latency_ms, "fps": self.fps}
+
+
+class Stage(threading.Thread):  # pylint: disable=too-many-instance-attributes
+    """
+    One pipeline thread. With no inbox, `fn()` is a source called in a loop
+    until it returns None; otherwise `fn(item)` is applied to each item
+    taken from the inbox. Results that are not None go to the outbox.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        inbox: Optional[LatestSlot],
+        outbox: LatestSlot,
+        stop_event: threading.Event,
+        poll_interval: float = 0.1,
+    ):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.stats = StageStats()
+        self.error: Optional[BaseException] = None
+
+    def _next_input(self) -> Tuple[bool, Any]:
+        """
+        (keep_running, item); item is None when there is nothing to do yet.
+        """
+        item = self.inbox.get(timeout=self.poll_interval)
+        if item is None:
+            return not self.inbox.closed, None
+        return True, item
+
+    def run(self) -> None:
+        try:
+            while not self.stop_event.is_set():
+                if self.inbox is None:
+                    t0 = time.perf_counter()
+                    out = self.fn()
+                    if out is None:
+                        break
+                else:
+                    running, item = self._next_input()
+                    if not running:
+                        break
+                    if item is None:
+                        continue
+                    t0 = time.perf_counter()
+                    out = self.fn(item)
+                self.stats.record(time.perf_counter() - t0)
+                if out is not None:
+                    self.outbox.put(out)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.outbox.close()
+
+
+class Pipeline:
+    """
+    source -> stage 1 -> ... -> stage N -> get()
+
+    The last step (typically rendering, which OpenCV wants on the main
+    thread) is left to the caller, which polls get().
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Any],
+        stages: Sequence[Tuple[str, Callable[[Any], Any]]],
+        source_name: str = "capture",
+    ):
+        self._stop = threading.Event()
+        self.slots = [LatestSlot() for _ in range(len(stages) + 1)]
+        self.stages: List[Stage] = [
+            Stage(source_name, source, None, self.slots[0], self._stop)
+        ]
+        for i, (name, fn) in enumerate(stages):
+            self.stages.append(
+                Stage(name, fn, self.slots[i], self.slots[i + 1], self._stop)
+            )
+
+    def start(self) -> "Pipeline":
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        The newest fully processed item, or None if none arrived in time.
+        """
+        return self.slots[-1].get(timeout)
+
+    @property
+    def finished(self) -> bool:
+        """
+        True once the source has ended and every stage has drained.
+        """
+        return self.slots[-1].closed
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        for slot in self.slots:
+            slot.close()
+        for stage in self.stages:
+            stage.join(timeout)
+
+    def __enter__(self) -> "Pipeline":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def errors(self) -> Dict[str, BaseException]:
+        return {s.stage_name: s.error for s in self.stages if s.error is not None}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-stage stats; "dropped" counts items replaced in the stage's
+        output slot before the next stage took them.
+        """
+        return {
+            stage.stage_name: {**stage.stats.as_dict(), "dropped": stage.outbox.dropped}
+            for stage in self.stages
+        }
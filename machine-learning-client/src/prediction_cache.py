@@ -0,0 +1,64 @@
+"""
+Per-client cache of the last prediction served by the API
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class PredictionCache:
+    """
+    Bounded LRU map of client key -> last prediction.
+
+    Clients that report their hand has not moved since the previous request
+    can be answered from here without a forward pass. Entries expire after
+    `ttl_seconds` so a stale answer is never served for long.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, client_id: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached prediction for client_id, or None if absent/expired.
+        """
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                self._entries.pop(client_id, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(client_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, client_id: Hashable, prediction: Dict[str, Any]) -> None:
+        """
+        Store the latest prediction for client_id, evicting the oldest client.
+        """
+        with self._lock:
+            self._entries[client_id] = (self._clock(), dict(prediction))
+            self._entries.move_to_end(client_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
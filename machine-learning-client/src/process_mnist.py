@@ -1,23 +1,267 @@
 """
 Script for processing MNIST dataset. Downloads to asl_mnist_landmarks.npz in data dir
+
+Extraction runs in a process pool. Each worker owns its own MediaPipe Hands
+instance and processes contiguous index ranges ("shards"). Finished shards
+are written to data/asl_mnist_shards/<split>/ and recorded in a manifest, so
+an interrupted run picks up where it left off.
+
+Usage:
+    python -m src.process_mnist --workers 8 --shard-size 1000
 """
 
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import time
+from typing import Dict, List, Tuple
 
 import numpy as np
-from .dataset_asl_mnist import ASLMNISTDataset
+from PIL import Image
+
+from . import dataset_asl_mnist as dsm
+from .features import normalize_landmarks_batch
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 OUT_PATH = DATA_DIR / "asl_mnist_landmarks.npz"
+SHARD_DIR = DATA_DIR / "asl_mnist_shards"
+MANIFEST_NAME = "manifest.json"
+
+# Per-process state set up by _init_worker
+_worker: Dict[str, object] = {}
+
+
+def shard_ranges(num_samples: int, shard_size: int) -> List[Tuple[int, int, int]]:
+    """
+    Split [0, num_samples) into (shard_id, start, stop) ranges.
+    """
+    return [
+        (shard_id, start, min(start + shard_size, num_samples))
+        for shard_id, start in enumerate(range(0, num_samples, shard_size))
+    ]
+
+
+def shard_path(shard_dir: Path, shard_id: int) -> Path:
+    return shard_dir / f"shard_{shard_id:05d}.npz"
+
+
+def load_manifest(shard_dir: Path, split: str, num_samples: int, shard_size: int):
+    """
+    Load the manifest for a run, starting fresh if the run parameters changed.
+    """
+    path = shard_dir / MANIFEST_NAME
+    if path.exists():
+        with open(path, "r", encoding="utf8") as f:
+            manifest = json.load(f)
+        if (
+            manifest.get("split") == split
+            and manifest.get("num_samples") == num_samples
+            and manifest.get("shard_size") == shard_size
+        ):
+            # Only trust shards whose file is actually on disk
+            manifest["shards"] = {
+                key: info
+                for key, info in manifest["shards"].items()
+                if shard_path(shard_dir, int(key)).exists()
+            }
+            return manifest
+        print(f"Manifest at {path} is for a different run; starting over.")
+
+    return {
+        "split": split,
+        "num_samples": num_samples,
+        "shard_size": shard_size,
+        "shards": {},
+    }
+
+
+def write_manifest(shard_dir: Path, manifest: dict) -> None:
+    """
+    Atomically replace the manifest so a crash never leaves it half-written.
+    """
+    path = shard_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _init_worker(split: str) -> None:
+    """
+    Pool initializer: load the dataset and a private MediaPipe instance.
+    """
+    _worker["dataset"] = dsm.load_asl_mnist_with_retries(split=split)
+    _worker["hands"] = dsm.create_hands_model()
+    _, _, _worker["raw_label_to_index"] = dsm.load_label_maps()
+
+
+def extract_shard(shard_id: int, start: int, stop: int, shard_dir: Path):
+    """
+    Extract landmarks for dataset[start:stop] and write one shard file.
+
+    Returns:
+        (shard_id, info) where info records the range, hand count and timing.
+    """
+    dataset = _worker["dataset"]
+    hands = _worker["hands"]
+    raw_label_to_index = _worker["raw_label_to_index"]
+
+    n = stop - start
+    X = np.zeros((n, 63), dtype=np.float32)
+    pts = X.reshape((n, 21, 3))
+    y = np.zeros((n,), dtype=np.int64)
+    has_hand = np.zeros((n,), dtype=bool)
+
+    t0 = time.perf_counter()
+    for row, idx in enumerate(range(start, stop)):
+        sample = dataset[idx]
+        img = sample["image"]
+        if not isinstance(img, Image.Image):
+            img = Image.fromarray(img)
+
+        y[row] = raw_label_to_index[int(sample["label"])]
+        hand = dsm.extract_landmarks(hands, img)
+        if hand is not None:
+            pts[row] = hand
+            has_hand[row] = True
+    # Normalize the whole shard in place; rows without a hand stay zero
+    normalize_landmarks_batch(pts, out=X)
+    seconds = time.perf_counter() - t0
+
+    # Write under a temporary name so a killed worker never leaves a
+    # truncated shard behind that looks complete.
+    out = shard_path(shard_dir, shard_id)
+    tmp = out.with_suffix(".tmp.npz")
+    np.savez(tmp, X=X, y=y, has_hand=has_hand)
+    os.replace(tmp, out)
+
+    return shard_id, {
+        "start": start,
+        "stop": stop,
+        "num_hands": int(has_hand.sum()),
+        "seconds": round(seconds, 6),
+        "pid": os.getpid(),
+    }
+
+
+def merge_shards(shard_dir: Path, manifest: dict, out_path: Path) -> None:
+    """
+    Concatenate all shards in index order into a single .npz file.
+    """
+    keys = sorted(manifest["shards"], key=int)
+    parts = [np.load(shard_path(shard_dir, int(key))) for key in keys]
+    X = np.concatenate([p["X"] for p in parts])
+    y = np.concatenate([p["y"] for p in parts])
+    has_hand = np.concatenate([p["has_hand"] for p in parts])
+
+    np.savez(out_path, X=X, y=y, has_hand=has_hand)
+    print(
+        f"Merged {len(keys)} shards into {out_path}: "
+        f"{len(y)} samples, {int(has_hand.sum())} with a detected hand"
+    )
+
+
+def extract_parallel(
+    split: str = "train",
+    workers: int = os.cpu_count() or 1,
+    shard_size: int = 1000,
+    shard_dir: Path = SHARD_DIR,
+    out_path: Path = OUT_PATH,
+) -> dict:
+    """
+    Extract landmarks for a whole split, resuming from any finished shards.
+
+    Args:
+        split: "train", "test" or "validation".
+        workers: Number of worker processes. 1 runs in this process.
+        shard_size: Images per shard (the unit of work and of resume).
+        shard_dir: Root directory for shards; a subdirectory per split is used.
+        out_path: Merged .npz written once every shard is done.
+
+    Returns:
+        The completed manifest.
+    """
+    split_dir = Path(shard_dir) / split
+    split_dir.mkdir(parents=True, exist_ok=True)
+
+    num_samples = len(dsm.load_asl_mnist_with_retries(split=split))
+    manifest = load_manifest(split_dir, split, num_samples, shard_size)
+    todo = [
+        r
+        for r in shard_ranges(num_samples, shard_size)
+        if str(r[0]) not in manifest["shards"]
+    ]
+    print(
+        f"{split}: {num_samples} images, {len(manifest['shards'])} shards done, "
+        f"{len(todo)} to go with {workers} worker(s)"
+    )
+
+    t0 = time.perf_counter()
+    images_done = 0
+
+    def record(shard_id: int, info: dict) -> None:
+        nonlocal images_done
+        manifest["shards"][str(shard_id)] = info
+        write_manifest(split_dir, manifest)
+        images_done += info["stop"] - info["start"]
+        rate = (info["stop"] - info["start"]) / max(info["seconds"], 1e-9)
+        print(
+            f"shard {shard_id:05d} done: {info['num_hands']} hands, "
+            f"{rate:.1f} img/s on pid {info['pid']}"
+        )
+
+    if workers <= 1:
+        _init_worker(split)
+        for shard_id, start, stop in todo:
+            record(*extract_shard(shard_id, start, stop, split_dir))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(split,)
+        ) as pool:
+            futures = [
+                pool.submit(extract_shard, shard_id, start, stop, split_dir)
+                for shard_id, start, stop in todo
+            ]
+            for future in as_completed(futures):
+                record(*future.result())
+
+    elapsed = time.perf_counter() - t0
+    if images_done:
+        total_rate = images_done / elapsed
+        print(
+            f"Extracted {images_done} images in {elapsed:.1f}s: "
+            f"{total_rate:.1f} img/s total, "
+            f"{total_rate / max(workers, 1):.1f} img/s per core"
+        )
+
+    merge_shards(split_dir, manifest, Path(out_path))
+    return manifest
+
 
-ds_train = ASLMNISTDataset(split="train")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract MediaPipe landmarks from ASL MNIST in parallel"
+    )
+    parser.add_argument("--split", default="train")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument("--shard-dir", type=Path, default=SHARD_DIR)
+    parser.add_argument("--out", type=Path, default=OUT_PATH)
+    args = parser.parse_args()
 
-X = []
-y = []
+    extract_parallel(
+        split=args.split,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        shard_dir=args.shard_dir,
+        out_path=args.out,
+    )
 
-for xi, yi in enumerate(ds_train):
-    X.append(xi)
-    y.append(yi)
 
-np.savez(OUT_PATH, X=X, y=y)
+if __name__ == "__main__":
+    main()
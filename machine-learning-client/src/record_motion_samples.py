@@ -0,0 +1,139 @@
+"""
+Module for recording J/Z motion sequences from the webcam
+
+Press J or Z and sign the letter; the next TAKE_FRAMES frames with a hand
+(the classifier's window plus a lead-in frame) are saved as one take. Press
+N to record a sequence of any other signing (static letters, resting hand)
+as the "no motion letter" class. Sequences are appended to
+data/motion_sequences.npz when you quit; the file is replaced atomically,
+so an interrupted save keeps the earlier takes.
+"""
+
+from __future__ import annotations
+import logging
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from .mediapipe_utils import (
+    MediaPipeHandDetector,
+    RenderThrottle,
+    draw_hand_landmarks_on_frame,
+)
+from .motion import DATA_PATH, MOTION_CLASSES, TAKE_FRAMES
+from .record_webcam_samples import DISPLAY_FPS, append_to_npz
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s"
+)
+
+# Key pressed -> class recorded
+KEY_TO_CLASS = {"J": 1, "Z": 2, "N": 0}
+
+
+class SequenceRecorder:
+    """
+    Collects `length` consecutive hand frames per take. Losing the hand
+    mid-take discards it, so every saved sequence is unbroken.
+    """
+
+    def __init__(self, length: int = TAKE_FRAMES):
+        self.length = length
+        self.label: Optional[int] = None
+        self.frames: List[np.ndarray] = []
+        self.X: List[np.ndarray] = []
+        self.y: List[int] = []
+
+    def start(self, label: int) -> None:
+        self.label = label
+        self.frames = []
+
+    @property
+    def recording(self) -> bool:
+        return self.label is not None
+
+    def add(self, pts: Optional[np.ndarray]) -> bool:
+        """
+        Feed one frame's landmarks (None when no hand). Returns True when
+        this frame completed a sequence.
+        """
+        if self.label is None:
+            return False
+        if pts is None:
+            if self.frames:
+                logging.info("Hand lost; take discarded")
+            self.frames = []
+            return False
+        self.frames.append(pts.copy())
+        if len(self.frames) < self.length:
+            return False
+        self.X.append(np.stack(self.frames))
+        self.y.append(self.label)
+        self.label = None
+        self.frames = []
+        return True
+
+
+def main():
+    cap = cv2.VideoCapture(0)
+    detector = MediaPipeHandDetector(max_num_hands=1, detection_confidence=0.7)
+    recorder = SequenceRecorder()
+    throttle = RenderThrottle(DISPLAY_FPS)
+
+    print("Press J or Z and sign the letter, N for a non-motion take; 'q' saves.")
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        frame = cv2.flip(frame, 1)
+        hands = detector.process(frame)
+        if recorder.add(hands[0].points if hands else None):
+            counts = np.bincount(recorder.y, minlength=len(MOTION_CLASSES))
+            print(
+                "Saved take; "
+                + ", ".join(f"{c}={n}" for c, n in zip(MOTION_CLASSES, counts))
+            )
+
+        if throttle.due():
+            if hands:
+                draw_hand_landmarks_on_frame(frame, hands[0])
+            status = (
+                f"Recording {MOTION_CLASSES[recorder.label]}: "
+                f"{len(recorder.frames)}/{recorder.length}"
+                if recorder.recording
+                else "J / Z / N to record a take; 'q' to quit"
+            )
+            cv2.putText(
+                frame,
+                status,
+                (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.7,
+                (0, 255, 255),
+                2,
+            )
+            cv2.imshow("Record motion letters", frame)
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord("q"):
+            break
+        letter = chr(key).upper() if key < 128 else ""
+        if letter in KEY_TO_CLASS:
+            recorder.start(KEY_TO_CLASS[letter])
+
+    cap.release()
+    detector.close()
+    cv2.destroyAllWindows()
+
+    if recorder.X:
+        append_to_npz(DATA_PATH, np.stack(recorder.X), np.array(recorder.y))
+        print(f"Saved {len(recorder.X)} sequences to {DATA_PATH}")
+    else:
+        print("No sequences recorded")
+
+
+if __name__ == "__main__":
+    main()
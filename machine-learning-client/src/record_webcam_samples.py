@@ -3,18 +3,23 @@ Module for recording web cam samples for training model on user's hand
 """
 
 from __future__ import annotations
+import argparse
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 import os
 import logging
 
 import cv2
 import numpy as np
 
+from .dedup import DEFAULT_EPS, RecentSampleFilter
+from .features import normalize_landmarks_batch
+from .landmark_store import LandmarkStore
+from .shard_writer import BackgroundShardWriter
 from .mediapipe_utils import (
     MediaPipeHandDetector,
-    normalize_landmarks,
+    RenderThrottle,
     draw_hand_landmarks_on_frame,
 )
 
@@ -25,7 +30,18 @@ logging.basicConfig(
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 LABEL_MAP_PATH = DATA_DIR / "label_map.json"
+# Legacy single-file dataset; imported into the store on first use
 OUT_PATH = DATA_DIR / "webcam_landmarks.npz"
+STORE_DIR = DATA_DIR / "webcam_landmarks"
+FLUSH_CHUNK_SIZE = 256
+# Frames closer than this to a recent sample of the same letter are skipped
+DEDUP_EPS = DEFAULT_EPS
+# Frames are still recorded at the camera rate; only drawing is capped
+DISPLAY_FPS = 30
+# Every detected hand is recorded under the current label, so recording
+# more than one is opt-in (--max-hands): an idle hand or a bystander in
+# view would otherwise become a sample of the current letter
+MAX_HANDS = 1
 
 
 def load_letter_to_index() -> Dict[str, int]:
@@ -40,6 +56,11 @@ def load_letter_to_index() -> Dict[str, int]:
 def append_to_npz(path, X_new, y_new):
     """
     Append new data to an existing .npz file
+
+    This rewrites the whole file; new recordings are written to the
+    LandmarkStore from open_store by a BackgroundShardWriter instead. The
+    result goes to a temporary file that then replaces path, so an
+    interrupted save leaves the previous file intact.
     """
     X_new = np.asarray(X_new)
     y_new = np.asarray(y_new)
@@ -49,8 +70,8 @@ def append_to_npz(path, X_new, y_new):
 
     if os.path.exists(path):
         logging.info("Existing file found. Loading old data...")
-        data = np.load(path)
-        X_old, y_old = data["X"], data["y"]
+        with np.load(path) as data:
+            X_old, y_old = data["X"], data["y"]
 
         logging.info("Old shapes: X_old=%s, y_old=%s", X_old.shape, y_old.shape)
 
@@ -62,98 +83,159 @@ def append_to_npz(path, X_new, y_new):
         logging.info("No existing file. Creating a new one.")
         X, y = X_new, y_new
 
-    np.savez(path, X=X, y=y)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, X=X, y=y)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
     logging.info("Saved NPZ. Final shapes: X=%s, y=%s", X.shape, y.shape)
 
 
-def main():
+def open_store(store_dir=None, legacy_path=None) -> LandmarkStore:
+    """
+    Open the landmark store, importing the legacy .npz on first use
+
+    If the store does not exist yet but a legacy .npz does, the .npz is
+    imported first so no earlier samples are lost.
+    """
+    store = LandmarkStore(STORE_DIR if store_dir is None else store_dir)
+    legacy_path = OUT_PATH if legacy_path is None else Path(legacy_path)
+
+    if not store.exists() and legacy_path.exists():
+        logging.info("Importing legacy dataset %s into %s", legacy_path, store.root)
+        store.import_npz(legacy_path)
+    return store
+
+
+def draw_overlay(frame, hands, current_letter) -> None:
+    """
+    Landmarks and the current recording label
+    """
+    for hand in hands:
+        draw_hand_landmarks_on_frame(frame, hand)
+
+    # Draw a simple hint
+    if current_letter is not None:
+        cv2.putText(
+            frame,
+            f"Recording label: {current_letter}",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.0,
+            (0, 255, 0),
+            2,
+        )
+    else:
+        cv2.putText(
+            frame,
+            "Press letter key to set label; 'q' to quit",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.7,
+            (0, 255, 255),
+            2,
+        )
+
+
+def record_hands(hands, label, recent, writer) -> int:
+    """
+    Normalize all hands in one batch and submit the ones that are not
+    near-duplicates. Returns how many were submitted.
+    """
+    feats = normalize_landmarks_batch(np.stack([hand.points for hand in hands]))
+    submitted = 0
+    for feat in feats:
+        # Never blocks; dropped samples are counted in writer.stats()
+        if recent.accept(feat, label):
+            writer.submit(feat, label)
+            submitted += 1
+    return submitted
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Record webcam landmark samples")
+    parser.add_argument(
+        "--max-hands",
+        type=int,
+        default=MAX_HANDS,
+        help="Hands recorded per frame, all under the current label",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
     letter_to_index = load_letter_to_index()
 
     print("Loaded label map with letters:", sorted(letter_to_index.keys()))
 
     cap = cv2.VideoCapture(0)
-    detector = MediaPipeHandDetector(max_num_hands=1, detection_confidence=0.7)
+    detector = MediaPipeHandDetector(
+        max_num_hands=args.max_hands, detection_confidence=0.7
+    )
 
-    X: List[np.ndarray] = []
-    y: List[int] = []
+    # Samples are flushed to disk in chunks while capture continues
+    store = open_store()
+    writer = BackgroundShardWriter(store, chunk_size=FLUSH_CHUNK_SIZE).start()
+    recent = RecentSampleFilter(eps=DEDUP_EPS)
+    throttle = RenderThrottle(DISPLAY_FPS)
 
     print("Press a letter key (A, B, C, ...) to record a sample for that class.")
     print("Press 'q' to quit and save.")
 
     current_letter = None
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame = cv2.flip(frame, 1)
-
-        # Detect hand landmarks
-        hands = detector.process(frame)
-
-        if hands:
-            draw_hand_landmarks_on_frame(frame, hands[0])
-
-        # Draw a simple hint
-        if current_letter is not None:
-            cv2.putText(
-                frame,
-                f"Recording label: {current_letter}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 255, 0),
-                2,
-            )
-        else:
-            cv2.putText(
-                frame,
-                "Press letter key to set label; 'q' to quit",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (0, 255, 255),
-                2,
-            )
-
-        cv2.imshow("Record ASL samples", frame)
-
-        key = cv2.waitKey(1) & 0xFF
-
-        if key == ord("q"):
-            print("Quitting and saving...")
-            break
-
-        # If the key is a letter, update current label
-        if ord("a") <= key <= ord("z") or ord("A") <= key <= ord("Z"):
-            letter = chr(key).upper()
-            if letter in letter_to_index:
-                current_letter = letter
-                print(f"Current label set to: {letter}")
-            else:
-                print(f"Letter '{letter}' not in label_map.json; ignoring.")
-            continue
-
-        # If we have a current label AND a hand is detected, record a sample
-        if current_letter is not None and hands:
-            hl = hands[0]
-            feat = normalize_landmarks(hl.points)
-            X.append(feat)
-            y.append(letter_to_index[current_letter])
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            frame = cv2.flip(frame, 1)
+
+            # Detect hand landmarks
+            hands = detector.process(frame)
+
+            if throttle.due():
+                draw_overlay(frame, hands, current_letter)
+                cv2.imshow("Record ASL samples", frame)
+
+            key = cv2.waitKey(1) & 0xFF
+
+            if key == ord("q"):
+                print("Quitting and saving...")
+                break
+
+            # If the key is a letter, update current label
+            if ord("a") <= key <= ord("z") or ord("A") <= key <= ord("Z"):
+                letter = chr(key).upper()
+                if letter in letter_to_index:
+                    current_letter = letter
+                    print(f"Current label set to: {letter}")
+                else:
+                    print(f"Letter '{letter}' not in label_map.json; ignoring.")
+                continue
+
+            # If we have a current label, record a sample per detected hand
+            if current_letter is not None and hands:
+                record_hands(hands, letter_to_index[current_letter], recent, writer)
+    finally:
+        writer.close()
 
     cap.release()
     detector.close()
     cv2.destroyAllWindows()
 
-    X = np.stack(X, axis=0) if X else np.zeros((0, 63), dtype=np.float32)
-    y = np.array(y, dtype=np.int64)
-
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    append_to_npz(OUT_PATH, X, y)
-
-    print(f"Saved {len(y)} samples to {OUT_PATH}")
+    stats = writer.stats()
+    print(
+        f"Saved {stats['written']} samples to {store.root} "
+        f"({stats['dropped']} dropped, {stats['flushes']} flushes, "
+        f"flush latency mean {stats['flush_ms_mean']:.1f} ms, "
+        f"max {stats['flush_ms_max']:.1f} ms)"
+    )
+    print(f"Skipped {recent.skipped} near-duplicate frames (eps={DEDUP_EPS})")
 
 
 if __name__ == "__main__":
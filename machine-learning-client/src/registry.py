@@ -0,0 +1,173 @@
+"""
+Content-addressed registry of trained models
+
+Each training run is identified by a hash of the dataset contents and the
+training config. Its checkpoint and metrics live in
+
+    models/registry/<run_id>/model.pt
+    models/registry/<run_id>/run.json
+
+so the same data + config never has to be trained twice, and any previous
+model can be served again by ID.
+
+Usage:
+    python -m src.registry list
+    python -m src.registry show <run_id>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import torch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MODELS_DIR = PROJECT_ROOT / "models"
+REGISTRY_DIR = MODELS_DIR / "registry"
+CHECKPOINT_NAME = "model.pt"
+RUN_FILE_NAME = "run.json"
+RUN_ID_LENGTH = 16
+
+
+def dataset_digest(X, y) -> str:
+    """
+    sha256 of the dataset contents, independent of how it is sharded on disk.
+    """
+    h = hashlib.sha256()
+    for arr in (X, y):
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode("utf8"))
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def config_digest(config: Dict[str, Any]) -> str:
+    """
+    sha256 of a JSON-serializable training config.
+    """
+    blob = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf8")).hexdigest()
+
+
+def make_run_id(data_digest: str, cfg_digest: str) -> str:
+    """
+    Short ID for a (dataset, config) pair.
+    """
+    digest = hashlib.sha256(f"{data_digest}:{cfg_digest}".encode("utf8"))
+    return digest.hexdigest()[:RUN_ID_LENGTH]
+
+
+class ModelRegistry:
+    """
+    Directory of training runs keyed by run_id.
+    """
+
+    def __init__(self, root: Union[str, Path] = REGISTRY_DIR):
+        self.root = Path(root)
+
+    def run_dir(self, run_id: str) -> Path:
+        return self.root / run_id
+
+    def checkpoint_path(self, run_id: str) -> Path:
+        return self.run_dir(run_id) / CHECKPOINT_NAME
+
+    def lookup(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the run record for run_id, or None if it was never trained.
+        """
+        path = self.run_dir(run_id) / RUN_FILE_NAME
+        if not path.exists() or not self.checkpoint_path(run_id).exists():
+            return None
+        with open(path, "r", encoding="utf8") as f:
+            return json.load(f)
+
+    def save(
+        self, run_id: str, state_dict: Dict[str, torch.Tensor], record: Dict[str, Any]
+    ) -> Path:
+        """
+        Store a checkpoint and its run record.
+
+        Both files are written to a temporary directory that is renamed into
+        place, so a run directory is either complete or absent.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        final = self.run_dir(run_id)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{run_id}.", dir=self.root))
+        try:
+            torch.save(state_dict, tmp / CHECKPOINT_NAME)
+            with open(tmp / RUN_FILE_NAME, "w", encoding="utf8") as f:
+                json.dump({**record, "run_id": run_id}, f, indent=2)
+            if final.exists():
+                shutil.rmtree(final)
+            os.replace(tmp, final)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return final
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """
+        All run records, newest first.
+        """
+        runs = []
+        if self.root.exists():
+            for path in self.root.iterdir():
+                if path.name.startswith("."):
+                    continue
+                record = self.lookup(path.name)
+                if record is not None:
+                    runs.append(record)
+        return sorted(runs, key=lambda r: r.get("created", ""), reverse=True)
+
+    def resolve(self, model_id: str) -> str:
+        """
+        Expand a unique run_id prefix (or "latest") into a full run_id.
+
+        Raises:
+            KeyError: If no run, or more than one run, matches.
+        """
+        runs = self.list_runs()
+        if model_id == "latest":
+            if not runs:
+                raise KeyError(f"No runs in {self.root}")
+            return runs[0]["run_id"]
+
+        matches = [r["run_id"] for r in runs if r["run_id"].startswith(model_id)]
+        if len(matches) != 1:
+            raise KeyError(f"{model_id!r} matches {len(matches)} runs in {self.root}")
+        return matches[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the model registry")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List trained runs, newest first")
+    show = sub.add_parser("show", help="Print one run record")
+    show.add_argument("run_id")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    if args.command == "list":
+        for run in registry.list_runs():
+            metrics = run.get("metrics", {})
+            print(
+                f"{run['run_id']}  {run.get('created', '?')}  "
+                f"val_acc={metrics.get('best_val_acc', float('nan')):.4f}  "
+                f"samples={run.get('num_samples', '?')}"
+            )
+    else:
+        run_id = registry.resolve(args.run_id)
+        print(json.dumps(registry.lookup(run_id), indent=2))
+        print(f"checkpoint: {registry.checkpoint_path(run_id)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Background writer that flushes recorded samples to a LandmarkStore
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .landmark_store import FEATURE_DIM, LandmarkStore
+
+_STOP = object()
+
+
+class BackgroundShardWriter:  # pylint: disable=too-many-instance-attributes
+    """
+    Writes samples to a LandmarkStore from a daemon thread.
+
+    The capture loop calls submit(), which never blocks: samples go into a
+    bounded queue and are dropped (and counted) if the writer falls behind.
+    The thread groups samples into chunks and appends each chunk as a shard,
+    so at most one chunk is lost if the process dies. A partial chunk is
+    only flushed once no sample has arrived for `flush_interval` seconds,
+    so continuous capture writes full chunks, and close() merges the
+    session's shards into one.
+    """
+
+    def __init__(
+        self,
+        store: LandmarkStore,
+        chunk_size: int = 256,
+        max_queue: int = 1024,
+        flush_interval: float = 2.0,
+        merge_on_close: bool = True,
+    ):
+        """
+        Args:
+            store: Destination store.
+            chunk_size: Samples per shard written.
+            max_queue: Samples buffered before submit() starts dropping.
+            flush_interval: Idle seconds after which a partial chunk is
+                flushed, and the wait before retrying a failed flush.
+            merge_on_close: Merge the shards written by this writer into
+                one when it is closed.
+        """
+        self.store = store
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.merge_on_close = merge_on_close
+        # Samples held while flushes keep failing; the oldest are dropped
+        self.max_pending = max(chunk_size, max_queue)
+        self.shard_ids: List[str] = []
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._run, name="shard-writer", daemon=True
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.flushes = 0
+        self.errors = 0
+        self._flush_seconds: List[float] = []
+
+    def start(self) -> "BackgroundShardWriter":
+        self._thread.start()
+        return self
+
+    def submit(self, features: np.ndarray, label: int) -> bool:
+        """
+        Queue one sample. Returns False if it was dropped because the queue
+        is full.
+        """
+        try:
+            self._queue.put_nowait((np.asarray(features, dtype=np.float32), label))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Flush everything still queued, stop the thread and merge this
+        session's shards.
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive() or not self.merge_on_close:
+            return
+        if len(self.shard_ids) > 1:
+            try:
+                merged = self.store.merge(self.shard_ids, source="webcam")
+            except OSError:
+                logging.exception("Failed to merge %d shards", len(self.shard_ids))
+                return
+            logging.info("Merged %d shards into %s", len(self.shard_ids), merged)
+            self.shard_ids = [merged]
+
+    def __enter__(self) -> "BackgroundShardWriter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _flush(self, pending: List[tuple]) -> bool:
+        X = np.stack([features for features, _ in pending]).reshape(-1, FEATURE_DIM)
+        y = np.array([label for _, label in pending], dtype=np.int64)
+
+        t0 = time.perf_counter()
+        try:
+            shard_id = self.store.append(X, y)
+        except OSError:
+            logging.exception("Failed to flush %d samples; will retry", len(y))
+            with self._lock:
+                self.errors += 1
+            return False
+        elapsed = time.perf_counter() - t0
+
+        with self._lock:
+            self.shard_ids.append(shard_id)
+            self.written += len(y)
+            self.flushes += 1
+            self._flush_seconds.append(elapsed)
+        logging.info("Flushed %d samples in %.1f ms", len(y), elapsed * 1000.0)
+        return True
+
+    def _run(self) -> None:
+        pending: List[tuple] = []
+        retry_at = 0.0
+        stopping = False
+
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif item is not None:
+                pending.append(item)
+                if len(pending) > self.max_pending:
+                    # Flushes keep failing; keep the newest samples only
+                    del pending[0]
+                    with self._lock:
+                        self.dropped += 1
+
+            idle = item is None
+            ready = stopping or idle or len(pending) >= self.chunk_size
+            if pending and ready and (stopping or time.monotonic() >= retry_at):
+                if self._flush(pending):
+                    pending = []
+                else:
+                    retry_at = time.monotonic() + self.flush_interval
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self._flush_seconds) * 1000.0
+            return {
+                "submitted": self.submitted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "queued": self._queue.qsize(),
+                "flushes": self.flushes,
+                "errors": self.errors,
+                "flush_ms_mean": (
+                    round(float(latencies.mean()), 3) if len(latencies) else 0.0
+                ),
+                "flush_ms_max": (
+                    round(float(latencies.max()), 3) if len(latencies) else 0.0
+                ),
+            }
@@ -0,0 +1,342 @@
+"""
+Hyperparameter sweep for the landmark MLP
+
+Expands a grid or random search space over train_mlp.fit arguments and runs
+the trials in a process pool. Each worker pins torch to one thread, and the
+dataset is placed in shared memory once and handed to every worker
+read-only. Trials that stop improving, or that trail the best trial so far
+by a wide margin, are stopped early. Results are written to a leaderboard.
+
+Usage:
+    python -m src.sweep --mode grid --lr 3e-4 1e-3 3e-3 --batch-size 64 128
+    python -m src.sweep --mode random --trials 32 --lr 1e-4:1e-2 \\
+        --weight-decay 1e-6:1e-3 --batch-size 32 64 128 --workers 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import random
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+import torch
+import torch.multiprocessing as torch_mp
+
+from . import train_mlp
+from .registry import dataset_digest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SWEEPS_DIR = PROJECT_ROOT / "models" / "sweeps"
+
+# Parameters a sweep may vary, with the type used to parse CLI values
+PARAM_TYPES = {
+    "batch_size": int,
+    "lr": float,
+    "weight_decay": float,
+    "num_epochs": int,
+    "val_split": float,
+}
+
+# A list is a set of choices; a (low, high) tuple is a log-uniform range
+SearchSpace = Dict[str, Union[List[Any], Tuple[float, float]]]
+
+# Per-process state set up by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def expand_grid(space: SearchSpace) -> List[Dict[str, Any]]:
+    """
+    Every combination of the listed choices.
+    """
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for {name}")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*space.values())]
+
+
+def sample_random(
+    space: SearchSpace, n_trials: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    n_trials independent draws: uniform over choices, log-uniform over ranges.
+    """
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(n_trials):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+                params[name] = PARAM_TYPES.get(name, float)(value)
+            else:
+                params[name] = rng.choice(values)
+        trials.append(params)
+    return trials
+
+
+class EarlyStopper:
+    """
+    should_stop callback for one trial.
+
+    Stops when validation accuracy has not improved for `patience` epochs,
+    or when, after `min_epochs`, it trails the best accuracy any trial has
+    reached by more than `prune_margin`. The cross-trial best lives in a
+    shared multiprocessing Value.
+    """
+
+    def __init__(
+        self, shared_best, patience: int, min_epochs: int, prune_margin: float
+    ):
+        self.shared_best = shared_best
+        self.patience = patience
+        self.min_epochs = min_epochs
+        self.prune_margin = prune_margin
+        self.best = 0.0
+        self.best_epoch = 0
+        self.reason = None
+
+    def __call__(self, epoch: int, val_acc: float) -> bool:
+        if val_acc > self.best:
+            self.best, self.best_epoch = val_acc, epoch
+            with self.shared_best.get_lock():
+                self.shared_best.value = max(self.shared_best.value, val_acc)
+
+        if self.patience and epoch - self.best_epoch >= self.patience:
+            self.reason = f"no improvement for {self.patience} epochs"
+        elif (
+            epoch >= self.min_epochs
+            and self.best + self.prune_margin < self.shared_best.value
+        ):
+            self.reason = (
+                f"trailing best trial ({self.shared_best.value:.4f}) "
+                f"by more than {self.prune_margin}"
+            )
+        return self.reason is not None
+
+
+def pin_torch_threads() -> None:
+    """
+    Limit torch to one thread so N worker processes use N cores.
+    """
+    torch.set_num_threads(1)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed for this process (e.g. when running inline)
+        pass
+
+
+def _init_worker(X, y, shared_best, stop_settings: Dict[str, Any]) -> None:
+    """
+    Pool initializer: one torch thread per trial, shared dataset and best.
+    """
+    pin_torch_threads()
+    _worker.update(X=X, y=y, shared_best=shared_best, **stop_settings)
+
+
+def run_trial(trial_id: int, params: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    """
+    Train one configuration and return its leaderboard row.
+    """
+    stopper = EarlyStopper(
+        _worker["shared_best"],
+        _worker["patience"],
+        _worker["min_epochs"],
+        _worker["prune_margin"],
+    )
+    result = train_mlp.fit(
+        _worker["X"],
+        _worker["y"],
+        seed=seed,
+        verbose=False,
+        should_stop=stopper,
+        **params,
+    )
+    return {
+        "trial": trial_id,
+        "params": params,
+        **result["metrics"],
+        "stopped_early": stopper.reason,
+        "pid": os.getpid(),
+    }
+
+
+def run_sweep(
+    X: torch.Tensor,
+    y: torch.Tensor,
+    trials: List[Dict[str, Any]],
+    workers: int = os.cpu_count() or 1,
+    seed: int = 0,
+    patience: int = 5,
+    min_epochs: int = 5,
+    prune_margin: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """
+    Run every trial and return leaderboard rows, best first.
+
+    Args:
+        X, y: Full dataset; each trial uses the same seeded validation split.
+        trials: fit() keyword arguments, one dict per trial.
+        workers: Worker processes. 1 runs the trials in this process.
+        seed: Split and init seed shared by all trials.
+        patience: Epochs without improvement before a trial stops (0 = off).
+        min_epochs: Epochs before a trial can be pruned against the others.
+        prune_margin: Accuracy gap to the best trial that gets a trial pruned.
+    """
+    stop_settings = {
+        "patience": patience,
+        "min_epochs": min_epochs,
+        "prune_margin": prune_margin,
+    }
+    ctx = torch_mp.get_context("spawn")
+    shared_best = ctx.Value("d", 0.0)
+    X, y = X.contiguous().share_memory_(), y.contiguous().share_memory_()
+
+    rows = []
+
+    def record(row: Dict[str, Any]) -> None:
+        rows.append(row)
+        note = f" (stopped: {row['stopped_early']})" if row["stopped_early"] else ""
+        print(
+            f"trial {row['trial']:03d} {row['params']} -> "
+            f"val acc {row['best_val_acc']:.4f} after {row['epochs_run']} epochs"
+            f"{note}"
+        )
+
+    if workers <= 1:
+        previous_threads = torch.get_num_threads()
+        _init_worker(X, y, shared_best, stop_settings)
+        try:
+            for trial_id, params in enumerate(trials):
+                record(run_trial(trial_id, params, seed))
+        finally:
+            torch.set_num_threads(previous_threads)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(X, y, shared_best, stop_settings),
+        ) as pool:
+            futures = [
+                pool.submit(run_trial, trial_id, params, seed)
+                for trial_id, params in enumerate(trials)
+            ]
+            for future in as_completed(futures):
+                record(future.result())
+
+    return sorted(rows, key=lambda r: (-r["best_val_acc"], r["trial"]))
+
+
+def write_leaderboard(rows: List[Dict[str, Any]], out_dir: Path, meta: Dict) -> Path:
+    """
+    Write leaderboard.json (rows plus sweep metadata) and return its path.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "leaderboard.json"
+    with open(path, "w", encoding="utf8") as f:
+        json.dump({**meta, "trials": rows}, f, indent=2)
+    return path
+
+
+def format_leaderboard(rows: List[Dict[str, Any]], top: int = 10) -> str:
+    """
+    The top rows as a fixed-width table.
+    """
+    names = sorted({name for row in rows for name in row["params"]})
+    header = " ".join(f"{n:>12}" for n in ["rank", "val_acc", "epochs", *names])
+    lines = [header]
+    for rank, row in enumerate(rows[:top], start=1):
+        cells = [rank, f"{row['best_val_acc']:.4f}", row["epochs_run"]]
+        cells += [
+            f"{row['params'][n]:.4g}" if n in row["params"] else "-" for n in names
+        ]
+        lines.append(" ".join(f"{c:>12}" for c in cells))
+    return "\n".join(lines)
+
+
+def parse_space(args: argparse.Namespace) -> SearchSpace:
+    """
+    Turn CLI values into a search space. "low:high" is a log-uniform range.
+    """
+    space: SearchSpace = {}
+    for name, cast in PARAM_TYPES.items():
+        values = getattr(args, name)
+        if not values:
+            continue
+        if len(values) == 1 and ":" in values[0]:
+            low, high = (float(v) for v in values[0].split(":"))
+            space[name] = (low, high)
+        else:
+            space[name] = [cast(v) for v in values]
+    return space
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for train_mlp")
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=16, help="Random mode only")
+    parser.add_argument("--batch-size", dest="batch_size", nargs="+")
+    parser.add_argument("--lr", nargs="+")
+    parser.add_argument("--weight-decay", dest="weight_decay", nargs="+")
+    parser.add_argument("--epochs", dest="num_epochs", nargs="+", default=["30"])
+    parser.add_argument("--val-split", dest="val_split", nargs="+")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--patience", type=int, default=5)
+    parser.add_argument("--min-epochs", type=int, default=5)
+    parser.add_argument("--prune-margin", type=float, default=0.1)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    space = parse_space(args)
+    if args.mode == "grid":
+        trials = expand_grid(space)
+    else:
+        trials = sample_random(space, args.trials, seed=args.seed)
+
+    dataset = train_mlp.load_dataset()
+    X, y = dataset.tensors[0], dataset.tensors[1]
+    print(f"Running {len(trials)} trials on {args.workers} worker(s)")
+
+    t0 = time.perf_counter()
+    rows = run_sweep(
+        X,
+        y,
+        trials,
+        workers=args.workers,
+        seed=args.seed,
+        patience=args.patience,
+        min_epochs=args.min_epochs,
+        prune_margin=args.prune_margin,
+    )
+    elapsed = time.perf_counter() - t0
+
+    out_dir = args.out or SWEEPS_DIR / time.strftime("%Y%m%d-%H%M%S")
+    path = write_leaderboard(
+        rows,
+        out_dir,
+        {
+            "mode": args.mode,
+            "space": {k: list(v) for k, v in space.items()},
+            "seed": args.seed,
+            "workers": args.workers,
+            "seconds": round(elapsed, 3),
+            "dataset_digest": dataset_digest(X.numpy(), y.numpy()),
+        },
+    )
+    print(format_leaderboard(rows))
+    print(f"{len(rows)} trials in {elapsed:.1f}s; leaderboard at {path}")
+
+
+if __name__ == "__main__":
+    main()
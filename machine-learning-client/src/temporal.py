@@ -0,0 +1,163 @@
+"""
+Motion-gated, temporally smoothed classification for live video
+
+The raw per-frame argmax flickers between letters, and re-running the model
+on a hand that has not moved gives the same answer at full cost. For each
+tracked hand, TemporalFilter:
+
+- skips the forward pass while the normalized landmarks are within
+  `motion_eps` (RMS joint distance) of the last classified frame, forcing
+  one every `max_skip` frames so a slow drift is still picked up;
+- smooths class probabilities with an exponential moving average;
+- only shows a letter once its smoothed probability reaches `enter`, and
+  keeps showing it until it drops below `leave` or another letter overtakes
+  it by `switch_margin`.
+
+Skipped and run forward passes are counted so the saving can be reported.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .dedup import pose_distances
+
+# Drift from the last classified pose before the model is run again; a held
+# pose moves ~0.01 between consecutive frames
+MOTION_EPS = 0.03
+MAX_SKIP = 15
+
+
+@dataclass
+class _Track:
+    """
+    State for one hand across frames.
+    """
+
+    features: np.ndarray
+    probs: np.ndarray
+    shown: int = -1
+    since_forward: int = 0
+
+
+class TemporalFilter:  # pylint: disable=too-many-instance-attributes
+    """
+    Per-hand motion gate, probability EMA and display hysteresis.
+
+    Hands are identified by a caller-chosen key (the demo uses handedness).
+    A hand whose key is missing from a frame loses its state.
+    """
+
+    def __init__(
+        self,
+        motion_eps: float = MOTION_EPS,
+        max_skip: int = MAX_SKIP,
+        alpha: float = 0.4,
+        enter: float = 0.6,
+        leave: float = 0.4,
+        switch_margin: float = 0.1,
+    ):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        if leave > enter:
+            raise ValueError(f"leave ({leave}) must not exceed enter ({enter})")
+        self.motion_eps = motion_eps
+        self.max_skip = max_skip
+        self.alpha = alpha
+        self.enter = enter
+        self.leave = leave
+        self.switch_margin = switch_margin
+        self.tracks: Dict[Hashable, _Track] = {}
+        self.forwards = 0
+        self.skipped = 0
+
+    def _needs_forward(self, key: Hashable, features: np.ndarray) -> bool:
+        track = self.tracks.get(key)
+        if track is None or track.since_forward >= self.max_skip:
+            return True
+        moved = pose_distances(features, track.features[np.newaxis])[0]
+        return bool(moved >= self.motion_eps)
+
+    def _show(self, track: _Track) -> Tuple[int, float]:
+        """
+        Apply hysteresis to the smoothed probabilities: (class or -1, its
+        smoothed probability).
+        """
+        best = int(track.probs.argmax())
+        best_p = float(track.probs[best])
+        if track.shown >= 0:
+            shown_p = float(track.probs[track.shown])
+            if shown_p < self.leave:
+                track.shown = -1
+            elif best != track.shown and best_p >= shown_p + self.switch_margin:
+                track.shown = best if best_p >= self.enter else -1
+        if track.shown < 0 and best_p >= self.enter:
+            track.shown = best
+        if track.shown < 0:
+            return -1, best_p
+        return track.shown, float(track.probs[track.shown])
+
+    def __call__(
+        self,
+        features: np.ndarray,
+        keys: Sequence[Hashable],
+        forward: Callable[[np.ndarray], np.ndarray],
+    ) -> List[Tuple[int, float]]:
+        """
+        Update every hand in one frame.
+
+        Args:
+            features: (N, 63) normalized landmarks, one row per hand.
+            keys: N hand identifiers.
+            forward: Maps (M, 63) features to (M, C) class probabilities.
+                It is called at most once, with only the hands that moved.
+
+        Returns:
+            One (class index or -1, smoothed confidence) per hand.
+        """
+        for key in set(self.tracks) - set(keys):
+            del self.tracks[key]
+
+        moved = [
+            i for i, key in enumerate(keys) if self._needs_forward(key, features[i])
+        ]
+        self.forwards += len(moved)
+        self.skipped += len(keys) - len(moved)
+
+        moved_set = set(moved)
+        probs: Optional[np.ndarray] = forward(features[moved]) if moved else None
+        for row, i in enumerate(moved):
+            track = self.tracks.get(keys[i])
+            if track is None:
+                self.tracks[keys[i]] = _Track(features[i].copy(), probs[row].copy())
+                continue
+            track.features[:] = features[i]
+            track.probs *= 1.0 - self.alpha
+            track.probs += self.alpha * probs[row]
+            track.since_forward = 0
+
+        results = []
+        for i, key in enumerate(keys):
+            track = self.tracks[key]
+            if i not in moved_set:
+                track.since_forward += 1
+            results.append(self._show(track))
+        return results
+
+    def reset(self) -> None:
+        self.tracks.clear()
+
+    @property
+    def skipped_ratio(self) -> float:
+        total = self.forwards + self.skipped
+        return self.skipped / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "forwards": self.forwards,
+            "skipped": self.skipped,
+            "skipped_ratio": self.skipped_ratio,
+        }
@@ -3,18 +3,27 @@ Train model on data
 """
 
 from __future__ import annotations
+import argparse
+import copy
+import functools
 from pathlib import Path
+import shutil
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
-import numpy as np
 import torch
-from torch.utils.data import TensorDataset, DataLoader, random_split
+from torch.utils.data import TensorDataset, DataLoader
 import torch.nn as nn
 import torch.optim as optim
 
 from models.model_MLP import LandmarkMLP
+from .augment import AugmentConfig, Augmenter
+from .landmark_store import load_landmarks
+from .registry import ModelRegistry, config_digest, dataset_digest, make_run_id
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-DATA_PATH = PROJECT_ROOT / "data" / "webcam_landmarks.npz"
+DATA_PATH = PROJECT_ROOT / "data" / "webcam_landmarks"
+LEGACY_DATA_PATH = PROJECT_ROOT / "data" / "webcam_landmarks.npz"
 MODELS_DIR = PROJECT_ROOT / "models"
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 OUT_PATH = MODELS_DIR / "mlp_webcam.pt"
@@ -23,10 +32,14 @@ OUT_PATH = MODELS_DIR / "mlp_webcam.pt"
 def load_dataset():
     """
     Loads the dataset specified in the DATA_PATH constant
+
+    DATA_PATH may be a landmark store directory or an .npz file. If it does
+    not exist, the legacy webcam_landmarks.npz is used instead.
     """
-    data = np.load(DATA_PATH)
-    X = data["X"]
-    y = data["y"]
+    path = Path(DATA_PATH)
+    if not path.exists():
+        path = LEGACY_DATA_PATH
+    X, y = load_landmarks(path)
 
     print(f"Loaded landmarks: X shape={X.shape}, y shape={y.shape}")
 
@@ -36,17 +49,323 @@ def load_dataset():
     return TensorDataset(X_t, y_t)
 
 
+LOOPS = ("tensor", "dataloader")
+
+
+def split_tensors(X: torch.Tensor, y: torch.Tensor, val_split: float, seed: int):
+    """
+    Seeded train/validation split of in-memory tensors
+
+    Uses the same permutation random_split would for this seed.
+
+    Returns:
+        X_train, y_train, X_val, y_val
+    """
+    n_total = len(y)
+    n_train = n_total - int(n_total * val_split)
+    perm = torch.randperm(n_total, generator=torch.Generator().manual_seed(seed))
+    train_idx, val_idx = perm[:n_train], perm[n_train:]
+    return X[train_idx], y[train_idx], X[val_idx], y[val_idx]
+
+
+def train_one_epoch(model, loader, criterion, optimizer, device, augment=None) -> float:
+    """
+    One pass over a DataLoader; returns the mean training loss per sample
+
+    `augment`, if given, maps each (B, 63) input batch to an augmented one.
+    """
+    model.train()
+    running_loss = 0.0
+    seen = 0
+
+    for X_batch, y_batch in loader:
+        X_batch = X_batch.to(device)
+        y_batch = y_batch.to(device)
+        if augment is not None:
+            X_batch = augment(X_batch)
+
+        optimizer.zero_grad()
+        logits = model(X_batch)
+        loss = criterion(logits, y_batch)
+        loss.backward()
+        optimizer.step()
+
+        running_loss += loss.item() * X_batch.size(0)
+        seen += X_batch.size(0)
+
+    return running_loss / seen if seen > 0 else 0.0
+
+
+def train_epoch_tensors(
+    model, X, y, batch_size, criterion, optimizer, generator=None, augment=None
+) -> float:
+    """
+    One pass over tensors already on the model's device
+
+    A single randperm per epoch replaces DataLoader shuffling and per-sample
+    collation; each batch is an index lookup into the resident tensors. The
+    loss is accumulated on the device so there is one sync per epoch.
+    `augment`, if given, maps each (B, 63) input batch to an augmented one.
+    """
+    model.train()
+    n = len(y)
+    perm = torch.randperm(n, device=X.device, generator=generator)
+    total_loss = torch.zeros((), device=X.device)
+
+    for start in range(0, n, batch_size):
+        idx = perm[start : start + batch_size]
+        X_batch, y_batch = X[idx], y[idx]
+        if augment is not None:
+            X_batch = augment(X_batch)
+
+        optimizer.zero_grad(set_to_none=True)
+        loss = criterion(model(X_batch), y_batch)
+        loss.backward()
+        optimizer.step()
+
+        total_loss += loss.detach() * len(idx)
+
+    return total_loss.item() / n if n > 0 else 0.0
+
+
+def evaluate(model, loader, device) -> float:
+    """
+    Classification accuracy of `model` over a DataLoader
+    """
+    model.eval()
+    correct = 0
+    total = 0
+    with torch.no_grad():
+        for X_batch, y_batch in loader:
+            X_batch = X_batch.to(device)
+            y_batch = y_batch.to(device)
+
+            logits = model(X_batch)
+            preds = logits.argmax(dim=1)
+            correct += (preds == y_batch).sum().item()
+            total += y_batch.size(0)
+
+    return correct / total if total > 0 else 0.0
+
+
+def evaluate_tensors(model, X, y, chunk_size: int = 65536) -> float:
+    """
+    Classification accuracy over resident tensors in a few large forwards
+    """
+    if len(y) == 0:
+        return 0.0
+
+    model.eval()
+    correct = torch.zeros((), dtype=torch.long, device=X.device)
+    with torch.no_grad():
+        for start in range(0, len(y), chunk_size):
+            preds = model(X[start : start + chunk_size]).argmax(dim=1)
+            correct += (preds == y[start : start + chunk_size]).sum()
+    return correct.item() / len(y)
+
+
+def make_epoch_runners(
+    loop, model, splits, batch_size, criterion, optimizer, device, seed, augmenter
+):
+    """
+    Build zero-argument (run_epoch, run_eval) callables for the chosen loop
+    """
+    X_train, y_train, X_val, y_val = splits
+    if loop == "tensor":
+        X_train, y_train, X_val, y_val = (
+            t.to(device).contiguous() for t in (X_train, y_train, X_val, y_val)
+        )
+        generator = torch.Generator(device=device).manual_seed(seed)
+        run_epoch = functools.partial(
+            train_epoch_tensors,
+            model,
+            X_train,
+            y_train,
+            batch_size,
+            criterion,
+            optimizer,
+            generator,
+            augmenter,
+        )
+        run_eval = functools.partial(evaluate_tensors, model, X_val, y_val)
+    else:
+        train_loader = DataLoader(
+            TensorDataset(X_train, y_train), batch_size=batch_size, shuffle=True
+        )
+        val_loader = DataLoader(
+            TensorDataset(X_val, y_val), batch_size=batch_size, shuffle=False
+        )
+        run_epoch = functools.partial(
+            train_one_epoch,
+            model,
+            train_loader,
+            criterion,
+            optimizer,
+            device,
+            augmenter,
+        )
+        run_eval = functools.partial(evaluate, model, val_loader, device)
+
+    return run_epoch, run_eval
+
+
+def fit(
+    X: torch.Tensor,
+    y: torch.Tensor,
+    batch_size: int = 64,
+    lr: float = 1e-3,
+    weight_decay: float = 1e-4,
+    num_epochs: int = 30,
+    val_split: float = 0.2,
+    seed: int = 0,
+    loop: str = "tensor",
+    verbose: bool = True,
+    should_stop: Optional[Callable[[int, float], bool]] = None,
+    val: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+    num_classes: Optional[int] = None,
+    augment: Optional[AugmentConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Train a fresh LandmarkMLP on in-memory (X, y) tensors
+
+    Args:
+        loop: "tensor" keeps the split resident on the device and slices
+              batches by index; "dataloader" is the original DataLoader
+              loop, kept for comparison.
+        verbose: Print per-epoch loss, accuracy and throughput.
+        should_stop: Called as should_stop(epoch, val_acc) after each epoch;
+              returning True ends training early.
+        val: Explicit (X_val, y_val). When given, all of (X, y) is used for
+              training and val_split is ignored.
+        num_classes: Output size; inferred from the labels if None.
+        augment: Batched augmentation applied to every training batch.
+        (other arguments as in train)
+
+    Returns:
+        dict with the model, best_state (None if validation accuracy never
+        rose above 0), num_classes, n_train, n_val and metrics.
+    """
+    if loop not in LOOPS:
+        raise ValueError(f"loop must be one of {LOOPS}, got {loop!r}")
+
+    torch.manual_seed(seed)
+    if val is None:
+        X_train, y_train, X_val, y_val = split_tensors(X, y, val_split, seed)
+    else:
+        X_train, y_train, (X_val, y_val) = X, y, val
+    if verbose:
+        print(f"Train samples: {len(y_train)}, Val samples: {len(y_val)}")
+
+    # Infer num_classes from labels
+    if num_classes is None:
+        num_classes = int(y.max().item()) + 1
+    if verbose:
+        print(f"Detected {num_classes} classes")
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = LandmarkMLP(input_dim=63, num_classes=num_classes).to(device)
+
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr, weight_decay=weight_decay)
+
+    augmenter = None
+    if augment is not None and augment.enabled():
+        augmenter = Augmenter(augment, device, seed)
+
+    run_epoch, run_eval = make_epoch_runners(
+        loop,
+        model,
+        (X_train, y_train, X_val, y_val),
+        batch_size,
+        criterion,
+        optimizer,
+        device,
+        seed,
+        augmenter,
+    )
+
+    best_val_acc = 0.0
+    best_state = None
+    train_loss = float("nan")
+    train_seconds = 0.0
+    epochs_run = 0
+
+    for epoch in range(1, num_epochs + 1):
+        t0 = time.perf_counter()
+        train_loss = run_epoch()
+        epoch_seconds = time.perf_counter() - t0
+        train_seconds += epoch_seconds
+        val_acc = run_eval()
+
+        if verbose:
+            print(
+                f"Epoch {epoch:02d} | Train loss: {train_loss:.4f} | "
+                f"Val acc: {val_acc:.4f} | "
+                f"{len(y_train) / max(epoch_seconds, 1e-9):.0f} samples/s"
+            )
+
+        epochs_run = epoch
+
+        if val_acc > best_val_acc:
+            best_val_acc = val_acc
+            best_state = copy.deepcopy(model.state_dict())
+
+        if should_stop is not None and should_stop(epoch, val_acc):
+            break
+
+    samples_per_sec = (
+        len(y_train) * epochs_run / train_seconds if train_seconds > 0 else 0.0
+    )
+    return {
+        "model": model,
+        "best_state": best_state,
+        "num_classes": num_classes,
+        "n_train": len(y_train),
+        "n_val": len(y_val),
+        "metrics": {
+            "best_val_acc": best_val_acc,
+            "final_train_loss": train_loss,
+            "train_seconds": round(train_seconds, 3),
+            "train_samples_per_sec": round(samples_per_sec, 1),
+            "epochs_run": epochs_run,
+            "augment_ms_per_batch": (
+                round(augmenter.ms_per_batch(), 4) if augmenter else 0.0
+            ),
+        },
+    }
+
+
+def restore_cached_run(registry: ModelRegistry, record: Dict[str, Any]) -> None:
+    """
+    Skip training for a run that already exists: copy its checkpoint to
+    OUT_PATH, which the API serves by default, so it is the live model
+    just as if it had been trained again
+    """
+    run_id = record["run_id"]
+    print(
+        f"Run {run_id} already trained on this dataset and config "
+        f"(val acc: {record['metrics']['best_val_acc']:.4f}); skipping."
+    )
+    checkpoint = registry.checkpoint_path(run_id)
+    shutil.copyfile(checkpoint, OUT_PATH)
+    print(f"Restored checkpoint {checkpoint} to {OUT_PATH}")
+
+
 def train(
     batch_size: int = 64,
     lr: float = 1e-3,
     weight_decay: float = 1e-4,
     num_epochs: int = 30,
     val_split: float = 0.2,
-):
+    seed: int = 0,
+    loop: str = "tensor",
+    augment: Optional[AugmentConfig] = None,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict[str, Any]:
     """
     Train an MLP classifier on the recorded MediaPipe hand-landmark dataset
 
-    This function loads the dataset stored in data/webcam_landmarks.npz,
+    This function loads the dataset stored in data/webcam_landmarks/,
     splits it into training and validation subsets, constructs a lightweight
     feed-forward neural network, and optimizes it using cross-entropy loss.
 
@@ -69,93 +388,157 @@ def train(
         val_split::float (optional):
             Fraction of the dataset to reserve for validation. Defaults to 0.2
 
+        seed::int (optional):
+            Seed for the train/validation split and weight init. Defaults to 0.
+
+        loop::str (optional):
+            "tensor" (default) keeps the dataset as contiguous tensors on the
+            device, shuffles with one permutation per epoch and validates in
+            one batched forward. "dataloader" uses the original DataLoader
+            loop.
+
+        augment::AugmentConfig (optional):
+            On-the-fly batch augmentation (rotation about the wrist, scale
+            jitter, joint noise, mirroring). Defaults to None (off).
+
+        registry::ModelRegistry (optional):
+            If given, the run is keyed by a hash of the dataset and the
+            config above. An existing run with the same key is returned
+            without training; otherwise the best checkpoint and its metrics
+            are stored in the registry under that key.
+
     Workflow:
         1. Load landmark dataset
-        2. Split into train/validation
-        3. Build DataLoaders for minibatch training.
+        2. Split into train/validation with a seeded permutation
+        3. Keep both splits as tensors on the device (or build DataLoaders).
         4. Automatically infer the number of gesture classes from labels.
         5. Initialize LandmarkMLP and send it to CPU
         6. Train using Adam + cross-entropy:
             - Track training loss
             - Track validation accuracy every epoch
-        7. Save model weights whenever validation accuracy improves.
+        7. Save the weights with the best validation accuracy.
 
     Returns:
-        None
-            The trained model is saved to disk rather than returned
+        dict
+            The run record: run_id (None without a registry), config and
+            metrics. The trained weights are saved to disk.
     """
     dataset = load_dataset()
-    n_total = len(dataset)
-    n_val = int(n_total * val_split)
-    n_train = n_total - n_val
-
-    train_ds, val_ds = random_split(dataset, [n_train, n_val])
-    print(f"Train samples: {len(train_ds)}, Val samples: {len(val_ds)}")
-
-    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_ds, batch_size=batch_size, shuffle=False)
-
-    # Infer num_classes from labels
-    all_labels = torch.unique(dataset.tensors[1])
-    num_classes = int(all_labels.max().item()) + 1
-    print(f"Detected {num_classes} classes")
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = LandmarkMLP(input_dim=63, num_classes=num_classes).to(device)
-
-    criterion = nn.CrossEntropyLoss()
-    optimizer = optim.Adam(model.parameters(), lr=lr, weight_decay=weight_decay)
-
-    best_val_acc = 0.0
-
-    for epoch in range(1, num_epochs + 1):
-        # Train
-        model.train()
-        running_loss = 0.0
-
-        for X_batch, y_batch in train_loader:
-            X_batch = X_batch.to(device)
-            y_batch = y_batch.to(device)
-
-            optimizer.zero_grad()
-            logits = model(X_batch)
-            loss = criterion(logits, y_batch)
-            loss.backward()
-            optimizer.step()
-
-            running_loss += loss.item() * X_batch.size(0)
-
-        train_loss = running_loss / len(train_ds)
-
-        # Validate
-        model.eval()
-        correct = 0
-        total = 0
-        with torch.no_grad():
-            for X_batch, y_batch in val_loader:
-                X_batch = X_batch.to(device)
-                y_batch = y_batch.to(device)
-
-                logits = model(X_batch)
-                preds = logits.argmax(dim=1)
-                correct += (preds == y_batch).sum().item()
-                total += y_batch.size(0)
-
-        val_acc = correct / total if total > 0 else 0.0
-
+    X, y = dataset.tensors[0], dataset.tensors[1]
+    config = {
+        "model": "LandmarkMLP",
+        "batch_size": batch_size,
+        "lr": lr,
+        "weight_decay": weight_decay,
+        "num_epochs": num_epochs,
+        "val_split": val_split,
+        "seed": seed,
+        "loop": loop,
+        "augment": augment.to_dict() if augment is not None else None,
+    }
+
+    run_id = data_digest = None
+    if registry is not None:
+        data_digest = dataset_digest(X.numpy(), y.numpy())
+        run_id = make_run_id(data_digest, config_digest(config))
+        existing = registry.lookup(run_id)
+        if existing is not None:
+            restore_cached_run(registry, existing)
+            return existing
+
+    result = fit(
+        X,
+        y,
+        batch_size=batch_size,
+        lr=lr,
+        weight_decay=weight_decay,
+        num_epochs=num_epochs,
+        val_split=val_split,
+        seed=seed,
+        loop=loop,
+        augment=augment,
+    )
+    metrics = result["metrics"]
+    best_state = result["best_state"]
+
+    # Save best model
+    if best_state is not None:
+        torch.save(best_state, OUT_PATH)
         print(
-            f"Epoch {epoch:02d} | Train loss: {train_loss:.4f} | Val acc: {val_acc:.4f}"
+            f"Best model saved to {OUT_PATH} (val acc: {metrics['best_val_acc']:.4f})"
         )
 
-        # Save best model
-        if val_acc > best_val_acc:
-            best_val_acc = val_acc
-            torch.save(model.state_dict(), OUT_PATH)
-            print(f"New best model saved to {OUT_PATH} (val acc: {best_val_acc:.4f})")
-
-    print(f"Training done. Best val acc: {best_val_acc:.4f}")
+    print(
+        f"Training done in {metrics['train_seconds']:.2f}s "
+        f"({metrics['train_samples_per_sec']:.0f} samples/s). "
+        f"Best val acc: {metrics['best_val_acc']:.4f}"
+    )
+    if metrics["augment_ms_per_batch"]:
+        print(f"Augmentation cost: {metrics['augment_ms_per_batch']:.3f} ms/batch")
     print(f"Final model weights at: {OUT_PATH}")
 
+    record = {
+        "run_id": run_id,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config,
+        "num_samples": len(dataset),
+        "num_classes": result["num_classes"],
+        "metrics": metrics,
+    }
+    if registry is not None:
+        record["dataset_digest"] = data_digest
+        if best_state is None:
+            best_state = result["model"].state_dict()
+        run_dir = registry.save(run_id, best_state, record)
+        print(f"Registered run {run_id} at {run_dir}")
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the landmark MLP")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--weight-decay", type=float, default=1e-4)
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--val-split", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--loop", choices=LOOPS, default="tensor")
+    defaults = AugmentConfig()
+    parser.add_argument(
+        "--augment", action="store_true", help="Enable on-the-fly augmentation"
+    )
+    parser.add_argument("--rotation-deg", type=float, default=defaults.rotation_deg)
+    parser.add_argument("--scale-jitter", type=float, default=defaults.scale_jitter)
+    parser.add_argument("--joint-noise", type=float, default=defaults.joint_noise)
+    parser.add_argument("--mirror-prob", type=float, default=defaults.mirror_prob)
+    parser.add_argument(
+        "--no-registry",
+        action="store_true",
+        help="Always train and skip recording the run in models/registry",
+    )
+    args = parser.parse_args()
+
+    train(
+        batch_size=args.batch_size,
+        lr=args.lr,
+        weight_decay=args.weight_decay,
+        num_epochs=args.epochs,
+        val_split=args.val_split,
+        seed=args.seed,
+        loop=args.loop,
+        augment=(
+            AugmentConfig(
+                rotation_deg=args.rotation_deg,
+                scale_jitter=args.scale_jitter,
+                joint_noise=args.joint_noise,
+                mirror_prob=args.mirror_prob,
+            )
+            if args.augment
+            else None
+        ),
+        registry=None if args.no_registry else ModelRegistry(),
+    )
+
 
 if __name__ == "__main__":
-    train()
+    main()
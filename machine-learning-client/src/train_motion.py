@@ -0,0 +1,153 @@
+"""
+Train the J/Z motion classifier on recorded landmark sequences
+
+Takes come from src.record_motion_samples (data/motion_sequences.npz).
+--synthetic N trains on generated toy sequences instead, which is only
+useful to check the pipeline end to end.
+
+Usage:
+    python -m src.train_motion --epochs 40
+    python -m src.train_motion --synthetic 2000 --out /tmp/motion.pt
+"""
+
+from __future__ import annotations
+import argparse
+import copy
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from models.model_motion import MotionClassifier
+from .motion import (
+    DATA_PATH,
+    FRAME_DIM,
+    MODEL_PATH,
+    MOTION_CLASSES,
+    load_sequences,
+    synthetic_sequences,
+    training_windows,
+)
+from .train_mlp import evaluate_tensors, split_tensors, train_epoch_tensors
+
+
+def fit_motion(
+    X_raw: np.ndarray,
+    y: np.ndarray,
+    batch_size: int = 32,
+    lr: float = 1e-3,
+    weight_decay: float = 1e-4,
+    num_epochs: int = 40,
+    val_split: float = 0.2,
+    seed: int = 0,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Train a fresh MotionClassifier on raw (N, T, 21, 3) takes.
+
+    Takes are split into train and validation first, then each is cut into
+    every window a stream would see (training_windows), so windows of one
+    take never end up on both sides.
+
+    Returns:
+        dict with the model, best_state (None if validation accuracy never
+        rose above 0), n_train and n_val (takes) and best_val_acc.
+    """
+    torch.manual_seed(seed)
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    takes = torch.from_numpy(np.asarray(X_raw, dtype=np.float32))
+    labels = torch.from_numpy(np.asarray(y, dtype=np.int64))
+    train_takes, train_labels, val_takes, val_labels = split_tensors(
+        takes, labels, val_split, seed
+    )
+    X_train, y_train, X_val, y_val = (
+        torch.from_numpy(a).to(device)
+        for a in (
+            *training_windows(train_takes.numpy(), train_labels.numpy()),
+            *training_windows(val_takes.numpy(), val_labels.numpy()),
+        )
+    )
+    if verbose:
+        print(
+            f"Train takes: {len(train_labels)} ({len(y_train)} windows), "
+            f"Val takes: {len(val_labels)} ({len(y_val)} windows)"
+        )
+
+    model = MotionClassifier(frame_dim=FRAME_DIM, num_classes=len(MOTION_CLASSES))
+    model = model.to(device)
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr, weight_decay=weight_decay)
+    generator = torch.Generator(device=device).manual_seed(seed)
+
+    best_val_acc = 0.0
+    best_state = None
+    for epoch in range(1, num_epochs + 1):
+        train_loss = train_epoch_tensors(
+            model, X_train, y_train, batch_size, criterion, optimizer, generator
+        )
+        val_acc = evaluate_tensors(model, X_val, y_val)
+        if verbose:
+            print(
+                f"Epoch {epoch:02d} | Train loss: {train_loss:.4f} | "
+                f"Val acc: {val_acc:.4f}"
+            )
+        if val_acc > best_val_acc:
+            best_val_acc = val_acc
+            best_state = copy.deepcopy(model.state_dict())
+
+    return {
+        "model": model,
+        "best_state": best_state,
+        "n_train": len(train_labels),
+        "n_val": len(val_labels),
+        "best_val_acc": best_val_acc,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the J/Z motion classifier")
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Train on this many generated sequences instead of --data",
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--val-split", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        X, y = synthetic_sequences(args.synthetic, seed=args.seed)
+    else:
+        X, y = load_sequences(args.data)
+    counts = np.bincount(y, minlength=len(MOTION_CLASSES))
+    print(
+        f"Loaded {len(y)} sequences: "
+        + ", ".join(f"{c}={n}" for c, n in zip(MOTION_CLASSES, counts))
+    )
+
+    result = fit_motion(
+        X,
+        y,
+        batch_size=args.batch_size,
+        lr=args.lr,
+        num_epochs=args.epochs,
+        val_split=args.val_split,
+        seed=args.seed,
+    )
+    state = result["best_state"] or result["model"].state_dict()
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(state, args.out)
+    print(f"Best val acc: {result['best_val_acc']:.4f}; saved model to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,44 @@
 """
 Quick demo that uses the model to predict hand sign
+
+Usage:
+    python -m src.webcam_demo
+    python -m src.webcam_demo --pipelined
+    python -m src.webcam_demo --roi --detect-width 640
+    python -m src.webcam_demo --max-hands 2
+    python -m src.webcam_demo --raw
+    python -m src.webcam_demo --motion
 """
 
 from __future__ import annotations
+import argparse
+from dataclasses import dataclass, field
 import json
 from pathlib import Path
+import time
+from typing import Dict, List, Optional, Tuple
 
 import cv2
+import numpy as np
 import torch
 import torch.nn.functional as F
 
 from models.model_MLP import LandmarkMLP
 
+from src.features import normalize_landmarks_batch
 from src.mediapipe_utils import (
+    HandLandmarks,
     MediaPipeHandDetector,
-    normalize_landmarks,
+    RenderThrottle,
     draw_hand_landmarks_on_frame,
 )
-
+from src.motion import (
+    MODEL_PATH as MOTION_MODEL_PATH,
+    MotionStream,
+    load_motion_model,
+)
+from src.pipeline import Pipeline, StageStats
+from src.temporal import MOTION_EPS, TemporalFilter
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -36,20 +57,219 @@ def load_index_to_letter():
     return index_to_letter
 
 
-def main():
-    index_to_letter = load_index_to_letter()
-    num_classes = len(index_to_letter)
+CONFIDENCE_THRESHOLD = 0.5
+# J / Z are only shown above this; a false motion letter is more jarring
+MOTION_THRESHOLD = 0.7
+WINDOW_NAME = "ASL Alphabet Demo"
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+def load_model(device: torch.device, num_classes: int) -> LandmarkMLP:
     model = LandmarkMLP(input_dim=63, num_classes=num_classes).to(device)
     model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
     model.eval()
+    return model
 
-    detector = MediaPipeHandDetector(max_num_hands=1)
-    cap = cv2.VideoCapture(0)
 
-    print("Press 'q' to quit.")
+def classify_hands(
+    model, device, hands: List[HandLandmarks], index_to_letter
+) -> List[Tuple[str, float]]:
+    """
+    Classify every detected hand in one forward pass.
+    Returns one (letter, confidence) per hand; the letter is "-" below the
+    threshold.
+    """
+    if not hands:
+        return []
+    feats = normalize_landmarks_batch(np.stack([hand.points for hand in hands]))
+    probs = hand_probs(model, device, feats)
+    idx = probs.argmax(axis=1)
+    conf = probs[np.arange(len(idx)), idx]
+
+    return [
+        (index_to_letter.get(i, "?"), c) if c > CONFIDENCE_THRESHOLD else ("-", c)
+        for c, i in zip(conf.tolist(), idx.tolist())
+    ]
+
+
+def hand_probs(model, device, feats: np.ndarray) -> np.ndarray:
+    """
+    (N, 63) normalized landmarks -> (N, C) class probabilities.
+    """
+    x = torch.from_numpy(feats).to(device)
+    with torch.no_grad():
+        logits = model(x)
+        probs = F.softmax(logits, dim=1)
+    return probs.cpu().numpy()
+
+
+def hand_keys(hands: List[HandLandmarks]) -> List[str]:
+    """
+    Stable per-frame identifiers: handedness, numbered when repeated.
+    """
+    seen: Dict[str, int] = {}
+    keys = []
+    for hand in hands:
+        n = seen.get(hand.handedness, 0)
+        seen[hand.handedness] = n + 1
+        keys.append(f"{hand.handedness}{n}")
+    return keys
+
+
+def predict_hands(
+    model, device, hands: List[HandLandmarks], index_to_letter, temporal=None
+) -> List[Tuple[str, float]]:
+    """
+    classify_hands, or with a TemporalFilter, motion-gated and smoothed
+    predictions; hands that have not moved skip the forward pass.
+    """
+    if temporal is None:
+        return classify_hands(model, device, hands, index_to_letter)
+    if not hands:
+        temporal.reset()
+        return []
+    feats = normalize_landmarks_batch(np.stack([hand.points for hand in hands]))
+    results = temporal(feats, hand_keys(hands), lambda x: hand_probs(model, device, x))
+    return [
+        (index_to_letter.get(i, "?"), c) if i >= 0 else ("-", c) for i, c in results
+    ]
+
+
+def classify_hand(model, device, hand: HandLandmarks, index_to_letter):
+    """
+    Returns (letter, confidence); the letter is "-" below the threshold.
+    """
+    return classify_hands(model, device, [hand], index_to_letter)[0]
+
+
+PREDICTION_LINE_HEIGHT = 35
+
+
+def draw_prediction(
+    frame, letter: str, conf: float, label: str = "Pred", row: int = 0
+) -> None:
+    text = f"{label}: {letter} ({conf:.2f})"
+    cv2.putText(
+        frame,
+        text,
+        (10, 40 + PREDICTION_LINE_HEIGHT * row),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.0,
+        (255, 255, 255),
+        2,
+    )
+
+
+def draw_hands(
+    frame, hands: List[HandLandmarks], predictions: List[Tuple[str, float]]
+) -> int:
+    """
+    Landmarks for every hand and one prediction line each, tagged with the
+    handedness when there is more than one. Returns the number of lines.
+    """
+    if not hands:
+        draw_prediction(frame, "-", 0.0)
+        return 1
+    for row, (hand, (letter, conf)) in enumerate(zip(hands, predictions)):
+        draw_hand_landmarks_on_frame(frame, hand)
+        label = hand.handedness if len(hands) > 1 else "Pred"
+        draw_prediction(frame, letter, conf, label, row)
+    return len(hands)
+
+
+def update_motion(
+    stream: MotionStream, hands: List[HandLandmarks]
+) -> Optional[Tuple[str, float]]:
+    """
+    Push the first hand into the motion stream. Returns (letter,
+    confidence) while a J or Z is confidently being signed.
+    """
+    if not hands:
+        stream.reset()
+        return None
+    stream.push(hands[0].points)
+    pred = stream.predict()
+    if pred is None or pred[0] == "-" or pred[1] <= MOTION_THRESHOLD:
+        return None
+    return pred
+
+
+def draw_frame(
+    frame,
+    hands: List[HandLandmarks],
+    predictions: List[Tuple[str, float]],
+    temporal: TemporalFilter = None,
+    motion: Optional[Tuple[str, float]] = None,
+) -> int:
+    """
+    Hands, predictions, the motion letter and the temporal stats. Returns
+    where the next overlay line goes.
+    """
+    lines = draw_hands(frame, hands, predictions)
+    if motion is not None:
+        draw_prediction(frame, motion[0], motion[1], "Motion", lines)
+        lines += 1
+    top = 70 + PREDICTION_LINE_HEIGHT * (lines - 1)
+    if temporal is not None:
+        top = draw_temporal_stats(frame, temporal, top)
+    return top
+
+
+def draw_temporal_stats(frame, temporal: TemporalFilter, top: int) -> int:
+    """
+    Share of forward passes the motion gate skipped. Returns the next free
+    line position.
+    """
+    cv2.putText(
+        frame,
+        f"skipped {100.0 * temporal.skipped_ratio:.0f}% of forwards",
+        (10, top),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.45,
+        (0, 255, 255),
+        1,
+    )
+    return top + 18
+
 
+def draw_stage_overlay(
+    frame, stats: Dict[str, Dict[str, float]], age_ms: float, top: int = 70
+):
+    """
+    One line per pipeline stage plus the age of the displayed frame.
+    """
+    lines = [
+        f"{name:>8}: {row['latency_ms']:6.1f} ms {row['fps']:5.1f} fps"
+        f" drop {int(row.get('dropped', 0))}"
+        for name, row in stats.items()
+    ]
+    lines.append(f"{'age':>8}: {age_ms:6.1f} ms")
+    for i, line in enumerate(lines):
+        cv2.putText(
+            frame,
+            line,
+            (10, top + 18 * i),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.45,
+            (0, 255, 255),
+            1,
+        )
+
+
+def run_serial(
+    cap,
+    detector,
+    model,
+    device,
+    index_to_letter,
+    throttle: Optional[RenderThrottle] = None,
+    temporal: TemporalFilter = None,
+    motion: MotionStream = None,
+) -> None:
+    """
+    Capture, detect, classify and draw one frame at a time. Frames the
+    throttle skips are classified but not drawn.
+    """
+    throttle = throttle or RenderThrottle()
     while True:
         ret, frame = cap.read()
         if not ret:
@@ -58,50 +278,202 @@ def main():
         frame = cv2.flip(frame, 1)
 
         hands = detector.process(frame)
-        pred_letter = "-"
-        pred_conf = 0.0
-
-        # when we detect a hand, draw landmarks and predict letter only if confidence > 0.5
-        if hands:
-            draw_hand_landmarks_on_frame(frame, hands[0])
-
-            feat = normalize_landmarks(hands[0].points)
-            x = torch.from_numpy(feat).unsqueeze(0).to(device)
-
-            with torch.no_grad():
-                logits = model(x)
-                probs = F.softmax(logits, dim=1)
-                conf, idx = probs.max(dim=1)
-                conf = conf.item()
-                idx = idx.item()
-
-            if conf > 0.5:
-                pred_letter = index_to_letter.get(idx, "?")
-                pred_conf = conf
-            else:
-                pred_letter = "-"
-                pred_conf = conf
-
-        text = f"Pred: {pred_letter} ({pred_conf:.2f})"
-        cv2.putText(
-            frame,
-            text,
-            (10, 40),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1.0,
-            (255, 255, 255),
-            2,
-        )
 
-        cv2.imshow("ASL Alphabet Demo", frame)
+        # predict a letter per hand, shown only if confident enough
+        predictions = predict_hands(model, device, hands, index_to_letter, temporal)
+        motion_pred = update_motion(motion, hands) if motion is not None else None
+
+        if throttle.due():
+            draw_frame(frame, hands, predictions, temporal, motion_pred)
+            cv2.imshow(WINDOW_NAME, frame)
 
         key = cv2.waitKey(1) & 0xFF
         if key == ord("q"):
             break
 
-    cap.release()
-    detector.close()
-    cv2.destroyAllWindows()
+
+@dataclass
+class FrameState:
+    """
+    A frame moving through the pipeline and what has been found in it.
+    """
+
+    image: np.ndarray
+    captured_at: float
+    hands: List[HandLandmarks] = field(default_factory=list)
+    predictions: List[Tuple[str, float]] = field(default_factory=list)
+    motion: Optional[Tuple[str, float]] = None
+
+
+def run_pipelined(
+    cap,
+    detector,
+    model,
+    device,
+    index_to_letter,
+    throttle: Optional[RenderThrottle] = None,
+    temporal: TemporalFilter = None,
+    motion: MotionStream = None,
+) -> None:
+    """
+    Capture, detect and classify on their own threads; draw and show on
+    this one. Each stage works on the newest frame available and older
+    ones are dropped, so what is shown is never more than one frame per
+    stage behind the camera.
+    """
+
+    def capture():
+        ret, frame = cap.read()
+        if not ret:
+            return None
+        return FrameState(cv2.flip(frame, 1), time.perf_counter())
+
+    def detect(state: FrameState) -> FrameState:
+        # The detector reuses its landmark buffer on the next frame, which
+        # may arrive while this one is still being classified.
+        state.hands = [
+            HandLandmarks(points=h.points.copy(), handedness=h.handedness)
+            for h in detector.process(state.image)
+        ]
+        return state
+
+    def classify(state: FrameState) -> FrameState:
+        state.predictions = predict_hands(
+            model, device, state.hands, index_to_letter, temporal
+        )
+        if motion is not None:
+            state.motion = update_motion(motion, state.hands)
+        return state
+
+    throttle = throttle or RenderThrottle()
+    render = StageStats()
+    with Pipeline(capture, [("detect", detect), ("classify", classify)]) as pipe:
+        while True:
+            state = pipe.get(timeout=0.1)
+            if state is None:
+                if pipe.finished:
+                    break
+                continue
+
+            if throttle.due():
+                t0 = time.perf_counter()
+                frame = state.image
+                top = draw_frame(
+                    frame, state.hands, state.predictions, temporal, state.motion
+                )
+                draw_stage_overlay(
+                    frame,
+                    {**pipe.stats(), "render": render.as_dict()},
+                    1000.0 * (t0 - state.captured_at),
+                    top=top,
+                )
+                cv2.imshow(WINDOW_NAME, frame)
+                render.record(time.perf_counter() - t0)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord("q"):
+                break
+
+    for name, error in pipe.errors().items():
+        print(f"{name} stage failed: {error!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live ASL letter demo")
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Run capture, detection and classification on separate threads",
+    )
+    parser.add_argument(
+        "--max-hands",
+        type=int,
+        default=1,
+        help="Detect and classify up to this many hands per frame",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Classify every frame and show the unsmoothed prediction",
+    )
+    parser.add_argument(
+        "--motion-eps",
+        type=float,
+        default=MOTION_EPS,
+        help="Landmark movement (RMS joint distance) that triggers a new forward",
+    )
+    parser.add_argument(
+        "--motion",
+        action="store_true",
+        help="Also recognize the motion letters J and Z (needs a trained model)",
+    )
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="Only search around the previous frame's hand once one is found",
+    )
+    parser.add_argument(
+        "--detect-width",
+        type=int,
+        default=None,
+        help="Downscale full frames to this width before detection",
+    )
+    parser.add_argument(
+        "--display-fps",
+        type=float,
+        default=None,
+        help="Draw and show at most this many frames per second",
+    )
+    args = parser.parse_args()
+
+    index_to_letter = load_index_to_letter()
+    num_classes = len(index_to_letter)
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = load_model(device, num_classes)
+
+    motion = None
+    if args.motion:
+        if not MOTION_MODEL_PATH.exists():
+            parser.error(
+                f"No motion model at {MOTION_MODEL_PATH}; "
+                "train one with python -m src.train_motion"
+            )
+        # One frame at a time is too small to be worth a GPU round trip
+        motion = MotionStream(load_motion_model(MOTION_MODEL_PATH, "cpu"))
+
+    detector = MediaPipeHandDetector(
+        max_num_hands=args.max_hands, roi=args.roi, detect_width=args.detect_width
+    )
+    cap = cv2.VideoCapture(0)
+
+    print("Press 'q' to quit.")
+
+    temporal = None if args.raw else TemporalFilter(motion_eps=args.motion_eps)
+    run = run_pipelined if args.pipelined else run_serial
+    try:
+        run(
+            cap,
+            detector,
+            model,
+            device,
+            index_to_letter,
+            throttle=RenderThrottle(args.display_fps),
+            temporal=temporal,
+            motion=motion,
+        )
+    finally:
+        cap.release()
+        detector.close()
+        cv2.destroyAllWindows()
+
+    if temporal is not None:
+        stats = temporal.stats()
+        print(
+            f"Skipped {stats['skipped']} of "
+            f"{stats['skipped'] + stats['forwards']} forward passes "
+            f"({100.0 * stats['skipped_ratio']:.1f}%)"
+        )
 
 
 if __name__ == "__main__":
@@ -4,7 +4,10 @@ Unit tests for API
 
 import numpy as np
 import pytest
+import torch
 
+from models.model_motion import MotionClassifier
+from src import api, motion
 from src.api import app
 
 
@@ -116,3 +119,217 @@ def test_predict_points_non_numeric(client):
     data = resp.get_json()
     assert "error" in data
     assert "Could not convert 'points' to a float32 array" in data["error"]
+
+
+def test_predict_batch_happy_path(client):
+    """POST /predict/batch returns one prediction per entry, in order."""
+    batch = [np.zeros((21, 3), dtype=float).tolist() for _ in range(3)]
+
+    resp = client.post("/predict/batch", json={"batch": batch})
+    assert resp.status_code == 200
+
+    data = resp.get_json()
+    assert len(data["predictions"]) == 3
+    for pred in data["predictions"]:
+        assert isinstance(pred["letter"], str)
+        assert 0.0 <= pred["confidence"] <= 1.0
+
+
+def test_predict_batch_matches_single_predict(client):
+    """Batched predictions should agree with the single-sample endpoint."""
+    rng = np.random.default_rng(0)
+    batch = [rng.random((21, 3)).tolist() for _ in range(4)]
+
+    resp = client.post("/predict/batch", json={"batch": batch})
+    batched = resp.get_json()["predictions"]
+
+    for points, pred in zip(batch, batched):
+        single = client.post("/predict", json={"points": points}).get_json()
+        assert single["letter"] == pred["letter"]
+        assert np.isclose(single["confidence"], pred["confidence"], atol=1e-5)
+
+
+def test_predict_batch_reports_invalid_entries(client):
+    """Invalid entries get a per-entry error without failing the batch."""
+    good = np.zeros((21, 3), dtype=float).tolist()
+    bad = [[0.0, 0.0] for _ in range(21)]
+
+    resp = client.post("/predict/batch", json={"batch": [good, bad]})
+    assert resp.status_code == 200
+
+    preds = resp.get_json()["predictions"]
+    assert "letter" in preds[0]
+    assert "Expected 'points' shape (21, 3)" in preds[1]["error"]
+
+
+def test_predict_batch_missing_batch_field(client):
+    """POST /predict/batch without a 'batch' list should return 400."""
+    resp = client.post("/predict/batch", json={"points": []})
+    assert resp.status_code == 400
+    assert "Missing 'batch'" in resp.get_json()["error"]
+
+
+def test_predict_unchanged_hint_returns_cached_answer(client):
+    """A client that reports no motion gets its previous answer back."""
+    points = np.random.default_rng(1).random((21, 3)).tolist()
+
+    first = client.post(
+        "/predict", json={"points": points, "client_id": "tab-1"}
+    ).get_json()
+    assert first["cached"] is False
+
+    second = client.post(
+        "/predict",
+        json={"points": points, "client_id": "tab-1", "unchanged": True},
+    ).get_json()
+    assert second["cached"] is True
+    assert second["letter"] == first["letter"]
+    assert second["confidence"] == first["confidence"]
+
+
+def test_predict_unchanged_hint_without_cache_runs_model(client):
+    """The hint is ignored when there is no cached answer for the client."""
+    points = np.zeros((21, 3), dtype=float).tolist()
+
+    resp = client.post(
+        "/predict",
+        json={"points": points, "client_id": "never-seen", "unchanged": True},
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["cached"] is False
+
+
+def test_health_live_and_ready(client):
+    """Liveness and readiness both report healthy on an idle server."""
+    assert client.get("/health/live").status_code == 200
+
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200
+    assert resp.get_json()["status"] == "ready"
+
+
+def test_predict_sheds_load_when_saturated(client, monkeypatch):
+    """When the in-flight limit is reached, /predict fails fast with 503."""
+    monkeypatch.setattr(api.load_shedder, "max_in_flight", 0)
+
+    points = np.zeros((21, 3), dtype=float).tolist()
+    resp = client.post("/predict", json={"points": points})
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 1
+
+    ready = client.get("/health/ready")
+    assert ready.status_code == 503
+    assert ready.get_json()["status"] == "overloaded"
+
+    # Liveness is unaffected by overload
+    assert client.get("/health").status_code == 200
+
+
+def test_predict_hands_classifies_each_hand(client):
+    """A 'hands' request gets one tagged prediction per hand, in order."""
+    rng = np.random.default_rng(2)
+    hands = [
+        {"points": rng.random((21, 3)).tolist(), "handedness": "Left"},
+        {"points": rng.random((21, 3)).tolist(), "handedness": "Right"},
+    ]
+
+    resp = client.post("/predict", json={"hands": hands})
+    assert resp.status_code == 200
+
+    data = resp.get_json()
+    assert data["cached"] is False
+    assert [h["handedness"] for h in data["hands"]] == ["Left", "Right"]
+    for hand, pred in zip(hands, data["hands"]):
+        single = client.post("/predict", json={"points": hand["points"]}).get_json()
+        assert single["letter"] == pred["letter"]
+        assert np.isclose(single["confidence"], pred["confidence"], atol=1e-5)
+
+
+def test_predict_hands_rejects_invalid_hand(client):
+    """One malformed hand fails the request and names its index."""
+    good = {"points": np.zeros((21, 3)).tolist(), "handedness": "Left"}
+    bad = {"points": [[0.0, 0.0] for _ in range(21)]}
+
+    resp = client.post("/predict", json={"hands": [good, bad]})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"].startswith("hands[1]:")
+
+    assert client.post("/predict", json={"hands": []}).status_code == 400
+
+
+def test_predict_hands_unchanged_hint_returns_cached_hands(client):
+    """The cached answer for a multi-hand client keeps every hand."""
+    hands = [{"points": np.zeros((21, 3)).tolist(), "handedness": "Right"}]
+
+    first = client.post(
+        "/predict", json={"hands": hands, "client_id": "pair-1"}
+    ).get_json()
+    second = client.post(
+        "/predict", json={"hands": hands, "client_id": "pair-1", "unchanged": True}
+    ).get_json()
+    assert second["cached"] is True
+    assert second["hands"] == first["hands"]
+
+
+def test_predict_unchanged_hint_keeps_response_form(client):
+    """A cached "hands" answer is never served to a "points" request."""
+    points = np.zeros((21, 3)).tolist()
+    hands = [{"points": points, "handedness": "Right"}]
+
+    client.post("/predict", json={"hands": hands, "client_id": "switch-1"})
+    resp = client.post(
+        "/predict",
+        json={"points": points, "client_id": "switch-1", "unchanged": True},
+    ).get_json()
+
+    assert resp["cached"] is False
+    assert "letter" in resp and "hands" not in resp
+
+
+@pytest.fixture
+def motion_client(client, monkeypatch):
+    """Client whose /predict/stream uses an untrained motion model."""
+    torch.manual_seed(0)
+    model = MotionClassifier(
+        frame_dim=motion.FRAME_DIM, num_classes=len(motion.MOTION_CLASSES)
+    ).eval()
+    monkeypatch.setattr(api, "motion_streams", motion.MotionStreams(model))
+    return client
+
+
+def test_predict_stream_reports_motion_after_full_window(motion_client):
+    """Static predictions come back every frame, motion once the window fills."""
+    points = np.random.default_rng(3).random((21, 3)).tolist()
+    for i in range(motion.WINDOW):
+        data = motion_client.post(
+            "/predict/stream", json={"client_id": "cam-1", "points": points}
+        ).get_json()
+        assert isinstance(data["letter"], str)
+        assert data["frames"] == i + 1
+        assert (data["motion"] is None) == (i + 1 < motion.WINDOW)
+
+    assert data["motion"]["letter"] in motion.MOTION_CLASSES
+    assert 0.0 <= data["motion"]["confidence"] <= 1.0
+
+
+def test_predict_stream_no_hand_resets_window(motion_client):
+    """A frame without a hand clears the client's buffered frames."""
+    points = np.zeros((21, 3)).tolist()
+    for _ in range(3):
+        motion_client.post(
+            "/predict/stream", json={"client_id": "cam-2", "points": points}
+        )
+
+    data = motion_client.post(
+        "/predict/stream", json={"client_id": "cam-2", "points": None}
+    ).get_json()
+    assert data["letter"] is None
+    assert data["frames"] == 0
+    assert data["motion"] is None
+
+
+def test_predict_stream_requires_client_id(motion_client):
+    points = np.zeros((21, 3)).tolist()
+    resp = motion_client.post("/predict/stream", json={"points": points})
+    assert resp.status_code == 400
+    assert "client_id" in resp.get_json()["error"]
@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import torch
+
+import src.augment as aug
+import src.benchmarks as bm
+import src.train_mlp as tm
+
+
+def normalized_batch(n=16):
+    torch.manual_seed(0)
+    pts = torch.randn(n, 21, 3)
+    pts = pts - pts[:, :1]
+    pts = pts / pts.norm(dim=2).amax(dim=1, keepdim=True).unsqueeze(2)
+    return pts.reshape(n, 63)
+
+
+def test_rotation_matrices_are_orthonormal():
+    angles = torch.tensor([[0.1, -0.4, 1.2], [0.0, 0.0, math.pi / 2]])
+    R = aug.rotation_matrices(angles)
+
+    eye = torch.eye(3).expand(2, 3, 3)
+    torch.testing.assert_close(R @ R.transpose(1, 2), eye, atol=1e-6, rtol=0)
+    # 90 degrees about z maps x to y
+    torch.testing.assert_close(
+        R[1] @ torch.tensor([1.0, 0.0, 0.0]),
+        torch.tensor([0.0, 1.0, 0.0]),
+        atol=1e-6,
+        rtol=0,
+    )
+
+
+def test_augment_keeps_wrist_and_normalization():
+    X = normalized_batch()
+    config = aug.AugmentConfig(
+        rotation_deg=30, scale_jitter=0.2, joint_noise=0.05, mirror_prob=0.5
+    )
+
+    out = aug.augment_batch(X, config, torch.Generator().manual_seed(1))
+
+    pts = out.reshape(-1, 21, 3)
+    assert out.shape == X.shape
+    assert torch.all(pts[:, 0] == 0)
+    torch.testing.assert_close(pts.norm(dim=2).amax(dim=1), torch.ones(len(X)))
+    assert not torch.allclose(out, X)
+
+
+def test_rotation_only_preserves_joint_distances():
+    X = normalized_batch()
+    config = aug.AugmentConfig(rotation_deg=45, scale_jitter=0, joint_noise=0)
+
+    out = aug.augment_batch(X, config, torch.Generator().manual_seed(2))
+
+    torch.testing.assert_close(
+        out.reshape(-1, 21, 3).norm(dim=2), X.reshape(-1, 21, 3).norm(dim=2)
+    )
+
+
+def test_mirror_always_flips_x():
+    X = normalized_batch(4)
+    config = aug.AugmentConfig(0, 0, 0, mirror_prob=1.0)
+
+    out = aug.augment_batch(X, config).reshape(-1, 21, 3)
+
+    torch.testing.assert_close(out[..., 0], -X.reshape(-1, 21, 3)[..., 0])
+    torch.testing.assert_close(out[..., 1:], X.reshape(-1, 21, 3)[..., 1:])
+    assert not aug.AugmentConfig(0, 0, 0, 0).enabled()
+
+
+def test_fit_with_augmentation_reports_cost():
+    X, y = bm.synthetic_landmarks(200, num_classes=3)
+    config = aug.AugmentConfig(mirror_prob=0.5)
+
+    result = tm.fit(X, y, num_epochs=1, batch_size=32, augment=config, verbose=False)
+
+    assert result["metrics"]["augment_ms_per_batch"] > 0
+    plain = tm.fit(X, y, num_epochs=1, batch_size=32, verbose=False)
+    assert plain["metrics"]["augment_ms_per_batch"] == 0.0
+
+
+def test_bench_augmentation():
+    result = bm.bench_augmentation(batch_size=8, iters=3)
+    assert result["augment_ms"] > 0
+    assert result["train_step_ms"] > 0
@@ -0,0 +1,132 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+import src.batch_videos as bv
+import src.offline as off
+
+
+def make_videos(tmp_path, frames=(6, 3, 9)):
+    paths = []
+    for i, n in enumerate(frames):
+        paths.append(
+            off.write_synthetic_video(
+                tmp_path / "in" / f"clip{i}.avi", n_frames=n, width=64, height=48
+            )
+        )
+    return paths
+
+
+class NoHandDetector:
+    def process(self, frame):
+        return []
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_find_videos_and_largest_first(tmp_path):
+    videos = make_videos(tmp_path)
+    (tmp_path / "in" / "notes.txt").write_text("not a video")
+
+    found = bv.find_videos([tmp_path / "in", videos[0]])
+    assert found == sorted(videos)
+    assert bv.largest_first(found) == [videos[2], videos[0], videos[1]]
+
+
+def test_inline_run_retries_and_merges_in_input_order(tmp_path, monkeypatch):
+    videos = make_videos(tmp_path)
+    monkeypatch.setattr(off, "make_detector", lambda path: NoHandDetector())
+
+    real_process = off.process_source
+    failures = {"clip1.avi": 1}
+
+    def flaky(source, detector, classifier, batch_size=off.DEFAULT_BATCH_SIZE):
+        name = str(source).rsplit("/", 1)[-1]
+        if failures.get(name):
+            failures[name] -= 1
+            raise RuntimeError("transient")
+        return real_process(source, detector, classifier, batch_size)
+
+    monkeypatch.setattr(off, "process_source", flaky)
+    summary = bv.run_batch([tmp_path / "in"], tmp_path / "out", workers=1, retries=1)
+
+    assert summary["files"] == 3 and not summary["failed"]
+    assert summary["frames"] == 18
+
+    columns, meta = off.read_columns(summary["merged"])
+    assert [s.rsplit("/", 1)[-1] for s in meta["sources"]] == [
+        "clip0.avi",
+        "clip1.avi",
+        "clip2.avi",
+    ]
+    assert np.bincount(columns["source"]).tolist() == [6, 3, 9]
+    assert columns["frame"][columns["source"] == 2].tolist() == list(range(9))
+
+
+def test_inline_run_gives_up_after_retries(tmp_path, monkeypatch):
+    bad = tmp_path / "in" / "bad.mp4"
+    bad.parent.mkdir()
+    bad.write_bytes(b"not really a video")
+    monkeypatch.setattr(off, "make_detector", lambda path: NoHandDetector())
+
+    summary = bv.run_batch([bad], tmp_path / "out", workers=1, retries=2)
+
+    assert summary["files"] == 0
+    assert list(summary["failed"]) == [str(bad)]
+    assert summary["merged"] is None
+
+
+def test_pool_run_processes_every_file(tmp_path):
+    videos = make_videos(tmp_path, frames=(4, 2))
+    bad = tmp_path / "in" / "bad.mp4"
+    bad.write_bytes(b"not really a video")
+
+    summary = bv.run_batch([tmp_path / "in"], tmp_path / "out", workers=2, retries=1)
+
+    assert summary["files"] == 2
+    assert list(summary["failed"]) == [str(bad)]
+    assert summary["frames"] == 6
+    assert sum(w["files"] for w in summary["workers"].values()) == 2
+    columns, meta = off.read_columns(summary["merged"])
+    assert meta["sources"] == [str(v) for v in videos]
+    assert len(columns["frame"]) == 6
+
+
+def crash_on_bad_file(index, source, out_dir):
+    """Pool task that kills its worker process on any file named bad*."""
+    if Path(source).name.startswith("bad"):
+        os._exit(1)
+    return {
+        "index": index,
+        "source": source,
+        "part": str(Path(out_dir) / f"{index}.npz"),
+        "pid": os.getpid(),
+        "frames": 1,
+        "hands": 0,
+        "seconds": 0.01,
+        "fps": 100.0,
+    }
+
+
+def test_pool_crash_only_charges_the_crashing_file(tmp_path):
+    jobs = [(i, Path(f"clip{i}.avi")) for i in range(5)]
+    jobs.insert(1, (5, Path("bad.avi")))
+    progress = bv.Progress(len(jobs))
+
+    results = bv._run_pool(  # pylint: disable=protected-access
+        jobs,
+        tmp_path,
+        off.MODEL_PATH,
+        workers=2,
+        retries=1,
+        progress=progress,
+        task=crash_on_bad_file,
+    )
+
+    assert sorted(r["index"] for r in results) == [0, 1, 2, 3, 4]
+    assert list(progress.failed) == ["bad.avi"]
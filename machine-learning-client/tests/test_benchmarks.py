@@ -0,0 +1,56 @@
+import src.benchmarks as bm
+
+
+def test_synthetic_landmarks_shapes():
+    X, y = bm.synthetic_landmarks(50, num_classes=4)
+    assert X.shape == (50, 63)
+    assert y.shape == (50,)
+    assert int(y.max()) < 4
+
+
+def test_bench_training_loops_reports_each_loop(capsys):
+    results = bm.bench_training_loops(n_samples=64, num_classes=3, epochs=1)
+
+    assert set(results) == {"tensor", "dataloader"}
+    for row in results.values():
+        assert row["samples_per_sec"] > 0
+
+    bm.print_results("training", results, baseline="dataloader")
+    assert "vs dataloader" in capsys.readouterr().out
+
+
+def test_bench_detector_overhead_reports_both_variants():
+    results = bm.bench_detector_overhead(width=32, height=24, n_hands=2, iters=2)
+    assert set(results) == {"allocating", "buffered"}
+    assert all(row["us_per_frame"] > 0 for row in results.values())
+
+
+def test_bench_offline_runs_the_real_detector():
+    result = bm.bench_offline(n_frames=5, width=64, height=48)
+    assert result["frames"] == 5
+    assert result["fps"] > 0
+
+
+def test_bench_detector_input_size_reports_each_mode():
+    results = bm.bench_detector_input_size(
+        width=320, height=240, detect_width=160, roi_side=100, iters=1
+    )
+    assert set(results) == {"full", "downscaled", "roi_crop"}
+
+
+def test_bench_multi_hand_reports_both_variants():
+    results = bm.bench_multi_hand(n_hands=2, num_classes=3, iters=2)
+    assert set(results) == {"per_hand", "batched"}
+    assert all(row["frames_per_sec"] > 0 for row in results.values())
+
+
+def test_bench_temporal_skips_forwards_on_held_poses():
+    results = bm.bench_temporal(n_frames=60)
+    assert results["per_frame"]["forwards"] == 60
+    assert results["temporal"]["forwards"] < 60
+
+
+def test_bench_motion_reports_budget_for_each_variant():
+    results = bm.bench_motion(window=12, iters=3)
+    assert set(results) == {"recompute", "incremental", "static_mlp"}
+    assert all(row["budget_pct"] > 0 for row in results.values())
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+import torch
+
+import src.cross_validate as cv
+
+
+def make_data(n=90, num_classes=3):
+    torch.manual_seed(0)
+    centers = torch.randn(num_classes, 63) * 3
+    y = torch.arange(n) % num_classes
+    return centers[y] + 0.1 * torch.randn(n, 63), y
+
+
+def test_stratified_folds_partition_and_balance():
+    y = np.array([0] * 10 + [1] * 5 + [2] * 3)
+    folds = cv.stratified_folds(y, k=3, seed=1)
+
+    all_idx = np.concatenate(folds)
+    assert sorted(all_idx.tolist()) == list(range(len(y)))
+    for fold in folds:
+        counts = np.bincount(y[fold], minlength=3)
+        assert 3 <= counts[0] <= 4
+        assert counts[2] == 1
+    assert max(map(len, folds)) - min(map(len, folds)) <= 1
+
+    again = cv.stratified_folds(y, k=3, seed=1)
+    assert all(np.array_equal(a, b) for a, b in zip(folds, again))
+    with pytest.raises(ValueError):
+        cv.stratified_folds(y, k=1)
+
+
+def test_summarize_builds_confusion_matrix():
+    y = np.array([0, 0, 1, 1])
+    results = [
+        {
+            "fold": 0,
+            "val_idx": np.array([0, 2]),
+            "preds": np.array([0, 0]),
+            "val_acc": 0.5,
+        },
+        {
+            "fold": 1,
+            "val_idx": np.array([1, 3]),
+            "preds": np.array([0, 1]),
+            "val_acc": 1.0,
+        },
+    ]
+
+    summary = cv.summarize(y, results, num_classes=3)
+
+    assert summary["confusion_matrix"] == [[2, 0, 0], [1, 1, 0], [0, 0, 0]]
+    assert summary["per_class_accuracy"] == [1.0, 0.5, None]
+    assert summary["accuracy"] == 0.75
+    assert summary["fold_accuracy_mean"] == 0.75
+
+
+def test_cross_validate_caches_by_dataset_and_config(tmp_path):
+    X, y = make_data()
+
+    first = cv.cross_validate(
+        X, y, k=3, workers=1, cache_dir=tmp_path, num_epochs=2, batch_size=16
+    )
+    assert first["cached"] is False
+    assert len(first["fold_accuracy"]) == 3
+    assert first["accuracy"] > 0.9
+    assert np.array(first["confusion_matrix"]).sum() == len(y)
+
+    second = cv.cross_validate(
+        X, y, k=3, workers=1, cache_dir=tmp_path, num_epochs=2, batch_size=16
+    )
+    assert second["cached"] is True
+    assert second["confusion_matrix"] == first["confusion_matrix"]
+
+    # Different data is a different cache entry
+    third = cv.cross_validate(
+        X + 1, y, k=3, workers=1, cache_dir=tmp_path, num_epochs=2, batch_size=16
+    )
+    assert third["cached"] is False
+
+    report = cv.format_report(first, {"0": "A", "1": "B", "2": "C"})
+    assert "Confusion matrix" in report
+
+
+def test_cross_validate_parallel_matches_inline():
+    X, y = make_data(n=60)
+    kwargs = {"k": 2, "cache_dir": None, "num_epochs": 1, "batch_size": 16}
+
+    inline = cv.cross_validate(X, y, workers=1, **kwargs)
+    parallel = cv.cross_validate(X, y, workers=2, **kwargs)
+
+    assert parallel["confusion_matrix"] == inline["confusion_matrix"]
+    assert not X.is_shared()
+
+
+def test_held_out_fold_is_not_used_for_model_selection(monkeypatch):
+    X, y = make_data(n=60)
+    fit = cv.train_mlp.fit
+    seen = []
+
+    def recording_fit(X_train, y_train, **kwargs):
+        seen.append((X_train.clone(), kwargs))
+        return fit(X_train, y_train, **kwargs)
+
+    monkeypatch.setattr(cv.train_mlp, "fit", recording_fit)
+    record = cv.cross_validate(
+        X, y, k=3, workers=1, cache_dir=None, num_epochs=2, batch_size=16
+    )
+
+    folds = cv.stratified_folds(y.numpy(), k=3)
+    for fold, (X_train, kwargs) in zip(folds, seen):
+        assert "val" not in kwargs
+        assert kwargs["val_split"] == cv.INNER_VAL_SPLIT
+        assert len(X_train) == len(y) - len(fold)
+        held_out = X[torch.from_numpy(fold)]
+        assert not (X_train[:, None] == held_out[None]).all(dim=2).any()
+    # Fold accuracies are scored on the held-out predictions themselves
+    weighted = sum(a * len(f) for a, f in zip(record["fold_accuracy"], folds))
+    assert weighted / len(y) == pytest.approx(record["accuracy"])
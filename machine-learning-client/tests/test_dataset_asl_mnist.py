@@ -169,3 +169,68 @@ def test_aslmnistdataset_getitem_with_no_landmarks(monkeypatch):
     assert X.shape == (63,)
     assert np.allclose(X, np.zeros((63,), dtype=np.float32))
     assert label in (0, 1)
+
+
+# -----------------------------
+# LandmarkCache tests
+# -----------------------------
+def patch_dummy_dataset(monkeypatch, extract_calls):
+    monkeypatch.setattr(
+        dsm, "load_asl_mnist_with_retries", lambda split="train": DummyHFDS()
+    )
+    monkeypatch.setattr(
+        dsm,
+        "load_label_maps",
+        lambda label_map_path=None: (
+            {0: "A", 1: "B"},
+            {"A": 0, "B": 1},
+            {10: 0, 11: 1},
+        ),
+    )
+
+    def fake_extract_landmarks(self, pil_img):
+        extract_calls.append(1)
+        if len(extract_calls) % 2 == 0:
+            return None
+        pts = np.zeros((21, 3), dtype=np.float32)
+        pts[1] = np.array([2.0, 0.0, 0.0], dtype=np.float32)
+        return pts
+
+    monkeypatch.setattr(ASLMNISTDataset, "_extract_landmarks", fake_extract_landmarks)
+
+
+def test_cached_dataset_runs_mediapipe_once(tmp_path, monkeypatch):
+    """The second epoch reads features from the cache instead of MediaPipe."""
+    calls = []
+    patch_dummy_dataset(monkeypatch, calls)
+
+    ds = ASLMNISTDataset(split="train", cache_dir=tmp_path)
+    first_epoch = [ds[i] for i in range(len(ds))]
+    assert len(calls) == 2
+
+    # A new dataset object (e.g. a new training run) reuses the disk cache
+    ds_again = ASLMNISTDataset(split="train", cache_dir=tmp_path)
+    second_epoch = [ds_again[i] for i in range(len(ds_again))]
+    assert len(calls) == 2
+
+    for (x1, y1), (x2, y2) in zip(first_epoch, second_epoch):
+        np.testing.assert_array_equal(x1, x2)
+        assert y1 == y2
+
+    assert ds_again.cache.num_cached() == 2
+    assert ds_again.cache.no_hand_mask().tolist() == [False, True]
+
+
+def test_cache_invalidated_when_fingerprint_changes(tmp_path):
+    cache = dsm.LandmarkCache(tmp_path, "train", 2, fingerprint="a")
+    cache.put(0, np.ones(63, dtype=np.float32), 1)
+    cache.flush()
+    del cache
+
+    same = dsm.LandmarkCache(tmp_path, "train", 2, fingerprint="a")
+    assert same.get(0)[1] == 1
+    del same
+
+    changed = dsm.LandmarkCache(tmp_path, "train", 2, fingerprint="b")
+    assert changed.get(0) is None
+    assert changed.num_cached() == 0
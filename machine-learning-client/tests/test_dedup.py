@@ -0,0 +1,69 @@
+import numpy as np
+
+import src.dedup as dd
+from src.landmark_store import LandmarkStore
+
+
+def pose(value):
+    return np.full(63, value, dtype=np.float32)
+
+
+def test_pose_distances_is_rms_joint_distance():
+    a = np.zeros(63, dtype=np.float32)
+    b = np.zeros((2, 63), dtype=np.float32)
+    b[1, 0:3] = [3.0, 4.0, 0.0]  # one joint moved by 5
+
+    np.testing.assert_allclose(dd.pose_distances(a, b), [0.0, np.sqrt(25 / 21)])
+
+
+def test_recent_filter_skips_near_duplicates_per_label():
+    recent = dd.RecentSampleFilter(eps=0.05, window=2)
+
+    assert recent.accept(pose(0.0), 0)
+    assert not recent.accept(pose(0.01), 0)
+    # Same pose under a different label is kept
+    assert recent.accept(pose(0.0), 1)
+    assert recent.accept(pose(0.5), 0)
+    assert recent.accept(pose(1.0), 0)
+    # pose(0.0) has fallen out of the two-sample window
+    assert recent.accept(pose(0.0), 0)
+
+    assert recent.accepted == 5
+    assert recent.skipped == 1
+
+
+def test_deduplicate_reports_per_class_reduction():
+    X = np.stack([pose(0.0), pose(0.001), pose(0.5), pose(0.0), pose(0.002)])
+    y = np.array([0, 0, 0, 1, 1])
+
+    keep, report = dd.deduplicate(X, y, eps=0.01)
+
+    assert keep.tolist() == [True, False, True, True, False]
+    assert report == {0: {"before": 3, "after": 2}, 1: {"before": 2, "after": 1}}
+    table = dd.format_report(report, {"0": "A", "1": "B"})
+    assert "A" in table and "total" in table
+
+
+def test_apply_dedup_rewrites_store(tmp_path):
+    store = LandmarkStore(tmp_path)
+    store.append(np.stack([pose(0.0), pose(0.0)]), np.array([0, 0]))
+    store.append(np.stack([pose(1.0)]), np.array([0]))
+
+    X, y = np.asarray(store.load()[0]), np.asarray(store.load()[1])
+    keep, _ = dd.deduplicate(X, y)
+    dd.apply_dedup(tmp_path, X, y, keep)
+
+    assert len(store.shards) == 1
+    assert len(store) == 2
+
+
+def test_apply_dedup_rewrites_npz(tmp_path):
+    path = tmp_path / "data.npz"
+    X = np.stack([pose(0.0), pose(0.0), pose(1.0)])
+    y = np.array([0, 0, 0])
+    np.savez(path, X=X, y=y)
+
+    keep, _ = dd.deduplicate(X, y)
+    dd.apply_dedup(path, X, y, keep)
+
+    assert len(np.load(path)["y"]) == 2
@@ -0,0 +1,62 @@
+"""
+Tests for exporting LandmarkMLP to the browser format
+"""
+
+import json
+
+import numpy as np
+import pytest
+import torch
+
+from models.model_MLP import LandmarkMLP
+import src.export_browser_model as ebm
+
+
+@pytest.fixture
+def small_model(tmp_path):
+    """Save a small LandmarkMLP and a matching label map."""
+    model = LandmarkMLP(input_dim=63, num_classes=3, hidden_dim=16, num_blocks=1)
+    model_path = tmp_path / "model.pt"
+    torch.save(model.state_dict(), model_path)
+
+    label_map_path = tmp_path / "label_map.json"
+    label_map_path.write_text(
+        json.dumps({"index_to_letter": {"0": "A", "1": "B", "2": "C"}})
+    )
+    return model, model_path, label_map_path
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_export_roundtrip(small_model, tmp_path, dtype):
+    model, model_path, label_map_path = small_model
+    out = ebm.export_browser_model(
+        model_path, label_map_path, tmp_path / "model.bin", dtype=dtype
+    )
+
+    header, tensors = ebm.read_browser_model(out)
+
+    assert header["labels"] == ["A", "B", "C"]
+    assert header["hidden_dim"] == 16
+    assert header["num_blocks"] == 1
+    assert header["num_classes"] == 3
+    assert header["dtype"] == dtype
+
+    atol = 1e-6 if dtype == "float32" else 1e-3
+    for name, tensor in model.state_dict().items():
+        np.testing.assert_allclose(tensors[name], tensor.numpy(), atol=atol)
+
+
+def test_export_rejects_label_mismatch(small_model, tmp_path):
+    _, model_path, label_map_path = small_model
+    label_map_path.write_text(json.dumps({"index_to_letter": {"0": "A"}}))
+
+    with pytest.raises(ValueError):
+        ebm.export_browser_model(model_path, label_map_path, tmp_path / "m.bin")
+
+
+def test_read_rejects_other_files(tmp_path):
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"NOPE" + b"\0" * 16)
+
+    with pytest.raises(ValueError):
+        ebm.read_browser_model(bad)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import src.benchmarks as bm
+import src.features as feat
+from src.mediapipe_utils import normalize_landmarks
+
+
+def random_hands(n=8, seed=0):
+    return np.random.default_rng(seed).random((n, 21, 3), dtype=np.float32)
+
+
+def test_batch_matches_single_hand_normalization():
+    pts = random_hands()
+    batch = feat.normalize_landmarks_batch(pts)
+
+    expected = np.stack([normalize_landmarks(p) for p in pts])
+    assert batch.shape == (8, 63)
+    assert batch.dtype == np.float32
+    np.testing.assert_allclose(batch, expected, atol=1e-6)
+
+    hands = batch.reshape(8, 21, 3)
+    assert np.allclose(hands[:, 0], 0.0)
+    np.testing.assert_allclose(np.linalg.norm(hands, axis=2).max(axis=1), 1.0)
+
+
+def test_batch_writes_into_out_and_handles_degenerate_hands():
+    pts = random_hands(3)
+    pts[1] = 0.5  # every joint in the same place
+    out = np.full((3, 63), np.nan, dtype=np.float32)
+
+    result = feat.normalize_landmarks_batch(pts, out=out)
+
+    assert result is out
+    assert np.all(out[1] == 0.0)
+    assert not np.isnan(out).any()
+
+
+def test_batch_can_normalize_in_place():
+    pts = random_hands(4)
+    expected = feat.normalize_landmarks_batch(pts)
+
+    flat = pts.reshape(4, 63)
+    feat.normalize_landmarks_batch(pts, out=flat)
+    np.testing.assert_allclose(flat, expected, atol=1e-6)
+
+
+def test_batch_rejects_bad_shapes():
+    with pytest.raises(ValueError):
+        feat.normalize_landmarks_batch(np.zeros((2, 20, 3), dtype=np.float32))
+    with pytest.raises(ValueError):
+        feat.normalize_landmarks_batch(
+            random_hands(2), out=np.empty((2, 63), dtype=np.float64)
+        )
+
+
+def test_engineered_features_on_straight_finger():
+    pts = np.zeros((1, 21, 3), dtype=np.float32)
+    # Fingers laid out straight along x, each one step further up in y
+    for finger, chain in enumerate(feat.FINGER_CHAINS):
+        for step, joint in enumerate(chain[1:], start=1):
+            pts[0, joint] = [step, finger, 0.0]
+
+    features = feat.build_features(pts, engineered=True)
+    assert features.shape == (1, feat.feature_dim(engineered=True))
+
+    engineered = features[0, feat.LANDMARK_DIM :]
+    distances = engineered[: len(feat.TIP_PAIRS)]
+    angles = engineered[len(feat.TIP_PAIRS) :]
+
+    scale = np.linalg.norm(pts[0], axis=1).max()
+    # Thumb tip (4, 0) to index tip (4, 1)
+    assert distances[0] == pytest.approx(1.0 / scale, rel=1e-5)
+    # The wrist is off-axis for every finger but the thumb; joints past the
+    # first knuckle are straight everywhere.
+    straight = angles.reshape(5, 3)[:, 1:]
+    np.testing.assert_allclose(straight, np.pi, atol=1e-3)
+    assert angles[0] == pytest.approx(np.pi, abs=1e-3)
+
+
+def test_build_features_without_engineered_matches_normalize():
+    pts = random_hands(5)
+    np.testing.assert_array_equal(
+        feat.build_features(pts), feat.normalize_landmarks_batch(pts)
+    )
+
+
+def test_bench_features_reports_each_variant():
+    results = bm.bench_features(n_hands=32, iters=1)
+    assert set(results) == {"per_hand", "batch", "batch_out", "engineered"}
+    assert all(row["hands_per_sec"] > 0 for row in results.values())
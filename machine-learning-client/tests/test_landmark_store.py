@@ -0,0 +1,144 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+import src.landmark_store as ls
+
+
+def make_batch(n, label, fill=0.0):
+    return np.full((n, 63), fill, dtype=np.float32), np.full((n,), label)
+
+
+def test_append_creates_shards_and_manifest(tmp_path):
+    store = ls.LandmarkStore(tmp_path / "store")
+
+    assert store.append(*make_batch(3, 0)) == "shard_00000"
+    assert store.append(*make_batch(2, 1)) == "shard_00001"
+    assert store.append(np.zeros((0, 63)), np.zeros((0,))) is None
+
+    manifest = json.loads((store.root / "manifest.json").read_text())
+    assert [s["num_samples"] for s in manifest["shards"]] == [3, 2]
+    assert len(store) == 5
+
+
+def test_load_presents_one_view(tmp_path):
+    store = ls.LandmarkStore(tmp_path)
+    store.append(*make_batch(3, 0, fill=0.0))
+    store.append(*make_batch(2, 1, fill=1.0))
+
+    X, y = store.load()
+
+    assert X.shape == (5, 63)
+    assert y.shape == (5,)
+    assert y[3] == 1
+    assert y[-1] == 1
+    np.testing.assert_array_equal(X[2], np.zeros(63))
+    np.testing.assert_array_equal(X[[0, 4]][:, 0], [0.0, 1.0])
+    np.testing.assert_array_equal(y[1:4], [0, 0, 1])
+    np.testing.assert_array_equal(np.asarray(y), [0, 0, 0, 1, 1])
+    with pytest.raises(IndexError):
+        X[5]  # pylint: disable=pointless-statement
+
+
+def test_unpublished_shard_is_ignored(tmp_path):
+    """A shard written without a manifest update (crash) is never read."""
+    store = ls.LandmarkStore(tmp_path)
+    store.append(*make_batch(2, 0))
+    np.save(tmp_path / "shard_00001_X.npy", np.ones((4, 63), dtype=np.float32))
+
+    X, _ = store.load()
+    assert len(X) == 2
+
+
+def test_compact_merges_shards(tmp_path):
+    store = ls.LandmarkStore(tmp_path)
+    for label in range(3):
+        store.append(*make_batch(2, label))
+
+    shard_id = store.compact()
+
+    assert [s["id"] for s in store.shards] == [shard_id]
+    X, y = store.load()
+    assert X.shape == (6, 63)
+    np.testing.assert_array_equal(np.asarray(y), [0, 0, 1, 1, 2, 2])
+    assert sorted(p.name for p in tmp_path.glob("*.npy")) == [
+        f"{shard_id}_X.npy",
+        f"{shard_id}_y.npy",
+    ]
+    assert store.compact() is None
+
+
+def test_compact_empty_store_is_a_no_op(tmp_path):
+    missing = ls.LandmarkStore(tmp_path / "missing")
+    assert missing.compact() is None
+    assert not missing.root.exists()
+
+    store = ls.LandmarkStore(tmp_path / "empty")
+    store.root.mkdir()
+    store._write_manifest(  # pylint: disable=protected-access
+        {"version": ls.STORE_FORMAT_VERSION, "next_id": 0, "shards": []}
+    )
+    assert store.compact() is None
+    assert store.shards == []
+    assert not list(store.root.glob("*.npy"))
+
+
+def test_merge_replaces_listed_shards_in_place(tmp_path):
+    store = ls.LandmarkStore(tmp_path)
+    ids = [store.append(*make_batch(1, label)) for label in range(4)]
+
+    shard_id = store.merge([ids[1], ids[3]], source="webcam")
+
+    assert [s["id"] for s in store.shards] == [ids[0], shard_id, ids[2]]
+    np.testing.assert_array_equal(np.asarray(store.load()[1]), [0, 1, 3, 2])
+    assert not (tmp_path / f"{ids[1]}_X.npy").exists()
+    assert store.merge([shard_id], source="webcam") is None
+    with pytest.raises(ValueError):
+        store.merge([ids[0], ids[1]], source="webcam")
+
+
+def test_concurrent_appends_and_compact_keep_every_shard(tmp_path):
+    """Writers on separate handles serialise on the manifest lock."""
+
+    def writer(label):
+        store = ls.LandmarkStore(tmp_path)
+        for _ in range(10):
+            store.append(*make_batch(1, label))
+
+    def compactor():
+        store = ls.LandmarkStore(tmp_path)
+        for _ in range(5):
+            store.compact()
+
+    threads = [threading.Thread(target=writer, args=(label,)) for label in range(4)]
+    threads.append(threading.Thread(target=compactor))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = ls.LandmarkStore(tmp_path)
+    assert len(store) == 40
+    np.testing.assert_array_equal(
+        np.bincount(np.asarray(store.load()[1])), [10, 10, 10, 10]
+    )
+
+
+def test_load_landmarks_accepts_store_or_npz(tmp_path):
+    npz = tmp_path / "legacy.npz"
+    X_old, y_old = make_batch(3, 4)
+    np.savez(npz, X=X_old, y=y_old)
+
+    X, y = ls.load_landmarks(npz)
+    np.testing.assert_array_equal(y, y_old)
+
+    store = ls.LandmarkStore(tmp_path / "store")
+    store.import_npz(npz)
+    store.append(*make_batch(1, 5))
+
+    X, y = ls.load_landmarks(store.root)
+    assert isinstance(X, np.ndarray)
+    assert X.shape == (4, 63)
+    np.testing.assert_array_equal(y, [4, 4, 4, 5])
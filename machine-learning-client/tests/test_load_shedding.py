@@ -0,0 +1,60 @@
+"""
+Tests for API load shedding
+"""
+
+import pytest
+
+from src.load_shedding import LoadShedder
+
+
+def test_caps_requests_in_flight():
+    shedder = LoadShedder(max_in_flight=2, latency_slo_ms=1e9)
+
+    assert shedder.try_enter()
+    assert shedder.try_enter()
+    assert not shedder.try_enter()
+    assert shedder.is_overloaded()
+
+    shedder.leave()
+    assert shedder.try_enter()
+    assert shedder.stats()["shed"] == 1
+
+
+def test_sheds_when_expected_delay_exceeds_slo():
+    shedder = LoadShedder(max_in_flight=100, latency_slo_ms=250)
+
+    # Teach the shedder that a forward pass takes 100 ms
+    assert shedder.try_enter()
+    shedder.record_service(0.1)
+    shedder.leave()
+
+    # Two queued requests => 200 ms expected wait, still within budget
+    assert shedder.try_enter()
+    assert shedder.try_enter()
+    # A third => 300 ms expected wait, so the next one is shed
+    assert shedder.try_enter()
+    assert not shedder.try_enter()
+    assert shedder.retry_after() == 1
+
+
+def test_service_time_is_smoothed():
+    shedder = LoadShedder(ewma_alpha=0.5)
+
+    shedder.record_service(0.2)
+    shedder.record_service(0.1)
+
+    assert shedder.stats()["service_time_ms"] == 150.0
+
+
+def test_expected_delay_is_linear_in_queue_length():
+    shedder = LoadShedder(max_in_flight=100, latency_slo_ms=1e9)
+    shedder.record_service(0.01)
+    for _ in range(10):
+        assert shedder.try_enter()
+
+    # Requests drain one 10 ms forward at a time; the wait before each
+    # forward is not service time, so the estimate stays in_flight * 10 ms
+    for remaining in range(10, 0, -1):
+        assert shedder.stats()["expected_delay_ms"] == pytest.approx(10.0 * remaining)
+        shedder.record_service(0.01)
+        shedder.leave()
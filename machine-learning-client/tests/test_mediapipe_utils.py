@@ -3,6 +3,7 @@
 import numpy as np
 import pytest
 
+import src.benchmarks as bm
 import src.mediapipe_utils as mpu
 from src.mediapipe_utils import (
     HandLandmarks,
@@ -40,31 +41,56 @@ def test_draw_hand_landmarks_on_frame(monkeypatch):
     pts = np.stack([np.linspace(0, 1, 21), np.linspace(0, 1, 21), np.zeros(21)], axis=1)
     hand = HandLandmarks(points=pts.astype(np.float32), handedness="Right")
 
-    calls = {"line": 0, "circle": 0, "text": 0}
+    calls = {"polylines": [], "text": 0}
 
-    def fake_line(img, p1, p2, color, thickness):
-        calls["line"] += 1
-        return img
-
-    def fake_circle(img, center, radius, color, thickness):
-        calls["circle"] += 1
+    def fake_polylines(img, lines, is_closed, color, thickness):
+        calls["polylines"].append(lines)
         return img
 
     def fake_puttext(img, text, org, font, font_scale, color, thickness):
         calls["text"] += 1
         return img
 
-    monkeypatch.setattr(mpu.cv2, "line", fake_line)
-    monkeypatch.setattr(mpu.cv2, "circle", fake_circle)
+    monkeypatch.setattr(mpu.cv2, "polylines", fake_polylines)
     monkeypatch.setattr(mpu.cv2, "putText", fake_puttext)
 
     mpu.draw_hand_landmarks_on_frame(frame, hand)
 
-    assert calls["circle"] == 21
-    assert calls["line"] >= 1
+    assert len(calls["polylines"]) == 2
+    bones, joints = calls["polylines"][0], calls["polylines"][1]
+    assert bones.shape == (len(mpu.HAND_CONNECTIONS), 2, 2)
+    assert joints.shape == (21, 2, 2)
+    assert bones.dtype == np.int32
+    assert joints[20, 0].tolist() == [w, h]
     assert calls["text"] == 1
 
 
+def test_draw_matches_per_call_rendering():
+    pts = np.random.default_rng(3).random((21, 3), dtype=np.float32)
+    hand = HandLandmarks(points=pts, handedness="Left")
+    expected = np.zeros((120, 160, 3), dtype=np.uint8)
+    actual = expected.copy()
+
+    bm.draw_hand_per_call(expected, hand)
+    mpu.draw_hand_landmarks_on_frame(actual, hand)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_render_throttle_caps_rate():
+    now = [0.0]
+    throttle = mpu.RenderThrottle(max_fps=10, clock=lambda: now[0])
+
+    drawn = []
+    for i in range(30):  # 30 frames at 30 fps
+        now[0] = i / 30
+        drawn.append(throttle.due())
+
+    assert sum(drawn) == 10
+    assert throttle.skipped == 20
+    assert all(mpu.RenderThrottle().due() for _ in range(3))
+
+
 def test_mediapipe_hand_detector_process(monkeypatch):
     class FakeLm:
         def __init__(self, x, y, z):
@@ -125,3 +151,158 @@ def test_mediapipe_hand_detector_process(monkeypatch):
     assert hand.handedness == "Right"
 
     detector.close()
+
+
+def test_detector_reuses_rgb_and_landmark_buffers(monkeypatch):
+    class FakeHands:
+        def __init__(self, **kwargs):
+            self.frames = []
+
+        def process(self, frame_rgb):
+            self.frames.append(frame_rgb)
+            return type("R", (), {"multi_hand_landmarks": None})()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(mpu.mp_hands, "Hands", FakeHands)
+    detector = MediaPipeHandDetector(max_num_hands=2)
+    assert detector.landmarks.shape == (2, 21, 3)
+
+    frame = np.zeros((10, 20, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # blue in BGR
+    detector.process(frame)
+    detector.process(frame)
+    first, second = detector.hands.frames
+    assert first.__array_interface__["data"] == second.__array_interface__["data"]
+    assert np.all(first[..., 2] == 255)
+
+    detector.process(np.zeros((5, 5, 3), dtype=np.uint8))
+    assert detector.hands.frames[-1].shape == (5, 5, 3)
+
+
+def test_detector_points_are_views_into_landmark_buffer(monkeypatch):
+    class Lm:
+        def __init__(self, x):
+            self.x, self.y, self.z = x, 2 * x, 0.5
+
+    class Hand:
+        def __init__(self, offset):
+            self.landmark = [Lm(offset + i) for i in range(21)]
+
+    class Handedness:
+        def __init__(self, label):
+            self.classification = [type("C", (), {"label": label})()]
+
+    class FakeHands:
+        def __init__(self, **kwargs):
+            pass
+
+        def process(self, frame_rgb):
+            return type(
+                "R",
+                (),
+                {
+                    "multi_hand_landmarks": [Hand(0), Hand(100), Hand(200)],
+                    "multi_handedness": [Handedness("Left")] * 3,
+                },
+            )()
+
+    monkeypatch.setattr(mpu.mp_hands, "Hands", FakeHands)
+    detector = MediaPipeHandDetector(max_num_hands=2)
+    hands = detector.process(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    assert len(hands) == 2
+    assert np.shares_memory(hands[1].points, detector.landmarks)
+    assert hands[1].points[3].tolist() == [103.0, 206.0, 0.5]
+
+
+class ScriptedHands:
+    """Returns one hand at fixed image-normalized coords, or none when told."""
+
+    def __init__(self, **kwargs):
+        self.shapes = []
+        self.find = []
+        self.resets = []
+
+    def reset(self):
+        self.resets.append(len(self.shapes))
+
+    def process(self, frame_rgb):
+        self.shapes.append(frame_rgb.shape)
+        found = self.find.pop(0) if self.find else True
+
+        class Lm:
+            def __init__(self, i):
+                self.x = 0.4 + 0.01 * i
+                self.y = 0.5 - 0.01 * i
+                self.z = -0.1
+
+        hand = type("H", (), {"landmark": [Lm(i) for i in range(21)]})()
+        label = type("C", (), {"label": "Right"})()
+        handed = type("D", (), {"classification": [label]})()
+        return type(
+            "R",
+            (),
+            {
+                "multi_hand_landmarks": [hand] if found else None,
+                "multi_handedness": [handed] if found else None,
+            },
+        )()
+
+
+def test_roi_mode_crops_maps_back_and_falls_back(monkeypatch):
+    monkeypatch.setattr(mpu.mp_hands, "Hands", ScriptedHands)
+    detector = MediaPipeHandDetector(roi=True, roi_margin=0.5)
+    frame = np.zeros((200, 400, 3), dtype=np.uint8)
+
+    first = detector.process(frame)[0].points.copy()
+    assert detector.hands.shapes[-1] == (200, 400, 3)
+    x0, y0, x1, y1 = detector.roi_box
+    # The box covers every landmark
+    assert x0 <= first[:, 0].min() * 400 and first[:, 0].max() * 400 <= x1
+    assert y0 <= first[:, 1].min() * 200 and first[:, 1].max() * 200 <= y1
+
+    second = detector.process(frame)[0].points
+    crop_w, crop_h = x1 - x0, y1 - y0
+    assert detector.hands.shapes[-1] == (crop_h, crop_w, 3)
+    np.testing.assert_allclose(second[0, 0], (x0 + 0.4 * crop_w) / 400, rtol=1e-5)
+    np.testing.assert_allclose(second[0, 1], (y0 + 0.5 * crop_h) / 200, rtol=1e-5)
+    np.testing.assert_allclose(second[0, 2], -0.1 * crop_w / 400, rtol=1e-5)
+
+    # Lost in the crop -> the same frame is retried at full size
+    detector.hands.find = [False, True]
+    assert len(detector.process(frame)) == 1
+    assert detector.hands.shapes[-1] == (200, 400, 3)
+    assert detector.counts == {"full": 2, "roi": 1, "fallback": 1}
+
+    detector.hands.find = [False, False]
+    assert detector.process(frame) == []
+    assert detector.roi_box is None
+
+
+def test_roi_mode_resets_tracker_when_framing_changes(monkeypatch):
+    monkeypatch.setattr(mpu.mp_hands, "Hands", ScriptedHands)
+    detector = MediaPipeHandDetector(roi=True)
+    frame = np.zeros((200, 400, 3), dtype=np.uint8)
+
+    detector.process(frame)  # full frame
+    detector.process(frame)  # crop: reset before it
+    detector.process(frame)  # crop again: no reset
+    detector.hands.find = [False, True]
+    detector.process(frame)  # crop, then full-frame fallback: reset
+    detector.process(frame)  # crop: reset
+
+    # Each entry is the number of MediaPipe calls made before the reset
+    assert detector.hands.resets == [1, 4, 5]
+
+
+def test_detect_width_downscales_full_frame_passes(monkeypatch):
+    monkeypatch.setattr(mpu.mp_hands, "Hands", ScriptedHands)
+    detector = MediaPipeHandDetector(detect_width=640)
+
+    hands = detector.process(np.zeros((1080, 1920, 3), dtype=np.uint8))
+
+    assert detector.hands.shapes[-1] == (360, 640, 3)
+    # Normalized coordinates do not depend on the scale
+    assert hands[0].points[0].tolist() == pytest.approx([0.4, 0.5, -0.1])
@@ -0,0 +1,34 @@
+import torch
+import pytest
+
+from models.model_motion import MotionClassifier
+
+
+def test_motion_classifier_output_shape():
+    model = MotionClassifier(frame_dim=69, num_classes=3)
+    out = model(torch.randn(4, 30, 69))
+    assert out.shape == (4, 3)
+
+
+def test_motion_classifier_receptive_field():
+    model = MotionClassifier(frame_dim=69, kernel_size=5)
+    assert model.receptive_field == 9
+
+    emb = model.encode(torch.randn(2, 12, 69))
+    assert emb.shape == (2, 12, model.hidden_dim)
+    assert model.temporal(emb).shape == (2, model.hidden_dim, 12 - 9 + 1)
+
+
+def test_motion_classifier_backward():
+    model = MotionClassifier(frame_dim=69)
+    x = torch.randn(3, 30, 69, requires_grad=True)
+    model(x).sum().backward()
+
+    assert x.grad is not None
+    assert torch.isfinite(x.grad).all()
+
+
+def test_motion_classifier_rejects_short_window():
+    model = MotionClassifier(frame_dim=69, kernel_size=5)
+    with pytest.raises(RuntimeError):
+        model(torch.randn(1, 4, 69))
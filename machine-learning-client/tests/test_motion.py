@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+import torch
+
+from models.model_motion import MotionClassifier
+from src import motion
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return MotionClassifier(
+        frame_dim=motion.FRAME_DIM, num_classes=len(motion.MOTION_CLASSES)
+    ).eval()
+
+
+def test_sequence_features_shape_and_first_frame_velocity():
+    X, _ = motion.synthetic_sequences(3, length=10)
+    feats = motion.sequence_features(X)
+
+    assert feats.shape == (3, 10, motion.FRAME_DIM)
+    assert feats.dtype == np.float32
+    assert not feats[:, 0, motion.LANDMARK_DIM :].any()
+    assert feats[:, 1:, motion.LANDMARK_DIM :].any()
+
+
+def test_stream_matches_full_window_forward(model):
+    X, _ = motion.synthetic_sequences(3, seed=1)
+    frames = X.reshape((-1, 21, 3))
+    feats = motion.sequence_features(frames[np.newaxis])[0]
+    stream = motion.MotionStream(model)
+
+    for t, pts in enumerate(frames):
+        stream.push(pts)
+        if t + 1 < motion.WINDOW:
+            assert stream.probs() is None
+            continue
+        # Window ending at t, with velocities from the frame before it
+        window = torch.from_numpy(feats[t + 1 - motion.WINDOW : t + 1][np.newaxis])
+        with torch.no_grad():
+            expected = torch.softmax(model(window), dim=1)[0].numpy()
+        np.testing.assert_allclose(stream.probs(), expected, atol=1e-5)
+
+    letter, conf = stream.predict()
+    assert letter in motion.MOTION_CLASSES
+    assert 0.0 <= conf <= 1.0
+
+
+def test_training_windows_match_what_a_stream_sees(model):
+    X, y = motion.synthetic_sequences(2, length=motion.WINDOW + 3, seed=2)
+    windows, labels = motion.training_windows(X, y)
+
+    # Three windows per take, none starting at the take's first frame
+    assert windows.shape == (6, motion.WINDOW, motion.FRAME_DIM)
+    assert labels.tolist() == [y[0]] * 3 + [y[1]] * 3
+    assert windows[:, 0, motion.LANDMARK_DIM :].any(axis=1).all()
+
+    stream = motion.MotionStream(model)
+    for pts in X[1]:
+        stream.push(pts)
+    with torch.no_grad():
+        expected = torch.softmax(model(torch.from_numpy(windows[-1:])), dim=1)
+    np.testing.assert_allclose(stream.probs(), expected[0].numpy(), atol=1e-5)
+
+
+def test_training_windows_of_takes_without_lead_in():
+    X, y = motion.synthetic_sequences(2, length=motion.WINDOW)
+    windows, labels = motion.training_windows(X, y)
+
+    np.testing.assert_array_equal(windows, motion.sequence_features(X))
+    np.testing.assert_array_equal(labels, y)
+    with pytest.raises(ValueError):
+        motion.training_windows(X[:, 1:], y)
+
+
+def test_stream_reset_needs_a_full_window_again(model):
+    stream = motion.MotionStream(model, window=12)
+    pts = np.random.default_rng(0).random((21, 3), dtype=np.float32)
+    for _ in range(12):
+        stream.push(pts)
+    assert stream.ready
+
+    stream.reset()
+    assert stream.predict() is None
+    for _ in range(11):
+        stream.push(pts)
+    assert not stream.ready
+    stream.push(pts)
+    assert stream.ready
+
+
+def test_stream_rejects_window_shorter_than_receptive_field(model):
+    with pytest.raises(ValueError):
+        motion.MotionStream(model, window=model.receptive_field - 1)
+
+
+def test_motion_streams_keeps_one_stream_per_client(model):
+    now = [0.0]
+    streams = motion.MotionStreams(
+        model, max_entries=2, ttl_seconds=5.0, clock=lambda: now[0]
+    )
+    a = streams.get("a")
+    assert streams.get("a") is a
+
+    streams.get("b")
+    streams.get("c")
+    assert len(streams) == 2
+    assert streams.get("a") is not a
+
+    c = streams.get("c")
+    now[0] = 10.0
+    assert streams.get("c") is not c
+
+
+def test_synthetic_sequences_labels_and_shape():
+    X, y = motion.synthetic_sequences(12, length=20, seed=3)
+    assert X.shape == (12, 20, 21, 3)
+    assert set(y.tolist()) <= set(range(len(motion.MOTION_CLASSES)))
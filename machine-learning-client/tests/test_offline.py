@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+import src.offline as off
+from src.mediapipe_utils import HandLandmarks
+
+
+class EveryOtherFrameDetector:
+    """Reports a hand on even calls, reusing one buffer like the real one."""
+
+    def __init__(self):
+        self.calls = 0
+        self.buffer = np.zeros((1, 21, 3), dtype=np.float32)
+
+    def process(self, frame):
+        self.calls += 1
+        if self.calls % 2 == 0:
+            return []
+        self.buffer[0] = np.random.default_rng(self.calls).random((21, 3))
+        return [HandLandmarks(points=self.buffer[0], handedness="Left")]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return off.LetterClassifier()
+
+
+def test_synthetic_video_round_trip(tmp_path):
+    path = off.write_synthetic_video(
+        tmp_path / "v.avi", n_frames=12, width=64, height=48
+    )
+
+    frames = list(off.iter_frames(path))
+    assert [i for i, _, _ in frames] == list(range(12))
+    assert frames[0][1].shape == (48, 64, 3)
+    assert frames[1][2] > frames[0][2]
+
+
+def test_iter_frames_reads_image_directories_in_order(tmp_path):
+    for name in ["b.png", "a.png", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+    cv2.imwrite(str(tmp_path / "a.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+    cv2.imwrite(str(tmp_path / "b.png"), np.full((8, 8, 3), 255, dtype=np.uint8))
+
+    frames = list(off.iter_frames(tmp_path))
+    assert [i for i, _, _ in frames] == [0, 1]
+    assert frames[0][1].max() == 0 and frames[1][1].min() == 255
+    assert np.isnan(frames[0][2])
+
+
+def test_iter_frames_missing_video_raises(tmp_path):
+    with pytest.raises(OSError):
+        list(off.iter_frames(tmp_path / "missing.mp4"))
+
+
+def test_process_source_batches_and_keeps_frame_alignment(tmp_path, classifier):
+    video = off.write_synthetic_video(
+        tmp_path / "v.avi", n_frames=9, width=64, height=48
+    )
+
+    columns, stats = off.process_source(
+        video, EveryOtherFrameDetector(), classifier, batch_size=2
+    )
+
+    assert stats["frames"] == 9 and stats["hands"] == 5
+    assert stats["fps"] > 0
+    has_hand = columns["pred"] >= 0
+    assert has_hand.tolist() == [i % 2 == 0 for i in range(9)]
+    assert columns["landmarks"].shape == (9, 21, 3)
+    # Landmarks were copied out of the detector's reused buffer
+    assert not np.allclose(columns["landmarks"][0], columns["landmarks"][2])
+    assert np.all(columns["landmarks"][1] == 0)
+    assert set(columns["handedness"][has_hand]) == {"Left"}
+    assert all(columns["letter"][has_hand] != "")
+    assert np.all((columns["confidence"][has_hand] > 0))
+
+    # Batching does not change the predictions
+    unbatched, _ = off.process_source(
+        video, EveryOtherFrameDetector(), classifier, batch_size=64
+    )
+    np.testing.assert_array_equal(columns["pred"], unbatched["pred"])
+
+
+def test_write_and_read_columns(tmp_path):
+    columns = {
+        "frame": np.arange(3, dtype=np.int32),
+        "letter": np.array(["A", "", "B"]),
+    }
+    path = off.write_columns(tmp_path / "out" / "x.npz", columns, {"fps": 12.5})
+
+    loaded, meta = off.read_columns(path)
+    assert meta == {"fps": 12.5}
+    np.testing.assert_array_equal(loaded["letter"], columns["letter"])
+
+
+def test_output_paths_keep_inputs_with_the_same_stem_apart(tmp_path):
+    inputs = [Path("a/take.mp4"), Path("b/take.mp4"), Path("b/other.mp4")]
+
+    paths = off.output_paths(tmp_path, inputs)
+
+    assert [p.name for p in paths] == ["00000_take.npz", "00001_take.npz", "other.npz"]
+    assert len(set(paths)) == len(inputs)
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline import LatestSlot, Pipeline, StageStats
+
+
+def test_latest_slot_keeps_newest_and_counts_drops():
+    slot = LatestSlot()
+    slot.put(1)
+    slot.put(2)
+    slot.put(3)
+
+    assert slot.get(timeout=0) == 3
+    assert slot.dropped == 2
+    assert slot.get(timeout=0.01) is None
+
+
+def test_latest_slot_close_wakes_reader_and_drains():
+    slot = LatestSlot()
+    slot.put("last")
+    slot.close()
+    assert slot.get() == "last"
+    assert slot.get() is None
+
+    waiting = LatestSlot()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(waiting.get()))
+    reader.start()
+    waiting.close()
+    reader.join(timeout=1)
+    assert result == [None]
+
+
+def test_stage_stats_smooths_latency_and_rate():
+    stats = StageStats(smoothing=0.5)
+    stats.record(0.010, now=1.0)
+    stats.record(0.020, now=1.1)
+    stats.record(0.020, now=1.2)
+
+    assert stats.count == 3
+    assert stats.latency_ms == pytest.approx(17.5)
+    assert stats.fps == pytest.approx(10.0)
+
+
+def test_pipeline_runs_stages_in_order_and_drops_stale_items():
+    items = iter(range(200))
+
+    def source():
+        return next(items, None)
+
+    def slow_double(x):
+        time.sleep(0.002)
+        return x * 2
+
+    seen = []
+    with Pipeline(source, [("double", slow_double), ("inc", lambda x: x + 1)]) as pipe:
+        while not pipe.finished:
+            out = pipe.get(timeout=0.05)
+            if out is not None:
+                seen.append(out)
+        while (out := pipe.get(timeout=0)) is not None:
+            seen.append(out)
+
+    assert seen == sorted(seen)
+    assert all(v % 2 == 1 for v in seen)
+    assert seen[-1] == 2 * 199 + 1
+    stats = pipe.stats()
+    assert list(stats) == ["capture", "double", "inc"]
+    assert stats["capture"]["dropped"] > 0
+    assert stats["double"]["count"] < 200
+    assert not pipe.errors()
+
+
+def test_pipeline_reports_stage_errors_and_finishes():
+    def boom(_):
+        raise RuntimeError("broken")
+
+    with Pipeline(iter([1, 2, 3]).__next__, [("boom", boom)]) as pipe:
+        deadline = time.monotonic() + 2
+        while not pipe.finished and time.monotonic() < deadline:
+            pipe.get(timeout=0.05)
+
+    assert pipe.finished
+    assert isinstance(pipe.errors()["boom"], RuntimeError)
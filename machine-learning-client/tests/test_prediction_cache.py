@@ -0,0 +1,48 @@
+"""
+Tests for the per-client prediction cache
+"""
+
+from src.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_last_put():
+    cache = PredictionCache()
+    cache.put("a", {"letter": "A", "confidence": 0.9})
+
+    assert cache.get("a") == {"letter": "A", "confidence": 0.9}
+    assert cache.get("b") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(ttl_seconds=5.0, clock=clock)
+    cache.put("a", {"letter": "A"})
+
+    clock.now = 4.0
+    assert cache.get("a") is not None
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_client_is_evicted():
+    cache = PredictionCache(max_entries=2)
+    cache.put("a", {"letter": "A"})
+    cache.put("b", {"letter": "B"})
+    cache.get("a")
+    cache.put("c", {"letter": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,104 @@
+"""
+Tests for parallel, resumable ASL MNIST landmark extraction
+"""
+
+import json
+
+import numpy as np
+
+import src.dataset_asl_mnist as dsm
+import src.process_mnist as pm
+
+
+class DummyHFDS:
+    """Fake HF dataset: label 10 images have a hand, label 11 do not."""
+
+    def __init__(self, n=7):
+        self._samples = [
+            {"image": np.zeros((28, 28), dtype=np.uint8), "label": 10 + (i % 2)}
+            for i in range(n)
+        ]
+
+    def __len__(self):
+        return len(self._samples)
+
+    def __getitem__(self, idx):
+        return self._samples[idx]
+
+
+def patch_dataset(monkeypatch, calls):
+    monkeypatch.setattr(
+        dsm, "load_asl_mnist_with_retries", lambda split="train": DummyHFDS()
+    )
+    monkeypatch.setattr(
+        dsm, "load_label_maps", lambda label_map_path=None: ({}, {}, {10: 0, 11: 1})
+    )
+    monkeypatch.setattr(dsm, "create_hands_model", lambda: "fake-hands")
+
+    def fake_extract(hands, img):
+        calls.append(hands)
+        pts = np.zeros((21, 3), dtype=np.float32)
+        pts[1] = [2.0, 0.0, 0.0]
+        return pts if len(calls) % 2 == 1 else None
+
+    monkeypatch.setattr(dsm, "extract_landmarks", fake_extract)
+
+
+def test_shard_ranges_cover_all_indices():
+    ranges = pm.shard_ranges(7, 3)
+    assert ranges == [(0, 0, 3), (1, 3, 6), (2, 6, 7)]
+
+
+def test_extract_writes_shards_manifest_and_merged_file(tmp_path, monkeypatch):
+    calls = []
+    patch_dataset(monkeypatch, calls)
+    out = tmp_path / "merged.npz"
+
+    manifest = pm.extract_parallel(
+        split="train", workers=1, shard_size=3, shard_dir=tmp_path, out_path=out
+    )
+
+    assert sorted(manifest["shards"]) == ["0", "1", "2"]
+    assert (tmp_path / "train" / pm.MANIFEST_NAME).exists()
+    assert len(calls) == 7
+
+    data = np.load(out)
+    assert data["X"].shape == (7, 63)
+    assert data["y"].tolist() == [0, 1, 0, 1, 0, 1, 0]
+    assert data["has_hand"].tolist() == [True, False, True, False, True, False, True]
+    assert np.allclose(data["X"][~data["has_hand"]], 0.0)
+
+
+def test_extract_resumes_from_manifest(tmp_path, monkeypatch):
+    calls = []
+    patch_dataset(monkeypatch, calls)
+    out = tmp_path / "merged.npz"
+
+    pm.extract_parallel(
+        split="train", workers=1, shard_size=3, shard_dir=tmp_path, out_path=out
+    )
+
+    # Simulate a crash that lost the last shard
+    split_dir = tmp_path / "train"
+    pm.shard_path(split_dir, 2).unlink()
+    calls.clear()
+
+    manifest = pm.extract_parallel(
+        split="train", workers=1, shard_size=3, shard_dir=tmp_path, out_path=out
+    )
+
+    # Only the missing shard (one image) was re-extracted
+    assert len(calls) == 1
+    assert sorted(manifest["shards"]) == ["0", "1", "2"]
+    assert np.load(out)["y"].shape == (7,)
+
+
+def test_manifest_reset_when_run_parameters_change(tmp_path):
+    pm.write_manifest(
+        tmp_path,
+        {"split": "train", "num_samples": 7, "shard_size": 3, "shards": {"0": {}}},
+    )
+
+    manifest = pm.load_manifest(tmp_path, "train", 7, shard_size=5)
+    assert manifest["shards"] == {}
+    assert json.loads((tmp_path / pm.MANIFEST_NAME).read_text())["shard_size"] == 3
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.motion import TAKE_FRAMES, WINDOW
+from src.record_motion_samples import SequenceRecorder
+
+
+def test_sequence_recorder_saves_unbroken_takes():
+    recorder = SequenceRecorder(length=3)
+    pts = np.zeros((21, 3), dtype=np.float32)
+
+    assert not recorder.add(pts)  # not recording yet
+    recorder.start(1)
+    assert not recorder.add(pts)
+    assert not recorder.add(None)  # hand lost: take restarts
+    assert not recorder.add(pts)
+    assert not recorder.add(pts)
+    assert recorder.add(pts)
+
+    assert not recorder.recording
+    assert len(recorder.X) == 1
+    assert recorder.X[0].shape == (3, 21, 3)
+    assert recorder.y == [1]
+
+
+def test_sequence_recorder_copies_reused_buffers():
+    recorder = SequenceRecorder(length=2)
+    buffer = np.zeros((21, 3), dtype=np.float32)
+    recorder.start(2)
+    recorder.add(buffer)
+    buffer += 1.0
+    recorder.add(buffer)
+
+    assert recorder.X[0][0].max() == 0.0
+    assert recorder.X[0][1].min() == 1.0
+
+
+def test_takes_include_a_lead_in_frame():
+    assert SequenceRecorder().length == TAKE_FRAMES > WINDOW
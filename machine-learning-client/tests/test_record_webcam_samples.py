@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
+from src.dedup import RecentSampleFilter
+from src.mediapipe_utils import HandLandmarks
 import src.record_webcam_samples as rws
 
 
@@ -62,15 +64,56 @@ def test_append_to_npz_appends(tmp_path):
 
 
 # ---------------------------------------------------------
-# Test: main() → ensures recording loop saves NPZ correctly
+# Test: an interrupted append_to_npz keeps the old file
+# ---------------------------------------------------------
+def test_append_to_npz_failure_keeps_old_file(tmp_path, monkeypatch):
+    out = tmp_path / "dataset.npz"
+    np.savez(out, X=np.zeros((3, 63)), y=np.array([0, 0, 0]))
+
+    def interrupted(*_args, **_kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(rws.np, "savez", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        rws.append_to_npz(out, np.ones((2, 63)), np.array([1, 1]))
+    monkeypatch.undo()
+
+    with np.load(out) as data:
+        assert data["X"].shape == (3, 63)
+
+
+# ---------------------------------------------------------
+# Test: open_store imports the legacy NPZ once
+# ---------------------------------------------------------
+def test_open_store_imports_legacy_npz_once(tmp_path):
+    legacy = tmp_path / "webcam_landmarks.npz"
+    np.savez(legacy, X=np.zeros((3, 63), dtype=np.float32), y=np.array([0, 0, 0]))
+    store_dir = tmp_path / "store"
+
+    store = rws.open_store(store_dir=store_dir, legacy_path=legacy)
+    store.append(np.ones((2, 63), dtype=np.float32), np.array([1, 1]))
+
+    assert len(store.shards) == 2
+    X, y = store.load()
+    assert len(X) == 5
+    np.testing.assert_array_equal(np.asarray(y), [0, 0, 0, 1, 1])
+
+    # The legacy file is only imported once
+    store = rws.open_store(store_dir=store_dir, legacy_path=legacy)
+    assert len(store) == 5
+
+
+# ---------------------------------------------------------
+# Test: main() → ensures recording loop saves a store shard
 # ---------------------------------------------------------
 def test_main_saves_samples(tmp_path, monkeypatch):
     fake_map = tmp_path / "label_map.json"
     fake_map.write_text('{"letter_to_index": {"A": 0}}')
     monkeypatch.setattr(rws, "LABEL_MAP_PATH", fake_map)
 
-    out_npz = tmp_path / "webcam_landmarks.npz"
-    monkeypatch.setattr(rws, "OUT_PATH", out_npz)
+    store_dir = tmp_path / "webcam_landmarks"
+    monkeypatch.setattr(rws, "STORE_DIR", store_dir)
+    monkeypatch.setattr(rws, "OUT_PATH", tmp_path / "webcam_landmarks.npz")
 
     mock_cap = MagicMock()
     mock_cap.read.side_effect = [
@@ -85,12 +128,37 @@ def test_main_saves_samples(tmp_path, monkeypatch):
     monkeypatch.setattr(rws.cv2, "waitKey", lambda _: ord("q"))
 
     monkeypatch.setattr(
-        rws, "normalize_landmarks", lambda pts: np.ones(63, dtype=np.float32)
+        rws,
+        "normalize_landmarks_batch",
+        lambda pts: np.ones((len(pts), 63), dtype=np.float32),
     )
 
-    rws.main()
+    rws.main([])
+
+    X, y = rws.LandmarkStore(store_dir).load()
+    assert X.shape[1] == 63
+    assert y.shape == (X.shape[0],)
+
+
+def test_records_one_hand_unless_asked_for_more():
+    assert rws.build_parser().parse_args([]).max_hands == 1
+    assert rws.build_parser().parse_args(["--max-hands", "2"]).max_hands == 2
+
+
+def test_record_hands_submits_each_new_hand():
+    rng = np.random.default_rng(0)
+    hands = [
+        HandLandmarks(points=rng.random((21, 3), dtype=np.float32), handedness=h)
+        for h in ("Left", "Right")
+    ]
+    writer = MagicMock()
+    recent = RecentSampleFilter()
+
+    assert rws.record_hands(hands, 3, recent, writer) == 2
+    assert writer.submit.call_count == 2
+    feat, label = writer.submit.call_args_list[1].args
+    assert feat.shape == (63,)
+    assert label == 3
 
-    assert out_npz.exists()
-    data = np.load(out_npz)
-    assert data["X"].shape[1] == 63
-    assert data["y"].shape == (data["X"].shape[0],)
+    # The same hands again are near-duplicates
+    assert rws.record_hands(hands, 3, recent, writer) == 0
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import torch
+from torch.utils.data import TensorDataset
+
+import src.registry as reg
+import src.train_mlp as tm
+from src import api
+
+
+def test_dataset_digest_depends_on_content_only():
+    X = np.arange(63 * 4, dtype=np.float32).reshape(4, 63)
+    y = np.array([0, 1, 2, 3])
+
+    assert reg.dataset_digest(X, y) == reg.dataset_digest(X.copy(), y.copy())
+    X2 = X.copy()
+    X2[0, 0] += 1
+    assert reg.dataset_digest(X2, y) != reg.dataset_digest(X, y)
+
+
+def test_config_digest_ignores_key_order():
+    assert reg.config_digest({"a": 1, "b": 2}) == reg.config_digest({"b": 2, "a": 1})
+    assert reg.config_digest({"a": 1}) != reg.config_digest({"a": 2})
+
+
+def test_registry_save_lookup_and_resolve(tmp_path):
+    registry = reg.ModelRegistry(tmp_path)
+    assert registry.lookup("abc") is None
+
+    state = {"w": torch.ones(2)}
+    registry.save("abc123", state, {"created": "2025-01-01T00:00:00"})
+    registry.save("abd456", state, {"created": "2025-01-02T00:00:00"})
+
+    assert registry.lookup("abc123")["run_id"] == "abc123"
+    assert torch.equal(torch.load(registry.checkpoint_path("abc123"))["w"], state["w"])
+    assert registry.resolve("abc") == "abc123"
+    assert registry.resolve("latest") == "abd456"
+    with pytest.raises(KeyError):
+        registry.resolve("ab")
+    with pytest.raises(KeyError):
+        registry.resolve("zzz")
+
+
+def test_train_skips_identical_run(tmp_path, monkeypatch):
+    X = torch.randn(40, 63)
+    y = torch.tensor([0, 1] * 20)
+    monkeypatch.setattr(tm, "load_dataset", lambda: TensorDataset(X, y))
+    monkeypatch.setattr(tm, "OUT_PATH", tmp_path / "mlp_webcam.pt")
+    registry = reg.ModelRegistry(tmp_path / "registry")
+
+    first = tm.train(num_epochs=1, batch_size=8, registry=registry)
+    assert registry.checkpoint_path(first["run_id"]).exists()
+    assert first["metrics"]["best_val_acc"] >= 0.0
+
+    calls = []
+    monkeypatch.setattr(tm, "LandmarkMLP", lambda **kw: calls.append(kw))
+    again = tm.train(num_epochs=1, batch_size=8, registry=registry)
+    assert again["run_id"] == first["run_id"]
+    assert not calls
+
+    # A different config is a different run
+    monkeypatch.undo()
+    monkeypatch.setattr(tm, "load_dataset", lambda: TensorDataset(X, y))
+    monkeypatch.setattr(tm, "OUT_PATH", tmp_path / "mlp_webcam.pt")
+    other = tm.train(num_epochs=1, batch_size=8, lr=1e-2, registry=registry)
+    assert other["run_id"] != first["run_id"]
+    assert len(registry.list_runs()) == 2
+
+
+def test_cached_run_becomes_the_served_model(tmp_path, monkeypatch):
+    X = torch.randn(40, 63)
+    y = torch.tensor([0, 1] * 20)
+    out_path = tmp_path / "mlp_webcam.pt"
+    monkeypatch.setattr(tm, "load_dataset", lambda: TensorDataset(X, y))
+    monkeypatch.setattr(tm, "OUT_PATH", out_path)
+    registry = reg.ModelRegistry(tmp_path / "registry")
+
+    first = tm.train(num_epochs=1, batch_size=8, registry=registry)
+    tm.train(num_epochs=1, batch_size=8, lr=1e-2, registry=registry)
+    again = tm.train(num_epochs=1, batch_size=8, registry=registry)
+
+    assert again["run_id"] == first["run_id"]
+    assert out_path.read_bytes() == (
+        registry.checkpoint_path(first["run_id"]).read_bytes()
+    )
+
+
+def test_api_resolves_model_id(tmp_path):
+    registry = reg.ModelRegistry(tmp_path)
+    registry.save("feedbeef00000000", {"w": torch.zeros(1)}, {"created": "x"})
+
+    assert api.resolve_model_path(None, tmp_path) == (None, api.MODEL_PATH)
+    run_id, path = api.resolve_model_path("feed", tmp_path)
+    assert run_id == "feedbeef00000000"
+    assert path == registry.checkpoint_path(run_id)
@@ -0,0 +1,123 @@
+"""
+Tests for the background shard writer
+"""
+
+import time
+
+import numpy as np
+
+from src.landmark_store import LandmarkStore
+from src.shard_writer import BackgroundShardWriter
+
+
+def test_writer_flushes_in_chunks_and_on_close(tmp_path):
+    store = LandmarkStore(tmp_path)
+
+    with BackgroundShardWriter(
+        store, chunk_size=4, flush_interval=60, merge_on_close=False
+    ) as writer:
+        for i in range(10):
+            assert writer.submit(np.full(63, i, dtype=np.float32), i % 3)
+
+    # Two full chunks plus the partial one flushed by close()
+    assert [s["num_samples"] for s in store.shards] == [4, 4, 2]
+    X, y = store.load()
+    np.testing.assert_array_equal(np.asarray(X)[:, 0], np.arange(10))
+    np.testing.assert_array_equal(np.asarray(y), [i % 3 for i in range(10)])
+
+    stats = writer.stats()
+    assert stats["written"] == 10
+    assert stats["flushes"] == 3
+    assert stats["dropped"] == 0
+    assert stats["flush_ms_max"] >= stats["flush_ms_mean"] > 0
+
+
+def test_steady_stream_fills_chunks_despite_flush_interval(tmp_path):
+    store = LandmarkStore(tmp_path)
+    writer = BackgroundShardWriter(
+        store, chunk_size=4, flush_interval=0.5, merge_on_close=False
+    ).start()
+
+    # Samples keep arriving well within the interval, so only full chunks
+    # are written until close()
+    for i in range(10):
+        writer.submit(np.full(63, i, dtype=np.float32), 0)
+        time.sleep(0.01)
+    writer.close()
+
+    assert [s["num_samples"] for s in store.shards] == [4, 4, 2]
+
+
+def test_close_merges_session_shards(tmp_path):
+    store = LandmarkStore(tmp_path)
+    earlier = store.append(np.zeros((3, 63)), np.zeros(3))
+
+    with BackgroundShardWriter(store, chunk_size=4, flush_interval=60) as writer:
+        for i in range(10):
+            writer.submit(np.full(63, i, dtype=np.float32), 1)
+
+    shards = store.shards
+    assert [s["id"] for s in shards[:1]] == [earlier]
+    assert [s["num_samples"] for s in shards] == [3, 10]
+    assert writer.shard_ids == [shards[1]["id"]]
+    np.testing.assert_array_equal(np.asarray(store.load()[0])[3:, 0], np.arange(10))
+    assert len(list(tmp_path.glob("*.npy"))) == 4
+
+
+class FailingStore:
+    def __init__(self):
+        self.attempts = 0
+
+    def append(self, X, y):
+        self.attempts += 1
+        raise OSError("disk full")
+
+
+def test_pending_is_bounded_while_flushes_fail():
+    store = FailingStore()
+    writer = BackgroundShardWriter(store, chunk_size=2, max_queue=4).start()
+
+    for _ in range(20):
+        writer.submit(np.zeros(63), 0)
+        for _ in range(100):
+            if not writer.stats()["queued"]:
+                break
+            time.sleep(0.001)
+    writer.close()
+
+    stats = writer.stats()
+    # Only the newest max_pending samples are kept for the retry
+    assert stats["dropped"] == 20 - writer.max_pending
+    assert stats["written"] == 0
+    assert stats["errors"] == store.attempts >= 1
+
+
+def test_writer_drops_when_queue_is_full(tmp_path):
+    store = LandmarkStore(tmp_path)
+    writer = BackgroundShardWriter(store, max_queue=2)
+
+    # Thread not started yet, so nothing drains the queue
+    results = [writer.submit(np.zeros(63), 0) for _ in range(5)]
+
+    assert results == [True, True, False, False, False]
+    assert writer.stats()["dropped"] == 3
+
+    writer.start()
+    writer.close()
+    assert len(store) == 2
+
+
+def test_writer_flushes_partial_chunk_after_interval(tmp_path):
+    store = LandmarkStore(tmp_path)
+    writer = BackgroundShardWriter(store, chunk_size=100, flush_interval=0.01)
+    writer.start()
+    writer.submit(np.zeros(63), 1)
+
+    for _ in range(200):
+        if writer.stats()["written"]:
+            break
+        writer._thread.join(0.01)  # pylint: disable=protected-access
+
+    assert writer.stats()["written"] == 1
+    assert len(store) == 1
+    writer.close()
@@ -0,0 +1,72 @@
+import multiprocessing as mp
+
+import pytest
+import torch
+
+import src.sweep as sw
+
+
+def make_data(n=120, num_classes=3):
+    torch.manual_seed(0)
+    centers = torch.randn(num_classes, 63) * 3
+    y = torch.randint(0, num_classes, (n,))
+    return centers[y] + 0.1 * torch.randn(n, 63), y
+
+
+def test_expand_grid():
+    trials = sw.expand_grid({"lr": [1e-3, 1e-2], "batch_size": [16, 32, 64]})
+    assert len(trials) == 6
+    assert {"lr": 1e-2, "batch_size": 64} in trials
+
+    with pytest.raises(ValueError):
+        sw.expand_grid({"lr": (1e-4, 1e-2)})
+
+
+def test_sample_random_is_seeded_and_in_range():
+    space = {"lr": (1e-4, 1e-2), "batch_size": [32, 64]}
+    trials = sw.sample_random(space, 20, seed=1)
+
+    assert trials == sw.sample_random(space, 20, seed=1)
+    assert all(1e-4 <= t["lr"] <= 1e-2 for t in trials)
+    assert {t["batch_size"] for t in trials} <= {32, 64}
+
+
+def test_early_stopper_patience_and_pruning():
+    shared_best = mp.Value("d", 0.0)
+
+    patient = sw.EarlyStopper(shared_best, patience=2, min_epochs=100, prune_margin=1)
+    assert not patient(1, 0.5)
+    assert not patient(2, 0.4)
+    assert patient(3, 0.45)
+    assert "no improvement" in patient.reason
+    assert shared_best.value == 0.5
+
+    shared_best.value = 0.9
+    pruned = sw.EarlyStopper(shared_best, patience=0, min_epochs=2, prune_margin=0.1)
+    assert not pruned(1, 0.3)
+    assert pruned(2, 0.35)
+    assert "trailing" in pruned.reason
+
+
+def test_run_sweep_inline_ranks_trials():
+    X, y = make_data()
+    trials = sw.expand_grid({"lr": [1e-3, 1e-2], "num_epochs": [2]})
+
+    rows = sw.run_sweep(X, y, trials, workers=1, patience=0)
+
+    assert len(rows) == 2
+    assert rows[0]["best_val_acc"] >= rows[1]["best_val_acc"]
+    assert all(r["epochs_run"] == 2 for r in rows)
+    table = sw.format_leaderboard(rows)
+    assert "val_acc" in table
+
+
+def test_run_sweep_in_process_pool(tmp_path):
+    X, y = make_data(n=60)
+    trials = [{"lr": 1e-3, "num_epochs": 1}, {"lr": 1e-2, "num_epochs": 1}]
+
+    rows = sw.run_sweep(X, y, trials, workers=2)
+
+    assert sorted(r["trial"] for r in rows) == [0, 1]
+    path = sw.write_leaderboard(rows, tmp_path, {"mode": "grid"})
+    assert path.exists()
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.temporal import TemporalFilter
+
+
+class CountingForward:
+    """Returns scripted probabilities and records each call's batch size."""
+
+    def __init__(self, probs):
+        self.probs = np.asarray(probs, dtype=np.float32)
+        self.batches = []
+
+    def __call__(self, feats):
+        self.batches.append(len(feats))
+        return np.repeat(self.probs[np.newaxis], len(feats), axis=0)
+
+
+def pose(seed=0):
+    return np.random.default_rng(seed).random((1, 63), dtype=np.float32)
+
+
+def test_still_hand_skips_forward_until_max_skip():
+    temporal = TemporalFilter(max_skip=5)
+    forward = CountingForward([0.9, 0.1])
+    feats = pose()
+
+    for _ in range(11):
+        assert temporal(feats, ["Right0"], forward) == [(0, pytest.approx(0.9))]
+
+    # Forwards on frames 0 and 6; max_skip forces the second one
+    assert forward.batches == [1, 1]
+    assert temporal.forwards == 2
+    assert temporal.skipped == 9
+    assert temporal.skipped_ratio == pytest.approx(9 / 11)
+
+
+def test_motion_triggers_forward_for_moved_hands_only():
+    temporal = TemporalFilter(motion_eps=0.03)
+    forward = CountingForward([0.9, 0.1])
+    feats = np.concatenate([pose(0), pose(1)])
+    temporal(feats, ["Left0", "Right0"], forward)
+
+    feats[1] += 0.1
+    temporal(feats, ["Left0", "Right0"], forward)
+    assert forward.batches == [2, 1]
+
+    feats[0] += 0.001
+    temporal(feats, ["Left0", "Right0"], forward)
+    assert forward.batches == [2, 1]
+
+
+def test_hysteresis_keeps_letter_through_noise():
+    temporal = TemporalFilter(motion_eps=0.0, alpha=0.5, enter=0.6, leave=0.4)
+    feats = pose()
+    shown = []
+    for step in range(20):
+        probs = [0.9, 0.1] if step < 5 or step % 2 else [0.35, 0.65]
+        ((idx, _),) = temporal(feats, ["Right0"], CountingForward(probs))
+        shown.append(idx)
+    assert shown == [0] * 20
+
+    for _ in range(6):
+        ((idx, conf),) = temporal(feats, ["Right0"], CountingForward([0.05, 0.95]))
+    assert idx == 1
+    assert conf > 0.9
+
+
+def test_low_confidence_is_not_shown():
+    temporal = TemporalFilter(enter=0.6)
+    ((idx, conf),) = temporal(pose(), ["Right0"], CountingForward([0.55, 0.45]))
+    assert idx == -1
+    assert conf == pytest.approx(0.55)
+
+
+def test_missing_hand_loses_its_state():
+    temporal = TemporalFilter()
+    forward = CountingForward([0.9, 0.1])
+    temporal(pose(), ["Right0"], forward)
+    temporal(pose(), ["Left0"], forward)
+    assert set(temporal.tracks) == {"Left0"}
+
+    temporal(pose(), ["Right0"], forward)
+    assert forward.batches == [1, 1, 1]
+
+
+def test_rejects_inverted_thresholds():
+    with pytest.raises(ValueError):
+        TemporalFilter(enter=0.4, leave=0.6)
+    with pytest.raises(ValueError):
+        TemporalFilter(alpha=0.0)
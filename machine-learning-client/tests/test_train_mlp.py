@@ -5,6 +5,7 @@ import torch
 from torch.utils.data import TensorDataset
 
 import src.train_mlp as tm
+from src.landmark_store import LandmarkStore
 
 
 def test_load_dataset_returns_tensor_dataset(tmp_path, monkeypatch):
@@ -26,6 +27,19 @@ def test_load_dataset_returns_tensor_dataset(tmp_path, monkeypatch):
     assert y_t.dtype == torch.int64
 
 
+def test_load_dataset_reads_landmark_store(tmp_path, monkeypatch):
+    store = LandmarkStore(tmp_path / "webcam_landmarks")
+    store.append(np.zeros((4, 63)), np.array([0, 1, 0, 1]))
+    store.append(np.ones((2, 63)), np.array([2, 2]))
+    monkeypatch.setattr(tm, "DATA_PATH", store.root)
+
+    ds = tm.load_dataset()
+
+    X_t, y_t = ds.tensors
+    assert X_t.shape == (6, 63)
+    assert y_t.tolist() == [0, 1, 0, 1, 2, 2]
+
+
 def test_train_runs_and_saves_best_model(tmp_path, monkeypatch):
     # Make an "easy" dataset: all labels are 0
     X = torch.randn(40, 63)
@@ -72,3 +86,37 @@ def test_train_detects_correct_num_classes(monkeypatch, tmp_path):
     tm.train(num_epochs=0, batch_size=8, val_split=0.2)
 
     assert captured["num_classes"] == 3
+
+
+def test_split_tensors_matches_random_split():
+    X = torch.arange(20, dtype=torch.float32).unsqueeze(1).repeat(1, 63)
+    y = torch.arange(20)
+
+    X_train, y_train, X_val, y_val = tm.split_tensors(X, y, val_split=0.25, seed=3)
+
+    train_ds, val_ds = torch.utils.data.random_split(
+        TensorDataset(X, y), [15, 5], generator=torch.Generator().manual_seed(3)
+    )
+    assert y_train.tolist() == list(train_ds.indices)
+    assert y_val.tolist() == list(val_ds.indices)
+    assert torch.equal(X_train[:, 0].long(), y_train)
+
+
+def test_tensor_loop_matches_dataloader_loop_quality():
+    torch.manual_seed(0)
+    centers = torch.randn(3, 63) * 3
+    y = torch.randint(0, 3, (300,))
+    X = centers[y] + 0.1 * torch.randn(300, 63)
+
+    fast = tm.fit(X, y, num_epochs=3, batch_size=32, loop="tensor", verbose=False)
+    slow = tm.fit(X, y, num_epochs=3, batch_size=32, loop="dataloader", verbose=False)
+
+    assert fast["n_train"] == slow["n_train"] == 240
+    assert fast["metrics"]["best_val_acc"] > 0.9
+    assert slow["metrics"]["best_val_acc"] > 0.9
+    assert fast["metrics"]["train_samples_per_sec"] > 0
+
+
+def test_fit_rejects_unknown_loop():
+    with pytest.raises(ValueError):
+        tm.fit(torch.zeros(4, 63), torch.zeros(4, dtype=torch.long), loop="nope")
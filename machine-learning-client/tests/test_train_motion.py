@@ -0,0 +1,29 @@
+import torch
+
+from models.model_motion import MotionClassifier
+from src import motion
+from src.train_motion import fit_motion
+
+
+def test_fit_motion_learns_synthetic_letters():
+    X, y = motion.synthetic_sequences(300, seed=0)
+    result = fit_motion(X, y, num_epochs=6, verbose=False)
+
+    assert result["n_train"] + result["n_val"] == 300
+    assert result["best_val_acc"] > 0.6
+    assert result["best_state"] is not None
+
+    model = MotionClassifier(
+        frame_dim=motion.FRAME_DIM, num_classes=len(motion.MOTION_CLASSES)
+    )
+    model.load_state_dict(result["best_state"])
+
+
+def test_trained_model_round_trips_through_load(tmp_path):
+    X, y = motion.synthetic_sequences(40, seed=1)
+    result = fit_motion(X, y, num_epochs=1, verbose=False)
+    path = tmp_path / "motion.pt"
+    torch.save(result["model"].state_dict(), path)
+
+    loaded = motion.load_motion_model(path)
+    assert not loaded.training
@@ -0,0 +1,167 @@
+import numpy as np
+import torch
+
+import src.webcam_demo as demo
+from models.model_MLP import LandmarkMLP
+from src.mediapipe_utils import HandLandmarks
+from src.temporal import TemporalFilter
+
+
+class FakeCapture:
+    def __init__(self, n_frames):
+        self.remaining = n_frames
+
+    def read(self):
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+class FakeDetector:
+    def __init__(self):
+        self.buffer = np.random.default_rng(0).random((1, 21, 3), dtype=np.float32)
+
+    def process(self, frame):
+        return [HandLandmarks(points=self.buffer[0], handedness="Right")]
+
+
+def run_demo(monkeypatch, runner, n_frames=20):
+    shown = []
+    monkeypatch.setattr(demo.cv2, "imshow", lambda name, frame: shown.append(frame))
+    monkeypatch.setattr(demo.cv2, "waitKey", lambda delay: -1)
+    torch.manual_seed(0)
+    model = LandmarkMLP(input_dim=63, num_classes=3).eval()
+    letters = {0: "A", 1: "B", 2: "C"}
+
+    runner(FakeCapture(n_frames), FakeDetector(), model, "cpu", letters)
+    return shown
+
+
+def test_run_serial_shows_every_frame(monkeypatch):
+    assert len(run_demo(monkeypatch, demo.run_serial)) == 20
+
+
+def test_run_pipelined_shows_frames_until_capture_ends(monkeypatch):
+    shown = run_demo(monkeypatch, demo.run_pipelined)
+    assert 1 <= len(shown) <= 20
+
+
+def test_classify_hand_applies_threshold():
+    model = LandmarkMLP(input_dim=63, num_classes=2).eval()
+    with torch.no_grad():
+        for p in model.parameters():
+            p.zero_()
+    hand = HandLandmarks(points=np.ones((21, 3), dtype=np.float32), handedness="Left")
+
+    letter, conf = demo.classify_hand(model, "cpu", hand, {0: "A", 1: "B"})
+    assert letter == "-"
+    assert conf == 0.5
+
+
+def test_run_serial_skips_drawing_when_throttled(monkeypatch):
+    class Every4th:
+        def __init__(self):
+            self.calls = 0
+
+        def due(self):
+            self.calls += 1
+            return self.calls % 4 == 1
+
+    throttle = Every4th()
+    shown = run_demo(
+        monkeypatch,
+        lambda *args: demo.run_serial(*args, throttle=throttle),
+    )
+    assert throttle.calls == 20
+    assert len(shown) == 5
+
+
+def test_classify_hands_uses_one_forward_and_matches_per_hand():
+    torch.manual_seed(0)
+    model = LandmarkMLP(input_dim=63, num_classes=3).eval()
+    letters = {0: "A", 1: "B", 2: "C"}
+    rng = np.random.default_rng(1)
+    hands = [
+        HandLandmarks(points=rng.random((21, 3), dtype=np.float32), handedness=h)
+        for h in ("Left", "Right")
+    ]
+    expected = [demo.classify_hand(model, "cpu", hand, letters) for hand in hands]
+
+    calls = []
+    model.register_forward_hook(lambda module, inputs, output: calls.append(inputs))
+    got = demo.classify_hands(model, "cpu", hands, letters)
+
+    assert len(calls) == 1
+    assert calls[0][0].shape == (2, 63)
+    for (letter, conf), (exp_letter, exp_conf) in zip(got, expected):
+        assert letter == exp_letter
+        assert np.isclose(conf, exp_conf, atol=1e-6)
+    assert not demo.classify_hands(model, "cpu", [], letters)
+
+
+def test_draw_hands_writes_one_line_per_hand(monkeypatch):
+    texts = []
+    monkeypatch.setattr(demo.cv2, "putText", lambda frame, text, *a: texts.append(text))
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    hands = [
+        HandLandmarks(points=np.full((21, 3), 0.5, dtype=np.float32), handedness=h)
+        for h in ("Left", "Right")
+    ]
+
+    lines = demo.draw_hands(frame, hands, [("A", 0.9), ("-", 0.3)])
+
+    assert lines == 2
+    assert "Left: A (0.90)" in texts
+    assert "Right: - (0.30)" in texts
+
+
+def test_run_serial_with_temporal_filter_skips_still_frames(monkeypatch):
+    temporal = TemporalFilter(max_skip=100)
+    shown = run_demo(
+        monkeypatch,
+        lambda *args: demo.run_serial(*args, temporal=temporal),
+    )
+    assert len(shown) == 20
+    assert temporal.forwards == 1
+    assert temporal.skipped == 19
+
+
+class ScriptedStream:
+    def __init__(self, prediction):
+        self.prediction = prediction
+        self.pushed = 0
+        self.resets = 0
+
+    def push(self, pts):
+        self.pushed += 1
+
+    def reset(self):
+        self.resets += 1
+
+    def predict(self):
+        return self.prediction
+
+
+def test_update_motion_only_reports_confident_motion_letters():
+    hand = [HandLandmarks(points=np.zeros((21, 3), dtype=np.float32), handedness="L")]
+
+    assert demo.update_motion(ScriptedStream(("J", 0.95)), hand) == ("J", 0.95)
+    assert demo.update_motion(ScriptedStream(("J", 0.5)), hand) is None
+    assert demo.update_motion(ScriptedStream(("-", 0.99)), hand) is None
+    assert demo.update_motion(ScriptedStream(None), hand) is None
+
+    stream = ScriptedStream(("Z", 0.9))
+    assert demo.update_motion(stream, []) is None
+    assert stream.resets == 1
+    assert stream.pushed == 0
+
+
+def test_run_pipelined_feeds_motion_stream(monkeypatch):
+    stream = ScriptedStream(("Z", 0.9))
+    shown = run_demo(
+        monkeypatch,
+        lambda *args: demo.run_pipelined(*args, motion=stream),
+    )
+    assert shown
+    assert 1 <= stream.pushed <= 20
@@ -21,6 +21,15 @@ def create_app():
     mongo_db_name = os.getenv("MONGO_DB_NAME", "ASL_DB")
     app.db = MongoClient(mongo_uri).get_database(mongo_db_name)
 
+    # Rate limits for assessment POSTs and the cap on concurrent ML calls
+    from routes.admission import AdmissionController
+
+    app.admission = AdmissionController(
+        rate_per_second=float(os.getenv("ASSESSMENT_RATE_PER_SEC", "4")),
+        burst=int(os.getenv("ASSESSMENT_BURST", "8")),
+        max_in_flight=int(os.getenv("ML_MAX_IN_FLIGHT", "16")),
+    )
+
     # Import and register blueprints
     from routes.auth import auth as auth_bp
     from routes.dashboard import (
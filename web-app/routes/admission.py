@@ -0,0 +1,142 @@
+"""Per-user rate limiting and ML concurrency caps for assessment requests."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucketLimiter:
+    """Token bucket per key: ``rate`` tokens per second, up to ``burst`` saved."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        max_keys: int = 10_000,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rate: Tokens added per second for each key.
+            burst: Bucket capacity, i.e. requests allowed back to back.
+            clock: Monotonic time source, overridable in tests.
+            max_keys: Idle buckets are dropped once this many keys exist.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str) -> float:
+        """Take one token for ``key``.
+
+        Returns:
+            0.0 if the request is admitted, otherwise the number of seconds
+            until a token will be available.
+        """
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                if len(self._buckets) > self.max_keys:
+                    self._drop_full_buckets(now)
+                return 0.0
+
+            self._buckets[key] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+
+    def _drop_full_buckets(self, now: float) -> None:
+        """Forget keys whose buckets have refilled. Lock must be held."""
+        refill_seconds = self.burst / self.rate
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if now - updated < refill_seconds
+        }
+
+
+class AdmissionController:
+    """Admission control for assessment POSTs.
+
+    Combines a per-user token bucket with a global cap on ML calls in
+    flight. Rejections carry a ``Retry-After`` value in whole seconds and
+    are counted for :meth:`stats`.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 4.0,
+        burst: int = 8,
+        max_in_flight: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an admission controller.
+
+        Args:
+            rate_per_second: Sustained assessment POSTs allowed per user.
+            burst: Extra POSTs a user may send back to back.
+            max_in_flight: Concurrent ML calls allowed across all users.
+            clock: Monotonic time source, overridable in tests.
+        """
+        self.limiter = TokenBucketLimiter(rate_per_second, burst, clock=clock)
+        self.max_in_flight = max_in_flight
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {
+            "admitted": 0,
+            "rejected_rate_limited": 0,
+            "rejected_overloaded": 0,
+        }
+
+    @property
+    def min_interval_ms(self) -> int:
+        """Shortest gap between one client's POSTs that is never rate limited."""
+        return math.ceil(1000 / self.limiter.rate)
+
+    def check_rate(self, user_id: str) -> int | None:
+        """Return None if ``user_id`` may proceed, else Retry-After seconds."""
+        wait = self.limiter.try_acquire(user_id)
+        if wait <= 0:
+            return None
+        with self._lock:
+            self._counters["rejected_rate_limited"] += 1
+        return max(1, math.ceil(wait))
+
+    def acquire_ml_slot(self) -> int | None:
+        """Reserve an ML call slot; return None on success, else Retry-After."""
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._counters["rejected_overloaded"] += 1
+                return 1
+            self._in_flight += 1
+            self._counters["admitted"] += 1
+            return None
+
+    def release_ml_slot(self) -> None:
+        """Release a slot taken by :meth:`acquire_ml_slot`."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def stats(self) -> dict:
+        """Return admission counters and the current number of ML calls."""
+        with self._lock:
+            return {
+                **self._counters,
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "rate_per_second": self.limiter.rate,
+                "burst": self.limiter.burst,
+            }
@@ -0,0 +1,153 @@
+"""Coalesce concurrent ML prediction requests into batched ML API calls."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+import requests  # pylint: disable=import-error
+
+Prediction = tuple[str, float] | tuple[None, None]
+
+
+class _PendingPrediction:
+    """One request's landmarks waiting for a batched prediction."""
+
+    __slots__ = ("points", "done", "result", "taken")
+
+    def __init__(self, points: list) -> None:
+        self.points = points
+        self.done = threading.Event()
+        self.result: Prediction = (None, None)
+        self.taken = False
+
+
+class MLRequestCoalescer:  # pylint: disable=too-many-instance-attributes
+    """Collect landmark sets from concurrent requests and send them as one call.
+
+    The first request to arrive opens a batching window of ``window_ms``
+    milliseconds. Requests arriving inside the window join the same batch.
+    The batch is sent as soon as the window closes or ``max_batch_size``
+    requests are waiting, and each caller receives its own prediction.
+
+    A batch of one is sent to the single-sample ``/predict`` endpoint, so
+    an idle app pays only the window delay.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        predict_url: str,
+        batch_url: str,
+        window_ms: float = 5.0,
+        max_batch_size: int = 32,
+        timeout: float = 5.0,
+        post: Optional[Callable[..., requests.Response]] = None,
+    ) -> None:
+        """Create a coalescer.
+
+        Args:
+            predict_url: URL of the ML single-sample ``/predict`` endpoint.
+            batch_url: URL of the ML ``/predict/batch`` endpoint.
+            window_ms: How long the first request waits for others to join.
+            max_batch_size: Send the batch early once this many are waiting.
+            timeout: HTTP timeout in seconds for the ML call.
+            post: Function used to POST JSON. Defaults to ``requests.post``.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.predict_url = predict_url
+        self.batch_url = batch_url
+        self.window_seconds = max(window_ms, 0.0) / 1000.0
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._post = post
+
+        self._cond = threading.Condition()
+        self._pending: list[_PendingPrediction] = []
+
+        self.batches_sent = 0
+        self.requests_served = 0
+
+    def predict(self, points: list) -> Prediction:
+        """Return (letter, confidence) for one landmark set.
+
+        Blocks until the batch containing ``points`` has been answered.
+        Returns (None, None) if the ML API fails.
+        """
+        item = _PendingPrediction(points)
+        batch = None
+
+        with self._cond:
+            self._pending.append(item)
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            elif len(self._pending) == 1:
+                batch = self._lead_window(item)
+
+        if batch:
+            self._send(batch)
+
+        # Callers that joined someone else's batch wait for the leader.
+        item.done.wait(self.timeout + self.window_seconds + 1.0)
+        return item.result
+
+    def _lead_window(self, item: _PendingPrediction) -> list[_PendingPrediction]:
+        """Hold the batching window open. Must be called with the lock held."""
+        deadline = time.monotonic() + self.window_seconds
+        while not item.taken:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self._take_batch()
+            self._cond.wait(remaining)
+        return []
+
+    def _take_batch(self) -> list[_PendingPrediction]:
+        """Detach up to max_batch_size waiting items. Lock must be held."""
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        for pending in batch:
+            pending.taken = True
+        # Wake a leader whose item was taken by a full batch
+        self._cond.notify_all()
+        return batch
+
+    def _send(self, batch: list[_PendingPrediction]) -> None:
+        """Call the ML API for a detached batch and fan results back out."""
+        post = self._post or requests.post
+        try:
+            if len(batch) == 1:
+                response = post(
+                    self.predict_url,
+                    json={"points": batch[0].points},
+                    timeout=self.timeout,
+                )
+                predictions = [response.json()] if response.ok else [{}]
+            else:
+                response = post(
+                    self.batch_url,
+                    json={"batch": [pending.points for pending in batch]},
+                    timeout=self.timeout,
+                )
+                data = response.json() if response.ok else {}
+                predictions = data.get("predictions") or []
+
+            for pending, prediction in zip(batch, predictions):
+                pending.result = _parse_prediction(prediction)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            print("ML API error:", exc)
+        finally:
+            with self._cond:
+                self.batches_sent += 1
+                self.requests_served += len(batch)
+            for pending in batch:
+                pending.done.set()
+
+
+def _parse_prediction(prediction: dict) -> Prediction:
+    """Turn one ML API prediction object into (letter, confidence)."""
+    letter = prediction.get("letter") if isinstance(prediction, dict) else None
+    if not letter:
+        return None, None
+    return letter, float(prediction.get("confidence", 0.0))
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import time
+from pathlib import Path
 from typing import List, Dict, Any
 
 from bson import ObjectId
-import requests  # pylint: disable=import-error
 from flask import (
     Blueprint,
     redirect,
@@ -16,8 +18,12 @@ from flask import (
     current_app,
     request,
     jsonify,
+    send_file,
+    abort,
 )
 
+from .ml_coalescer import MLRequestCoalescer
+
 training = Blueprint("training", __name__, url_prefix="/training")
 
 # ----------------- LESSONS -----------------
@@ -162,11 +168,82 @@ ASSESSMENTS: Dict[int, Dict[str, Any]] = {
 }
 
 ML_API_URL = "http://ml:8080/predict"
+ML_BATCH_API_URL = "http://ml:8080/predict/batch"
+
+# Concurrent assessment POSTs are grouped into one batched ML call.
+# A window of 0 disables waiting; a max batch of 1 disables batching.
+ML_COALESCE_WINDOW_MS = float(os.getenv("ML_COALESCE_WINDOW_MS", "5"))
+ML_COALESCE_MAX_BATCH = int(os.getenv("ML_COALESCE_MAX_BATCH", "32"))
+
+ml_coalescer = MLRequestCoalescer(
+    predict_url=ML_API_URL,
+    batch_url=ML_BATCH_API_URL,
+    window_ms=ML_COALESCE_WINDOW_MS,
+    max_batch_size=ML_COALESCE_MAX_BATCH,
+)
+
+
+# Exported by machine-learning-client/src/export_browser_model.py.
+# Served under a content-hash URL so browsers can cache it indefinitely.
+BROWSER_MODEL_FILE = Path("models") / "landmark_mlp.bin"
+BROWSER_MODEL_MAX_AGE = 365 * 24 * 60 * 60
+
+_model_version_cache: Dict[tuple, str] = {}
+
+
+def browser_model_version() -> str | None:
+    """Return a short content hash of the exported browser model, if present."""
+    path = Path(current_app.static_folder) / BROWSER_MODEL_FILE
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _model_version_cache:
+        _model_version_cache.clear()
+        _model_version_cache[key] = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    return _model_version_cache[key]
+
+
+def browser_model_url() -> str | None:
+    """URL of the current browser model, or None to fall back to the ML API."""
+    version = browser_model_version()
+    if version is None:
+        return None
+    return url_for("training.browser_model", version=version)
 
 
 # ---------------- ROUTES -----------------
 
 
+@training.route("/admission/stats")
+def admission_stats():
+    """Expose assessment admission counters (rejections, ML calls in flight)."""
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+    return jsonify(current_app.admission.stats())
+
+
+@training.route("/model/<version>/landmark_mlp.bin")
+def browser_model(version: str):
+    """Serve the exported LandmarkMLP for in-browser classification."""
+    current = browser_model_version()
+    if current is None:
+        abort(404)
+    if version != current:
+        return redirect(url_for("training.browser_model", version=current))
+
+    response = send_file(
+        Path(current_app.static_folder) / BROWSER_MODEL_FILE,
+        mimetype="application/octet-stream",
+        max_age=BROWSER_MODEL_MAX_AGE,
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
 @training.route("/")
 def lessons() -> str:
     """Display all ASL lessons."""
@@ -190,22 +267,48 @@ def lesson(num: int) -> str:
         lesson_num=num,
         description=lesson_obj["description"],
         image_file=IMAGE_MAP.get(num, "all_letters.png"),
+        model_url=browser_model_url(),
+        min_predict_interval_ms=current_app.admission.min_interval_ms,
     )
 
 
 def call_ml_api(points: list) -> tuple[str, float] | tuple[None, None]:
-    """Call the ML API and return (letter, confidence)."""
+    """Call the ML API and return (letter, confidence).
+
+    Requests are coalesced with other in-flight assessments so that
+    concurrent users share one batched ML call.
+    """
+    return ml_coalescer.predict(points)
+
+
+def too_many_requests(retry_after: int):
+    """Build a 429 response asking the client to back off."""
+    response = jsonify({"error": "Too many requests", "retry_after": retry_after})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+def admitted_ml_call(user_id: str, points: list) -> tuple:
+    """Call the ML API if the user's rate limit and the ML concurrency cap allow.
+
+    Returns:
+        (letter, confidence, None) when the call was made, or
+        (None, None, response) with a 429 response when it was rejected.
+    """
+    admission = current_app.admission
+
+    retry_after = admission.check_rate(user_id)
+    if retry_after is None:
+        retry_after = admission.acquire_ml_slot()
+    if retry_after is not None:
+        return None, None, too_many_requests(retry_after)
+
     try:
-        response = requests.post(ML_API_URL, json={"points": points}, timeout=5)
-        data = response.json() if response.ok else {}
-        letter = data.get("letter")
-        confidence = float(data.get("confidence", 0.0))
-        if not letter:
-            return None, None
-        return letter, confidence
-    except Exception as exc:  # pylint: disable=broad-exception-caught
-        print("ML API error:", exc)
-        return None, None
+        letter, confidence = call_ml_api(points)
+    finally:
+        admission.release_ml_slot()
+    return letter, confidence, None
 
 
 def save_detection(
@@ -273,6 +376,29 @@ def update_progress(db, user_id: str, lesson_id: int, assessment_def: dict) -> N
     )
 
 
+def grade_landmarks(db, user_id: str, lesson_id: int, assessment_def: dict, points):
+    """Classify one set of landmarks, record it and return the grading response."""
+    letter, confidence, rejection = admitted_ml_call(user_id, points)
+    if rejection:
+        return rejection
+    if not letter:
+        return jsonify({"error": "Failed to get prediction"}), 500
+    if not save_detection(db, user_id, lesson_id, letter, confidence):
+        return jsonify({"error": "Failed to save detection"}), 500
+
+    task_results, overall_pass = check_tasks(db, user_id, lesson_id, assessment_def)
+    if overall_pass:
+        update_progress(db, user_id, lesson_id, assessment_def)
+    return jsonify(
+        {
+            "current_letter": letter,
+            "current_confidence": confidence,
+            "task_results": task_results,
+            "overall_pass": overall_pass,
+        }
+    )
+
+
 @training.route("/lesson/<int:num>/assessment", methods=["GET", "POST"])
 def assessment(num: int):
     """Handle lesson assessments and prediction scoring."""
@@ -299,25 +425,7 @@ def assessment(num: int):
         if not points or len(points) != 21:
             response = jsonify({"error": "Invalid landmarks"}), 400
         else:
-            letter, confidence = call_ml_api(points)
-            if not letter:
-                response = jsonify({"error": "Failed to get prediction"}), 500
-            elif not save_detection(db, user_id, num, letter, confidence):
-                response = jsonify({"error": "Failed to save detection"}), 500
-            else:
-                task_results, overall_pass = check_tasks(
-                    db, user_id, num, assessment_def
-                )
-                if overall_pass:
-                    update_progress(db, user_id, num, assessment_def)
-                response = jsonify(
-                    {
-                        "current_letter": letter,
-                        "current_confidence": confidence,
-                        "task_results": task_results,
-                        "overall_pass": overall_pass,
-                    }
-                )
+            response = grade_landmarks(db, user_id, num, assessment_def, points)
 
     if not response:  # GET request
         response = render_template(
@@ -325,6 +433,8 @@ def assessment(num: int):
             lesson=lesson_obj,
             lesson_num=num,
             tasks=assessment_def["tasks"],
+            model_url=browser_model_url(),
+            min_predict_interval_ms=current_app.admission.min_interval_ms,
         )
 
     return response
@@ -0,0 +1,177 @@
+// In-browser LandmarkMLP forward pass.
+//
+// Reads the binary produced by machine-learning-client/src/export_browser_model.py
+// and mirrors models/model_MLP.py so letters can be classified without a
+// round trip to the ML service.
+
+const MAGIC = "LMLP";
+const FORMAT_VERSION = 1;
+
+function halfToFloat(h) {
+  const sign = h & 0x8000 ? -1 : 1;
+  const exponent = (h >> 10) & 0x1f;
+  const fraction = h & 0x03ff;
+  if (exponent === 0) return sign * 2 ** -14 * (fraction / 1024);
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+  return sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+}
+
+function decodeTensors(buffer, dataStart, header) {
+  const total = header.tensors.reduce(
+    (n, t) => n + t.shape.reduce((a, b) => a * b, 1),
+    0
+  );
+  let data;
+  if (header.dtype === "float32") {
+    data = new Float32Array(buffer, dataStart, total);
+  } else {
+    const halves = new Uint16Array(buffer, dataStart, total);
+    data = new Float32Array(total);
+    for (let i = 0; i < total; i++) data[i] = halfToFloat(halves[i]);
+  }
+
+  const tensors = {};
+  for (const t of header.tensors) {
+    const size = t.shape.reduce((a, b) => a * b, 1);
+    tensors[t.name] = data.subarray(t.offset, t.offset + size);
+  }
+  return tensors;
+}
+
+export function parseLandmarkModel(buffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== MAGIC) throw new Error("Not an exported LandmarkMLP file");
+
+  const version = view.getUint32(4, true);
+  if (version !== FORMAT_VERSION) {
+    throw new Error(`Unsupported model format version ${version}`);
+  }
+
+  const headerLen = view.getUint32(8, true);
+  const headerEnd = 12 + headerLen;
+  const header = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, 12, headerLen))
+  );
+  const dataStart = headerEnd + ((4 - (headerEnd % 4)) % 4);
+
+  return new LandmarkMLP(header, decodeTensors(buffer, dataStart, header));
+}
+
+export async function loadLandmarkModel(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`Model download failed: ${res.status}`);
+  return parseLandmarkModel(await res.arrayBuffer());
+}
+
+// Same as mediapipe_utils.normalize_landmarks: wrist at origin, max distance 1.
+export function normalizeLandmarks(points, out = new Float32Array(63)) {
+  const [wx, wy, wz] = points[0];
+  let maxDist = 0;
+  for (let i = 0; i < 21; i++) {
+    const x = points[i][0] - wx;
+    const y = points[i][1] - wy;
+    const z = points[i][2] - wz;
+    out[i * 3] = x;
+    out[i * 3 + 1] = y;
+    out[i * 3 + 2] = z;
+    maxDist = Math.max(maxDist, Math.sqrt(x * x + y * y + z * z));
+  }
+  if (maxDist > 0) {
+    for (let i = 0; i < 63; i++) out[i] /= maxDist;
+  }
+  return out;
+}
+
+// Abramowitz & Stegun 7.1.26; matches torch's exact GELU to ~1e-7.
+function erf(x) {
+  const sign = x < 0 ? -1 : 1;
+  const ax = Math.abs(x);
+  const t = 1 / (1 + 0.3275911 * ax);
+  const y =
+    1 -
+    ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t +
+      0.254829592) *
+      t *
+      Math.exp(-ax * ax);
+  return sign * y;
+}
+
+function gelu(v) {
+  for (let i = 0; i < v.length; i++) {
+    v[i] = 0.5 * v[i] * (1 + erf(v[i] / Math.SQRT2));
+  }
+}
+
+class LandmarkMLP {
+  constructor(header, tensors) {
+    this.header = header;
+    this.labels = header.labels;
+    this.eps = header.layer_norm_eps;
+    this.w = tensors;
+
+    const hidden = header.hidden_dim;
+    this.input = new Float32Array(header.input_dim);
+    this.x = new Float32Array(hidden);
+    this.h = new Float32Array(hidden);
+    const fc1Bias = tensors["blocks.0.fc1.bias"];
+    this.wide = new Float32Array(fc1Bias ? fc1Bias.length : hidden * 2);
+    this.logits = new Float32Array(header.num_classes);
+  }
+
+  layerNorm(src, dst, prefix) {
+    const n = src.length;
+    let mean = 0;
+    for (let i = 0; i < n; i++) mean += src[i];
+    mean /= n;
+    let variance = 0;
+    for (let i = 0; i < n; i++) variance += (src[i] - mean) ** 2;
+    const inv = 1 / Math.sqrt(variance / n + this.eps);
+    const gamma = this.w[`${prefix}.weight`];
+    const beta = this.w[`${prefix}.bias`];
+    for (let i = 0; i < n; i++) dst[i] = (src[i] - mean) * inv * gamma[i] + beta[i];
+  }
+
+  linear(src, dst, prefix) {
+    const weight = this.w[`${prefix}.weight`];
+    const bias = this.w[`${prefix}.bias`];
+    const inDim = src.length;
+    for (let o = 0; o < dst.length; o++) {
+      let acc = bias[o];
+      const row = o * inDim;
+      for (let i = 0; i < inDim; i++) acc += weight[row + i] * src[i];
+      dst[o] = acc;
+    }
+  }
+
+  // features: Float32Array(63) from normalizeLandmarks
+  predict(features) {
+    this.layerNorm(features, this.input, "input_norm");
+    this.linear(this.input, this.x, "input_proj");
+    gelu(this.x);
+
+    for (let b = 0; b < this.header.num_blocks; b++) {
+      this.layerNorm(this.x, this.h, `blocks.${b}.norm`);
+      this.linear(this.h, this.wide, `blocks.${b}.fc1`);
+      gelu(this.wide);
+      this.linear(this.wide, this.h, `blocks.${b}.fc2`);
+      for (let i = 0; i < this.x.length; i++) this.x[i] += this.h[i];
+    }
+
+    this.layerNorm(this.x, this.h, "head_norm");
+    this.linear(this.h, this.logits, "head");
+
+    let best = 0;
+    let max = -Infinity;
+    for (let i = 0; i < this.logits.length; i++) {
+      if (this.logits[i] > max) {
+        max = this.logits[i];
+        best = i;
+      }
+    }
+    let sum = 0;
+    for (let i = 0; i < this.logits.length; i++) sum += Math.exp(this.logits[i] - max);
+
+    return { letter: this.labels[best] ?? "?", confidence: 1 / sum };
+  }
+}
@@ -1,16 +1,103 @@
+import { loadLandmarkModel, normalizeLandmarks } from "./landmark_mlp.js";
+
 const ML_API_URL = "http://localhost:8080/predict";
 const MIN_CONFIDENCE = 0.6;
-const PREDICT_EVERY_N_FRAMES = 40;
+
+// Adaptive prediction scheduling: predict as soon as the normalized pose
+// moves past MOTION_THRESHOLD (mean per-joint distance, hand scale = 1),
+// and at least every MAX_PREDICT_INTERVAL_MS while the hand is held still.
+// The minimum gap comes from the server's per-user assessment rate
+// (ASSESSMENT_RATE_PER_SEC) so a single tab is never rate limited.
+const MOTION_THRESHOLD = 0.08;
+const DEFAULT_MIN_PREDICT_INTERVAL_MS = 250;
+const MAX_PREDICT_INTERVAL_MS = 1500;
+
+// Lets the ML API reuse its last answer for this tab when the hand is still.
+const CLIENT_ID =
+  window.crypto && crypto.randomUUID
+    ? crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(16).slice(2)}`;
 
 const videoEl = document.getElementById("video");
+const MIN_PREDICT_INTERVAL_MS =
+  Number(videoEl && videoEl.dataset.minPredictIntervalMs) || DEFAULT_MIN_PREDICT_INTERVAL_MS;
 const canvasEl = document.getElementById("overlay");
 const ctx = canvasEl ? canvasEl.getContext("2d") : null;
 
 const letterEl = document.getElementById("letter-display");
 const confidenceEl = document.getElementById("confidence-display");
 
-let frameCount = 0;
 let inFlight = false;
+let lastPredictAt = 0;
+const lastPredictedPose = new Float32Array(63);
+let hasPredictedPose = false;
+
+// Local classifier; when it loads, the ML API is no longer called per frame.
+let localModel = null;
+const features = new Float32Array(63);
+
+async function loadLocalModel() {
+  const url = videoEl && videoEl.dataset.modelUrl;
+  if (!url) return;
+  try {
+    localModel = await loadLandmarkModel(url);
+  } catch (err) {
+    console.warn("Local model unavailable, using ML API:", err);
+  }
+}
+
+function showPrediction(letter, confidence) {
+  if (letterEl) letterEl.innerText = letter;
+  if (confidenceEl && typeof confidence === "number") {
+    confidenceEl.innerText = confidence.toFixed(2);
+  }
+}
+
+// Mean distance each joint moved since the last prediction.
+function poseMotion(pose) {
+  if (!hasPredictedPose) return Infinity;
+  let total = 0;
+  for (let i = 0; i < 63; i += 3) {
+    const dx = pose[i] - lastPredictedPose[i];
+    const dy = pose[i + 1] - lastPredictedPose[i + 1];
+    const dz = pose[i + 2] - lastPredictedPose[i + 2];
+    total += Math.sqrt(dx * dx + dy * dy + dz * dz);
+  }
+  return total / 21;
+}
+
+// Returns null to skip this frame, otherwise { unchanged } for the request.
+function schedulePrediction(pose, now) {
+  const elapsed = now - lastPredictAt;
+  if (elapsed < MIN_PREDICT_INTERVAL_MS) return null;
+
+  const moved = poseMotion(pose) >= MOTION_THRESHOLD;
+  if (!moved && elapsed < MAX_PREDICT_INTERVAL_MS) return null;
+
+  lastPredictAt = now;
+  if (moved) {
+    lastPredictedPose.set(pose);
+    hasPredictedPose = true;
+  }
+  return { unchanged: !moved };
+}
+
+async function predictRemote(points, unchanged) {
+  const res = await fetch(ML_API_URL, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ points, client_id: CLIENT_ID, unchanged }),
+  });
+
+  if (!res.ok) {
+    console.error("ML API error:", res.status);
+    return null;
+  }
+
+  const data = await res.json(); // { letter, confidence }
+  if (!data || typeof data.letter !== "string") return null;
+  return data;
+}
 
 async function startCamera() {
   try {
@@ -64,33 +151,30 @@ hands.onResults(async (results) => {
   drawConnectors(ctx, landmarks, HAND_CONNECTIONS, { color: "#00FF00", lineWidth: 2 });
   drawLandmarks(ctx, landmarks, { color: "#FF0000", lineWidth: 1 });
 
-  // Throttle ML API calls
-  frameCount++;
-  if (frameCount % PREDICT_EVERY_N_FRAMES !== 0 || inFlight) return;
-
   const points = landmarks.map((lm) => [lm.x, lm.y, lm.z]);
 
+  const pose = normalizeLandmarks(points, features);
+
+  // Local inference is cheap enough to refresh the display every frame.
+  let local = null;
+  if (localModel) {
+    local = localModel.predict(pose);
+    showPrediction(local.letter, local.confidence);
+  }
+
+  // Report predictions to the page (and call the ML API) only when the
+  // pose changed or the hand has been held long enough to count again.
+  if (inFlight) return;
+  const schedule = schedulePrediction(pose, performance.now());
+  if (!schedule) return;
+
   inFlight = true;
   try {
-    const res = await fetch(ML_API_URL, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ points }),
-    });
-
-    if (!res.ok) {
-      console.error("ML API error:", res.status);
-      return;
-    }
-
-    const data = await res.json(); // { letter, confidence }
-    if (data && typeof data.letter === "string") {
-      if (letterEl) letterEl.innerText = data.letter;
-      if (confidenceEl && typeof data.confidence === "number") {
-        confidenceEl.innerText = data.confidence.toFixed(2);
-      }
+    const data = local || (await predictRemote(points, schedule.unchanged));
+    if (data) {
+      if (!local) showPrediction(data.letter, data.confidence);
 
-      // Hook for assessment.html
+      // Hook for assessment.html; the server re-checks the landmarks
       if (window.onPrediction) {
         window.onPrediction(data.letter, data.confidence, points);
       }
@@ -110,4 +194,4 @@ async function loop() {
   requestAnimationFrame(loop);
 }
 
-startCamera().then(() => loop());
+Promise.all([startCamera(), loadLocalModel()]).then(() => loop());
@@ -0,0 +1,139 @@
+"""
+Tests for assessment rate limiting and admission control.
+"""
+
+from unittest.mock import patch
+
+from routes.admission import AdmissionController, TokenBucketLimiter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_limits():
+    """A key may spend its burst immediately, then must wait for refill."""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=2.0, burst=3, clock=clock)
+
+    assert [limiter.try_acquire("u1") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.try_acquire("u1") == 0.5
+
+    clock.now += 0.5
+    assert limiter.try_acquire("u1") == 0.0
+
+
+def test_token_bucket_keys_are_independent():
+    """One user's exhausted bucket does not affect another user."""
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=FakeClock())
+
+    assert limiter.try_acquire("u1") == 0.0
+    assert limiter.try_acquire("u1") > 0
+    assert limiter.try_acquire("u2") == 0.0
+
+
+def test_admission_caps_ml_calls_in_flight():
+    """Only max_in_flight ML slots can be held at once."""
+    admission = AdmissionController(max_in_flight=2)
+
+    assert admission.acquire_ml_slot() is None
+    assert admission.acquire_ml_slot() is None
+    assert admission.acquire_ml_slot() == 1
+
+    admission.release_ml_slot()
+    assert admission.acquire_ml_slot() is None
+
+    stats = admission.stats()
+    assert stats["admitted"] == 3
+    assert stats["rejected_overloaded"] == 1
+    assert stats["in_flight"] == 2
+
+
+def test_check_rate_rounds_retry_after_up():
+    """Retry-After is whole seconds and at least one."""
+    admission = AdmissionController(rate_per_second=0.25, burst=1, clock=FakeClock())
+
+    assert admission.check_rate("u1") is None
+    assert admission.check_rate("u1") == 4
+    assert admission.stats()["rejected_rate_limited"] == 1
+
+
+def test_scheduler_cadence_is_never_rate_limited():
+    """webcam.js's fastest cadence (min_interval_ms) stays within the limit."""
+    for rate, burst in [(4.0, 8), (3.0, 1), (0.5, 1)]:
+        clock = FakeClock()
+        admission = AdmissionController(rate_per_second=rate, burst=burst, clock=clock)
+        interval = admission.min_interval_ms / 1000
+
+        for _ in range(600):
+            assert admission.check_rate("u1") is None
+            clock.now += interval
+
+        assert admission.stats()["rejected_rate_limited"] == 0
+
+
+def test_assessment_page_passes_min_interval(client, app):
+    """The assessment page hands the admitted cadence to webcam.js."""
+    app.admission = AdmissionController(rate_per_second=4.0)
+
+    with client.session_transaction() as sess:
+        sess["user_id"] = "user123"
+
+    resp = client.get("/training/lesson/1/assessment")
+
+    assert b'data-min-predict-interval-ms="250"' in resp.data
+
+
+@patch("routes.training.call_ml_api")
+def test_assessment_post_rate_limited(mock_ml, client, app):
+    """Hammering the assessment endpoint returns 429 with Retry-After."""
+    mock_ml.return_value = ("A", 0.9)
+    app.admission = AdmissionController(rate_per_second=0.5, burst=1)
+
+    with client.session_transaction() as sess:
+        sess["user_id"] = "user123"
+
+    body = {"points": [[0, 0, 0]] * 21}
+    first = client.post("/training/lesson/1/assessment", json=body)
+    second = client.post("/training/lesson/1/assessment", json=body)
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "2"
+    assert mock_ml.call_count == 1
+
+    stats = client.get("/training/admission/stats").json
+    assert stats["rejected_rate_limited"] == 1
+    assert stats["in_flight"] == 0
+
+
+@patch("routes.training.call_ml_api")
+def test_assessment_post_rejected_when_ml_saturated(mock_ml, client, app):
+    """With every ML slot taken, new requests are shed with 429."""
+    app.admission = AdmissionController(max_in_flight=1)
+    app.admission.acquire_ml_slot()
+
+    with client.session_transaction() as sess:
+        sess["user_id"] = "user123"
+
+    resp = client.post(
+        "/training/lesson/1/assessment", json={"points": [[0, 0, 0]] * 21}
+    )
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+    mock_ml.assert_not_called()
+
+
+def test_admission_stats_requires_login(client):
+    """Limiter internals are not exposed to anonymous visitors."""
+    resp = client.get("/training/admission/stats")
+
+    assert resp.status_code == 302
+    assert "/login" in resp.headers["Location"]
@@ -0,0 +1,88 @@
+"""
+Tests for the ML request coalescer.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+from routes.ml_coalescer import MLRequestCoalescer, _PendingPrediction
+
+PREDICT_URL = "http://ml/predict"
+BATCH_URL = "http://ml/predict/batch"
+
+
+def make_response(payload, ok=True):
+    """Build a fake requests.Response."""
+    response = MagicMock()
+    response.ok = ok
+    response.json.return_value = payload
+    return response
+
+
+def test_single_request_uses_predict_endpoint():
+    """A lone request is sent to /predict, not the batch endpoint."""
+    post = MagicMock(return_value=make_response({"letter": "B", "confidence": 0.7}))
+    coalescer = MLRequestCoalescer(PREDICT_URL, BATCH_URL, window_ms=1, post=post)
+
+    assert coalescer.predict([[0, 0, 0]] * 21) == ("B", 0.7)
+    assert post.call_args.args[0] == PREDICT_URL
+    assert coalescer.batches_sent == 1
+
+
+def test_concurrent_requests_share_one_batch():
+    """Concurrent requests inside the window become one batched call."""
+    num_requests = 4
+    barrier = threading.Barrier(num_requests)
+
+    def fake_post(url, json, timeout):
+        # Echo each landmark set's first x-coordinate back as the letter.
+        preds = [
+            {"letter": str(points[0][0]), "confidence": 0.9} for points in json["batch"]
+        ]
+        return make_response({"predictions": preds})
+
+    post = MagicMock(side_effect=fake_post)
+    coalescer = MLRequestCoalescer(
+        PREDICT_URL, BATCH_URL, window_ms=10_000, max_batch_size=num_requests, post=post
+    )
+
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = coalescer.predict([[i, 0, 0]] * 21)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert post.call_count == 1
+    assert post.call_args.args[0] == BATCH_URL
+    assert results == {i: (str(i), 0.9) for i in range(num_requests)}
+
+
+def test_batch_entry_errors_return_none():
+    """Entries the ML API rejected come back as (None, None)."""
+    post = MagicMock(
+        return_value=make_response(
+            {"predictions": [{"letter": "A", "confidence": 0.8}, {"error": "bad"}]}
+        )
+    )
+    coalescer = MLRequestCoalescer(PREDICT_URL, BATCH_URL, window_ms=0, post=post)
+
+    batch = [_PendingPrediction([[0, 0, 0]] * 21) for _ in range(2)]
+    coalescer._send(batch)  # pylint: disable=protected-access
+
+    assert batch[0].result == ("A", 0.8)
+    assert batch[1].result == (None, None)
+    assert all(item.done.is_set() for item in batch)
+
+
+def test_ml_failure_returns_none():
+    """Transport errors release waiting callers with (None, None)."""
+    post = MagicMock(side_effect=Exception("API Down"))
+    coalescer = MLRequestCoalescer(PREDICT_URL, BATCH_URL, window_ms=0, post=post)
+
+    assert coalescer.predict([[0, 0, 0]] * 21) == (None, None)
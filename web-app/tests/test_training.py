@@ -12,6 +12,7 @@ from routes.training import (
     save_detection,
     check_tasks,
     update_progress,
+    browser_model_url,
 )
 
 
@@ -56,7 +57,7 @@ def test_lesson_page_invalid_redirects(client):
 
 
 # ML API call tests
-@patch("routes.training.requests.post")
+@patch("routes.ml_coalescer.requests.post")
 def test_call_ml_api_success(mock_post):
     """Simulate successful ML API response."""
     mock_post.return_value.ok = True
@@ -67,7 +68,7 @@ def test_call_ml_api_success(mock_post):
     assert conf == 0.82
 
 
-@patch("routes.training.requests.post")
+@patch("routes.ml_coalescer.requests.post")
 def test_call_ml_api_fail(mock_post):
     """Simulate ML API failure."""
     mock_post.side_effect = Exception("API Down")
@@ -239,3 +240,37 @@ def test_assessment_post_success(mock_ml, client, app):
     data = resp.json
     assert data["current_letter"] == "A"
     assert data["overall_pass"] in (True, False)
+
+
+# Browser model tests
+def test_lesson_page_links_browser_model(client):
+    """Lesson page points webcam.js at the versioned browser model."""
+    with client.session_transaction() as sess:
+        sess["user_id"] = "abc"
+
+    resp = client.get("/training/lesson/1")
+    assert resp.status_code == 200
+    assert 'data-model-url="/training/model/' in resp.text
+
+
+def test_browser_model_served_with_long_cache(client, app):
+    """The exported model is served as immutable, long-lived content."""
+    with app.test_request_context():
+        url = browser_model_url()
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.data[:4] == b"LMLP"
+    assert resp.cache_control.max_age == 365 * 24 * 60 * 60
+    assert resp.cache_control.immutable
+    assert resp.cache_control.public
+
+
+def test_browser_model_stale_version_redirects(client, app):
+    """Requests for an old model version redirect to the current one."""
+    with app.test_request_context():
+        url = browser_model_url()
+
+    resp = client.get("/training/model/0000000000000000/landmark_mlp.bin")
+    assert resp.status_code == 302
+    assert resp.headers["Location"].endswith(url)